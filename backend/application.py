@@ -49,6 +49,22 @@ class QuitHandler(handlers.UnsafeHandler):
         ioloop.stop()
 
 
+class DatabasePoolStatus(handlers.MonitoringHandler):
+    """
+    Returns statistics for the database connection pool, for monitoring.
+    """
+    def get(self):
+        self.finish(db.database.pool_stats())
+
+
+class ResponseCacheStatus(handlers.MonitoringHandler):
+    """
+    Returns statistics for the browser response cache, for monitoring.
+    """
+    def get(self):
+        self.finish(handlers.RESPONSE_CACHE.stats())
+
+
 class GetSchema(handlers.UnsafeHandler):
     """
     Returns the schema.org, and bioschemas.org, annotation for a given
@@ -0,0 +1,366 @@
+"""
+Consequences of variants, computed from their VEP annotations.
+
+Used by the browser, and by the importer to store the consequence fields
+(db.ConsequenceModel) at import time.
+"""
+import logging
+
+# Note that this is the current as of v81 with some included for backwards compatibility (VEP <= 75)
+
+CSQ_ORDER = ["transcript_ablation",
+             "splice_acceptor_variant",
+             "splice_donor_variant",
+             "stop_gained",
+             "frameshift_variant",
+             "stop_lost",
+             "start_lost",  # new in v81
+             "initiator_codon_variant",  # deprecated
+             "transcript_amplification",
+             "inframe_insertion",
+             "inframe_deletion",
+             "missense_variant",
+             "protein_altering_variant",  # new in v79
+             "splice_region_variant",
+             "incomplete_terminal_codon_variant",
+             "stop_retained_variant",
+             "synonymous_variant",
+             "coding_sequence_variant",
+             "mature_miRNA_variant",
+             "5_prime_UTR_variant",
+             "3_prime_UTR_variant",
+             "non_coding_transcript_exon_variant",
+             "non_coding_exon_variant",  # deprecated
+             "intron_variant",
+             "NMD_transcript_variant",
+             "non_coding_transcript_variant",
+             "nc_transcript_variant",  # deprecated
+             "upstream_gene_variant",
+             "downstream_gene_variant",
+             "TFBS_ablation",
+             "TFBS_amplification",
+             "TF_binding_site_variant",
+             "regulatory_region_ablation",
+             "regulatory_region_amplification",
+             "feature_elongation",
+             "regulatory_region_variant",
+             "feature_truncation",
+             "intergenic_variant",
+             ""]
+
+CSQ_ORDER_DICT = {csq: i for i, csq in enumerate(CSQ_ORDER)}
+REV_CSQ_ORDER_DICT = dict(enumerate(CSQ_ORDER))
+
+# Rank (index in CSQ_ORDER) of the worst consequence of each consequence string.
+# Starts out with the single consequences; &-joined strings are added the first
+# time they are seen, see worst_csq_index_from_csq()
+CSQ_STRING_RANKS = dict(CSQ_ORDER_DICT)
+
+# db.ConsequenceModel fields: keys set by add_consequence_to_variant
+CONSEQUENCE_FIELDS = {'major_consequence': 'major_consequence',
+                      'category': 'category',
+                      'flags': 'flags',
+                      'hgvs': 'HGVS',
+                      'hgvsp': 'HGVSp',
+                      'hgvsc': 'HGVSc',
+                      'canonical': 'CANONICAL'}
+
+PROTEIN_LETTERS_1TO3 = {
+    'A': 'Ala', 'C': 'Cys', 'D': 'Asp', 'E': 'Glu',
+    'F': 'Phe', 'G': 'Gly', 'H': 'His', 'I': 'Ile',
+    'K': 'Lys', 'L': 'Leu', 'M': 'Met', 'N': 'Asn',
+    'P': 'Pro', 'Q': 'Gln', 'R': 'Arg', 'S': 'Ser',
+    'T': 'Thr', 'V': 'Val', 'W': 'Trp', 'Y': 'Tyr',
+    'X': 'Ter', '*': 'Ter', 'U': 'Sec'
+}
+
+
+def add_consequence_to_variants(variant_list: list):
+    """
+    Add information about variant consequence to multiple variants.
+    Changes are performed in-place.
+
+    Args:
+        variant_list (list): list of variants
+        datatype (str): type of data
+        item (str): query item
+    """
+    for variant in variant_list:
+        add_consequence_to_variant(variant)
+
+
+def add_consequence_to_variant(variant: dict):
+    """
+    Add information about variant consequence to a variant.
+    Changes are performed in-place.
+
+    Args:
+        variant (dict): variant information
+    """
+    if not variant:
+        return
+    worst_csq = worst_csq_with_vep(rank_annotations(variant['vep_annotations']))
+    variant['major_consequence'] = ''
+    variant['category'] = ''
+    variant['flags'] = ''
+
+    if not worst_csq:
+        return
+
+    variant['major_consequence'] = worst_csq['major_consequence']
+    variant['HGVSp'] = get_protein_hgvs(worst_csq)
+    variant['HGVSc'] = get_transcript_hgvs(worst_csq)
+    variant['HGVS'] = get_proper_hgvs(worst_csq)
+    variant['CANONICAL'] = worst_csq['CANONICAL']
+
+    if worst_csq['csq_rank'] <= CSQ_ORDER_DICT["frameshift_variant"]:
+        variant['category'] = 'lof_variant'
+        for annotation in variant['vep_annotations']:
+            if annotation['LoF'] == '':
+                annotation['LoF'] = 'NC'
+                annotation['LoF_filter'] = 'Non-protein-coding gene'
+    elif worst_csq['csq_rank'] <= CSQ_ORDER_DICT["missense_variant"]:
+        # Should be noted that this grabs inframe deletion, etc.
+        variant['category'] = 'missense_variant'
+    elif worst_csq['csq_rank'] <= CSQ_ORDER_DICT["synonymous_variant"]:
+        variant['category'] = 'synonymous_variant'
+    else:
+        variant['category'] = 'other_variant'
+    variant['flags'] = get_flags_from_variant(variant)
+    return
+
+
+def get_consequence_fields(annotations: list) -> dict:
+    """
+    Compute the consequence fields stored for a set of VEP annotations at import time.
+
+    The annotations are not modified.
+
+    Args:
+        annotations (list): VEP annotations of a variant, or of one of its genes or transcripts
+
+    Returns:
+        dict: the db.ConsequenceModel fields
+
+    """
+    variant = {'vep_annotations': [dict(annotation) for annotation in annotations]}
+    add_consequence_to_variant(variant)
+    fields = {column: variant.get(key) for column, key in CONSEQUENCE_FIELDS.items()}
+    fields['flags'] = fields['flags'] or []
+    return fields
+
+
+def annotation_severity(annotation: dict) -> float:
+    """
+    Evaluate severity of the consequences; "bigger is more important".
+
+    Uses the rank stored by rank_annotations() if available.
+
+    Args:
+        annotation (dict): vep_annotation from a variant
+
+    Returns:
+        float: severity score
+
+    """
+    rank = annotation.get('csq_rank')
+    if rank is None:
+        rank = worst_csq_index_from_csq(annotation['Consequence'])
+    score = float(-rank)
+    if annotation['CANONICAL'] == 'YES':
+        score += 0.1
+    return score
+
+
+def get_flags_from_variant(variant: dict) -> list:
+    """
+    Get flags from variant.
+
+    Checks for:
+    * MNP
+    * LoF (loss of function)
+
+    Args:
+        variant (dict): a variant
+
+    Returns:
+        list: flags for the variant
+
+    """
+    flags = []
+    if 'mnps' in variant:
+        flags.append('MNP')
+    lof_annotations = [x for x in variant['vep_annotations'] if x['LoF'] != '']
+    if not lof_annotations:
+        return flags
+    if any([x['LoF'] == 'HC' for x in lof_annotations]):
+        flags.append('LoF')
+    if all([x['LoF'] != 'HC' for x in lof_annotations]):
+        flags.append('LC LoF')
+    if all([x['LoF_flags'] != '' for x in lof_annotations]):
+        flags.append('LoF flag')
+    return flags
+
+
+def get_proper_hgvs(annotation: dict) -> str:
+    """
+    Get HGVS for change, either at transcript or protein level.
+
+    Args:
+        annotation (dict): VEP annotation with HGVS information
+
+    Returns:
+        str: variant effect at aa level in HGVS format (p.), None if parsing fails
+
+    """
+    # Needs major_consequence
+    try:
+        if annotation['major_consequence'] in ('splice_donor_variant',
+                                               'splice_acceptor_variant',
+                                               'splice_region_variant'):
+            return get_transcript_hgvs(annotation)
+        return get_protein_hgvs(annotation)
+    except KeyError:
+        return ''
+
+
+def get_protein_hgvs(annotation: dict) -> str:
+    """
+    Aa changes in HGVS format.
+
+    Args:
+        annotation (dict): VEP annotation with HGVS information
+
+    Returns:
+        str: variant effect at aa level in HGVS format (p.), None if parsing fails
+
+    """
+    try:
+        if '%3D' in annotation['HGVSp']:  # "%3D" is "="
+            amino_acids = ''.join([PROTEIN_LETTERS_1TO3[aa] for aa in annotation['Amino_acids']])
+            return "p." + amino_acids + annotation['Protein_position'] + amino_acids
+        return annotation['HGVSp'].split(':')[-1]
+    except KeyError:
+        logging.error("Could not fetch protein hgvs")
+        return ''
+
+
+def get_transcript_hgvs(annotation: dict) -> str:
+    """
+    Nucleotide change in HGVS format.
+
+    Args:
+        annotation (dict): VEP annotation with HGVS information
+
+    Returns:
+        str: variant effect at nucleotide level in HGVS format (c.), None if parsing fails
+
+    """
+    try:
+        return annotation['HGVSc'].split(':')[-1]
+    except KeyError:
+        return ''
+
+
+def worst_csq_from_list(csq_list: list) -> str:
+    """
+    Choose the worst consequence.
+
+    Args:
+        csq_list (list): list of consequences
+
+    Returns:
+        str: the worst consequence
+
+    """
+    return REV_CSQ_ORDER_DICT[worst_csq_index(csq_list)]
+
+
+def worst_csq_from_csq(csq: str) -> str:
+    """
+    Find worst consequence in a possibly &-filled consequence string.
+
+    Args:
+        csq (str): string of consequences, seperated with & (if multiple)
+
+    Returns:
+        str: the worst consequence
+
+    """
+    return REV_CSQ_ORDER_DICT[worst_csq_index_from_csq(csq)]
+
+
+def worst_csq_index(csq_list: list) -> int:
+    """
+    Find the index of the worst consequence.
+
+    Corresponds to the lowest value (index) from CSQ_ORDER_DICT.
+
+    Args:
+        csq_list (list): consequences
+
+    Returns:
+        int: index in CSQ_ODER_DICT of the worst consequence
+
+    """
+    return min([CSQ_ORDER_DICT[csq] for csq in csq_list])
+
+
+def worst_csq_index_from_csq(csq: str) -> int:
+    """
+    Find the index of the worst consequence in a possibly &-filled consequence string.
+
+    The index is looked up in CSQ_STRING_RANKS, so each distinct string is
+    only split once.
+
+    Args:
+        csq (str): string of consequences, seperated with & (if multiple)
+
+    Returns:
+        int: index in CSQ_ODER_DICT of the worst consequence
+
+    """
+    try:
+        return CSQ_STRING_RANKS[csq]
+    except KeyError:
+        rank = worst_csq_index(csq.split('&'))
+        CSQ_STRING_RANKS[csq] = rank
+        return rank
+
+
+def rank_annotations(annotation_list: list) -> list:
+    """
+    Add the index of the worst consequence, "csq_rank", to each annotation.
+
+    Changes are performed in-place.
+
+    Args:
+        annotation_list (list): VEP annotations
+
+    Returns:
+        list: the annotations
+
+    """
+    for annotation in annotation_list:
+        annotation['csq_rank'] = worst_csq_index_from_csq(annotation['Consequence'])
+    return annotation_list
+
+
+def worst_csq_with_vep(annotation_list: list) -> dict:
+    """
+    Choose the vep annotation with the most severe consequence.
+
+    Add a"major_consequence" field for that annotation.
+
+    Args:
+        annotation_list (list): VEP annotations
+
+    Returns:
+        dict: the annotation with the most severe consequence
+
+    """
+    if not annotation_list:
+        return {}
+    worst = max(annotation_list, key=annotation_severity)
+    worst['major_consequence'] = worst_csq_from_csq(worst['Consequence'])
+    return worst
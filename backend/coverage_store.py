@@ -0,0 +1,287 @@
+"""
+Memory-mapped, column-oriented coverage files.
+
+Coverage is stored per dataset version and chromosome, with one binary file
+per column::
+
+    <root>/<dataset version id>/<chrom>/pos.bin     int32
+    <root>/<dataset version id>/<chrom>/mean.bin    float64
+    <root>/<dataset version id>/<chrom>/median.bin  float64
+    <root>/<dataset version id>/<chrom>/cov1.bin    float64
+    ...
+
+Positions must be increasing within a chromosome, so a region is located by
+binary search on the position column and every column is sliced as a
+zero-copy ``memoryview`` of the mapped file.
+
+The files use the native byte order and are meant to be read on the machine
+(or architecture) that wrote them.
+"""
+
+import array
+import bisect
+import logging
+import mmap
+import os
+import shutil
+import threading
+
+COVERAGE_LEVELS = ('cov1', 'cov5', 'cov10', 'cov15', 'cov20',
+                   'cov25', 'cov30', 'cov50', 'cov100')
+COLUMNS = (('pos', 'i'), ('mean', 'd'), ('median', 'd')) + \
+          tuple((level, 'd') for level in COVERAGE_LEVELS)
+SUFFIX = '.bin'
+
+
+def version_path(root: str, dataset_version: int) -> str:
+    """
+    Get the directory holding the coverage of a dataset version.
+
+    Args:
+        root (str): base directory of the coverage store
+        dataset_version (int): id of the dataset version
+
+    Returns:
+        str: path to the dataset version directory
+
+    """
+    return os.path.join(root, str(dataset_version))
+
+
+class CoverageWriter():
+    """
+    Write coverage rows to column files for one dataset version.
+
+    Rows are buffered per chromosome and appended to the column files on
+    ``flush``. The files are written to a temporary directory that replaces
+    any earlier coverage of the dataset version on ``close``, so readers
+    never see a partial import.
+    """
+
+    def __init__(self, root: str, dataset_version: int):
+        """
+        Prepare an empty temporary directory for the dataset version.
+
+        Args:
+            root (str): base directory of the coverage store
+            dataset_version (int): id of the dataset version
+        """
+        self.path = version_path(root, dataset_version)
+        self.tmp_path = self.path + '.partial'
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+        os.makedirs(self.tmp_path)
+        self._buffers: dict = {}
+        self._last_pos: dict = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add(self, row: dict):
+        """
+        Add a coverage row.
+
+        Args:
+            row (dict): chrom, pos, mean, median and the coverage list
+
+        Raises:
+            ValueError: if the position is not after the previous one on the chromosome
+
+        """
+        chrom = row['chrom']
+        if chrom not in self._buffers:
+            self._buffers[chrom] = {name: array.array(code) for name, code in COLUMNS}
+            os.makedirs(os.path.join(self.tmp_path, chrom), exist_ok=True)
+        elif row['pos'] <= self._last_pos[chrom]:
+            raise ValueError(f'Coverage positions must be increasing ({chrom}:{row["pos"]})')
+        self._last_pos[chrom] = row['pos']
+
+        buffers = self._buffers[chrom]
+        buffers['pos'].append(row['pos'])
+        buffers['mean'].append(row['mean'])
+        buffers['median'].append(row['median'])
+        for level, value in zip(COVERAGE_LEVELS, row['coverage']):
+            buffers[level].append(value)
+
+    def flush(self):
+        """Append the buffered rows to the column files."""
+        for chrom, buffers in self._buffers.items():
+            for name, values in buffers.items():
+                if not values:
+                    continue
+                with open(os.path.join(self.tmp_path, chrom, name + SUFFIX), 'ab') as colfile:
+                    values.tofile(colfile)
+                del values[:]
+
+    def close(self):
+        """Flush the remaining rows and replace the coverage of the dataset version."""
+        self.flush()
+        old_path = self.path + '.old'
+        shutil.rmtree(old_path, ignore_errors=True)
+        if os.path.exists(self.path):
+            os.rename(self.path, old_path)
+        os.rename(self.tmp_path, self.path)
+        shutil.rmtree(old_path, ignore_errors=True)
+
+    def abort(self):
+        """Remove the partially written files."""
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+
+
+class ChromosomeCoverage():
+    """Memory-mapped coverage columns of one chromosome."""
+
+    def __init__(self, path: str):
+        """
+        Map the column files in a chromosome directory.
+
+        Args:
+            path (str): directory containing the column files
+        """
+        self.path = path
+        self.columns = {}
+        self._maps = []
+        for name, code in COLUMNS:
+            with open(os.path.join(path, name + SUFFIX), 'rb') as colfile:
+                if os.fstat(colfile.fileno()).st_size:
+                    colmap = mmap.mmap(colfile.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._maps.append(colmap)
+                    self.columns[name] = memoryview(colmap).cast(code)
+                else:
+                    self.columns[name] = memoryview(b'').cast(code)
+        self.stat = os.stat(os.path.join(path, 'pos' + SUFFIX))
+
+    def __len__(self):
+        return len(self.columns['pos'])
+
+    def close(self):
+        """
+        Unmap the column files.
+
+        A map that is still used by a slice is unmapped once the slice is
+        garbage collected instead.
+        """
+        for column in self.columns.values():
+            column.release()
+        for colmap in self._maps:
+            try:
+                colmap.close()
+            except BufferError:
+                logging.debug(f'Coverage files in {self.path} are still in use')
+        self._maps = []
+
+    def slice(self, start_pos: int, end_pos: int) -> dict:
+        """
+        Get views of all columns for the positions start_pos->end_pos, inclusive.
+
+        Args:
+            start_pos (int): first position of interest
+            end_pos (int): last position of interest
+
+        Returns:
+            dict: column name: memoryview of the values in the region
+
+        """
+        positions = self.columns['pos']
+        first = bisect.bisect_left(positions, start_pos)
+        last = bisect.bisect_right(positions, end_pos, lo=first)
+        return {name: column[first:last] for name, column in self.columns.items()}
+
+
+class CoverageStore():
+    """Read access to a directory of memory-mapped coverage files."""
+
+    def __init__(self, root: str):
+        """
+        Set the base directory of the store.
+
+        Args:
+            root (str): base directory of the coverage store
+        """
+        self.root = root
+        self._lock = threading.Lock()
+        self._chroms: dict = {}
+
+    def has_version(self, dataset_version: int) -> bool:
+        """
+        Check whether coverage files exist for a dataset version.
+
+        Args:
+            dataset_version (int): id of the dataset version
+
+        Returns:
+            bool: True if the dataset version has been written to the store
+
+        """
+        return os.path.isdir(version_path(self.root, dataset_version))
+
+    def get_chromosome(self, dataset_version: int, chrom: str):
+        """
+        Get the mapped coverage of a chromosome.
+
+        The mapping is reopened if the files have been replaced by a new import.
+
+        Args:
+            dataset_version (int): id of the dataset version
+            chrom (str): chromosome
+
+        Returns:
+            ChromosomeCoverage: the mapped columns, None if the chromosome has no coverage
+
+        """
+        path = os.path.join(version_path(self.root, dataset_version), chrom)
+        try:
+            stat = os.stat(os.path.join(path, 'pos' + SUFFIX))
+        except FileNotFoundError:
+            return None
+        key = (dataset_version, chrom)
+        with self._lock:
+            chrom_cov = self._chroms.get(key)
+            if chrom_cov is None or (chrom_cov.stat.st_ino, chrom_cov.stat.st_mtime_ns) != \
+               (stat.st_ino, stat.st_mtime_ns):
+                logging.debug(f'Mapping coverage files in {path}')
+                if chrom_cov is not None:
+                    chrom_cov.close()
+                chrom_cov = ChromosomeCoverage(path)
+                self._chroms[key] = chrom_cov
+        return chrom_cov
+
+    def get_coverage(self, dataset_version: int, chrom: str,
+                     start_pos: int, end_pos: int) -> list:
+        """
+        Get the coverage for the bases start_pos->end_pos, inclusive.
+
+        The rows have the same keys as rows from data.coverage, but no
+        database id.
+
+        Args:
+            dataset_version (int): id of the dataset version
+            chrom (str): chromosome
+            start_pos (int): first position of interest
+            end_pos (int): last position of interest
+
+        Returns:
+            list: coverage dicts for the region of interest
+
+        """
+        chrom_cov = self.get_chromosome(dataset_version, chrom)
+        if chrom_cov is None:
+            return []
+        region = chrom_cov.slice(start_pos, end_pos)
+        levels = [region[level].tolist() for level in COVERAGE_LEVELS]
+        return [{'id': None,
+                 'dataset_version': dataset_version,
+                 'chrom': chrom,
+                 'pos': pos,
+                 'mean': mean,
+                 'median': median,
+                 'coverage': list(coverage)}
+                for pos, mean, median, *coverage in zip(region['pos'].tolist(),
+                                                        region['mean'].tolist(),
+                                                        region['median'].tolist(),
+                                                        *levels)]
@@ -1,6 +1,14 @@
 #!/usr/bin/env python3
+# pylint: disable=too-many-lines
 
+import contextvars
+import copy
+from datetime import datetime, timedelta
+import functools
+import inspect
 import logging
+import threading
+import time
 
 from peewee import (BlobField,
                     BooleanField,
@@ -12,18 +20,74 @@ from peewee import (BlobField,
                     ForeignKeyField,
                     Model,
                     TextField,
+                    Value,
                     fn)
-from playhouse.postgres_ext import ArrayField, BinaryJSONField, PostgresqlExtDatabase
+from playhouse.pool import MaxConnectionsExceeded, PooledPostgresqlExtDatabase
+from playhouse.postgres_ext import ArrayField, BinaryJSONField
 
 import settings
 
+
+class MonitoredPooledDatabase(PooledPostgresqlExtDatabase):  # pylint: disable=too-many-ancestors
+    """
+    Pooled database keeping statistics about the connection pool.
+
+    A wait is counted whenever a connection has to wait for another connection
+    to be returned to the pool.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._wait_start = threading.local()
+        self._stats_lock = threading.Lock()
+        self.waits = 0
+        self.wait_time = 0.0
+
+    def _connect(self):
+        try:
+            return super()._connect()
+        except MaxConnectionsExceeded:
+            if getattr(self._wait_start, 'value', None) is None:
+                self._wait_start.value = time.time()
+            raise
+
+    def connect(self, reuse_if_open=False):
+        self._wait_start.value = None
+        try:
+            return super().connect(reuse_if_open)
+        finally:
+            if self._wait_start.value is not None:
+                with self._stats_lock:
+                    self.waits += 1
+                    self.wait_time += time.time() - self._wait_start.value
+                self._wait_start.value = None
+
+    def pool_stats(self) -> dict:
+        """
+        Get statistics for the connection pool.
+
+        Returns:
+            dict: max connections, connections in use and idle,
+                  number of waits for a connection and total wait time (s)
+
+        """
+        with self._stats_lock:
+            return {'max_connections': self._max_connections,
+                    'in_use': len(self._in_use),
+                    'idle': len(self._connections),
+                    'waits': self.waits,
+                    'wait_time': self.wait_time}
+
+
 # pylint: disable=no-member
-database = PostgresqlExtDatabase(settings.psql_name,
-                                 user=settings.psql_user,
-                                 password=settings.psql_pass,
-                                 host=settings.psql_host,
-                                 port=settings.psql_port,
-                                 register_hstore=False)
+database = MonitoredPooledDatabase(settings.psql_name,
+                                   user=settings.psql_user,
+                                   password=settings.psql_pass,
+                                   host=settings.psql_host,
+                                   port=settings.psql_port,
+                                   max_connections=settings.psql_max_connections,
+                                   stale_timeout=settings.psql_stale_timeout,
+                                   timeout=settings.psql_pool_timeout,
+                                   register_hstore=False)
 # pylint: enable=no-member
 
 class BaseModel(Model):
@@ -252,7 +316,24 @@ class DatasetLogo(BaseModel):
 # Variant and coverage data fields
 ##
 
-class Variant(BaseModel):
+class ConsequenceModel(BaseModel):
+    """
+    Consequence fields derived from the VEP annotations at import time.
+
+    Stored for a variant (all annotations) and for each of its genes and
+    transcripts (the annotations of that gene or transcript). NULL in
+    major_consequence means that the fields have not been computed.
+    """
+    major_consequence = CharField(null=True)
+    category = CharField(null=True)
+    flags = ArrayField(CharField, null=True)
+    hgvs = CharField(null=True)
+    hgvsp = CharField(null=True)
+    hgvsc = CharField(null=True)
+    canonical = CharField(null=True)
+
+
+class Variant(ConsequenceModel):
     class Meta:
         table_name = "variants"
         schema = 'data'
@@ -299,7 +380,7 @@ class VariantMate(BaseModel):
     allele_num = IntegerField()
 
 
-class VariantGenes(BaseModel):
+class VariantGenes(ConsequenceModel):
     class Meta:
         table_name = 'variant_genes'
         schema = 'data'
@@ -308,7 +389,7 @@ class VariantGenes(BaseModel):
     gene = ForeignKeyField(Gene, column_name="gene", backref="variants")
 
 
-class VariantTranscripts(BaseModel):
+class VariantTranscripts(ConsequenceModel):
     class Meta:
         table_name = 'variant_transcripts'
         schema = 'data'
@@ -340,6 +421,53 @@ class Coverage(BaseModel):
     coverage = ArrayField(FloatField, null=True)
 
 
+class CoverageSummary(BaseModel):
+    """
+    Coverage summarised over fixed-size bins, used for zoomed-out views.
+
+    Each row holds the min, mean and max of the mean coverage and of cov20
+    for the positions pos->pos+resolution-1 of a chromosome.
+    """
+    class Meta:
+        table_name = "coverage_summaries"
+        schema = 'data'
+
+    dataset_version = ForeignKeyField(DatasetVersion, column_name="dataset_version")
+    resolution = IntegerField()
+    chrom = CharField(max_length=10)
+    pos = IntegerField()
+    mean_min = FloatField()
+    mean_avg = FloatField()
+    mean_max = FloatField()
+    cov20_min = FloatField(null=True)
+    cov20_avg = FloatField(null=True)
+    cov20_max = FloatField(null=True)
+
+
+class ImportCheckpoint(BaseModel):
+    """
+    A chunk of a raw data file committed by the importer.
+
+    The lines start_line to end_line-1 of the file are imported, so an
+    interrupted import can be resumed after them.
+    """
+    class Meta:
+        table_name = "import_checkpoints"
+        schema = 'data'
+
+    dataset_version = ForeignKeyField(DatasetVersion, column_name="dataset_version")
+    data_type = CharField()
+    file_name = CharField()
+    start_line = IntegerField()
+    end_line = IntegerField()
+    chrom = CharField(max_length=10, null=True)
+    pos = IntegerField(null=True)
+    row_count = IntegerField()
+    call_count = IntegerField()
+    variant_count = IntegerField()
+    committed = DateTimeField(null=True)
+
+
 class Metrics(BaseModel):
     class Meta:
         table_name = "metrics"
@@ -575,22 +703,212 @@ def get_dataset(dataset: str):
     return dataset
 
 
+class LookupCache:
+    """
+    Request-scoped identity map for database lookups.
+
+    Lookups decorated with ``request_cached`` store their results here while
+    the cache is active (see ``REQUEST_LOOKUP_CACHE``), so repeated fetches of
+    the same row during a request only reach the database once.
+    """
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.saved_queries = 0
+
+    def fetch(self, key: tuple, func, queries: int = 1):
+        """
+        Retrieve a value from the cache, calling func to create it if missing.
+
+        A copy is returned as callers are free to modify the results.
+
+        Args:
+            key (tuple): identifier for the value
+            func (function): function returning the value
+            queries (int): number of queries performed by func
+
+        Returns:
+            a copy of the (possibly cached) value
+
+        """
+        if key in self._entries:
+            self.hits += 1
+            self.saved_queries += queries
+        else:
+            self.misses += 1
+            self._entries[key] = func()
+        return copy.deepcopy(self._entries[key])
+
+
+REQUEST_LOOKUP_CACHE = contextvars.ContextVar('request_lookup_cache', default=None)
+
+
+def request_cached(queries: int = 1):
+    """
+    Memoize a lookup function in the active request lookup cache.
+
+    The function is called as usual if no cache is active.
+
+    Args:
+        queries (int): number of queries performed by the function
+
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = REQUEST_LOOKUP_CACHE.get()
+            if cache is None:
+                return func(*args, **kwargs)
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            key = (func.__qualname__,) + tuple(arguments.arguments.values())
+            return cache.fetch(key, lambda: func(*args, **kwargs), queries)
+        return wrapper
+    return decorator
+
+
+class DatasetVersionCache:
+    """
+    Process-wide cache of resolved dataset versions.
+
+    Entries are keyed on (dataset short name, version). An entry expires after
+    ``ttl`` seconds, and entries resolved without a version (i.e. the current
+    version) also expire as soon as the next version of the dataset becomes
+    available. All entries are dropped when the stamp of the dataset tables
+    changes, see ``validate``.
+
+    Copies of the entries are stored and returned, so callers are free to modify them.
+    """
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._entries = {}
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def get(self, dataset: str, version: str = None):
+        """
+        Retrieve a cached dataset version.
+
+        Args:
+            dataset (str): short name of the dataset
+            version (str): the dataset version; None for the current version
+
+        Returns:
+            DatasetVersion: the cached entry; None if missing or expired
+
+        """
+        key = (dataset, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            dataset_version, expires = entry
+            if expires <= datetime.now():
+                del self._entries[key]
+                return None
+        return copy.deepcopy(dataset_version)
+
+    def set(self, dataset: str, version: str, dataset_version, next_release: datetime = None):
+        """
+        Add a dataset version to the cache.
+
+        Args:
+            dataset (str): short name of the dataset
+            version (str): the dataset version; None for the current version
+            dataset_version (DatasetVersion): the resolved dataset version
+            next_release (datetime): when the next version becomes available, if any
+
+        """
+        expires = datetime.now() + timedelta(seconds=self.ttl)
+        if next_release and next_release < expires:
+            expires = next_release
+        dataset_version = copy.deepcopy(dataset_version)
+        with self._lock:
+            self._entries[(dataset, version)] = (dataset_version, expires)
+
+    def validate(self, stamp):
+        """
+        Drop all entries if the dataset tables have changed since they were cached.
+
+        Args:
+            stamp: the current stamp of the dataset tables, see get_dataset_tables_stamp()
+
+        """
+        with self._lock:
+            if stamp != self._stamp:
+                self._entries.clear()
+                self._stamp = stamp
+
+    def invalidate(self, dataset: str = None):
+        """
+        Remove cached entries.
+
+        Args:
+            dataset (str): short name of the dataset; None to clear the whole cache
+
+        """
+        with self._lock:
+            if dataset is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == dataset]:
+                del self._entries[key]
+
+
+# pylint: disable=no-member
+DATASET_VERSION_CACHE = DatasetVersionCache(settings.dataset_version_cache_ttl)
+# pylint: enable=no-member
+
+
+@request_cached(queries=1)
+def get_dataset_tables_stamp() -> tuple:
+    """
+    Get a stamp of the dataset, dataset version and reference set tables.
+
+    The stamp changes whenever a row of the tables is added, modified or
+    removed, including by other processes such as the importer.
+
+    Returns:
+        tuple: md5 digest of the rows of each table
+
+    """
+    digests = [f"(SELECT md5(string_agg(t::text, ',' ORDER BY t.id)) FROM data.{table} AS t)"
+               for table in ('datasets', 'dataset_versions', 'reference_sets')]
+    return database.execute_sql('SELECT ' + ', '.join(digests)).fetchone()
+
+
 def get_dataset_version(dataset: str, version: str = None):
     """
     Given dataset get DatasetVersion
 
+    Results are cached, see DatasetVersionCache. The stamp of the dataset tables
+    is read on every call (once per request), so changes made by other processes
+    are seen immediately.
+
     Args:
         dataset (str): short name of the dataset
+        version (str): the dataset version; None for the current version
 
     Returns:
         DatasetVersion: the corresponding DatasetVersion entry
 
     """
+    DATASET_VERSION_CACHE.validate(get_dataset_tables_stamp())
+    dataset_version = DATASET_VERSION_CACHE.get(dataset, version)
+    if dataset_version:
+        return dataset_version
+
+    next_release = None
     if version:
         try:
             dataset_version = (DatasetVersion
-                               .select(DatasetVersion, Dataset)
+                               .select(DatasetVersion, Dataset, ReferenceSet)
                                .join(Dataset)
+                               .switch(DatasetVersion)
+                               .join(ReferenceSet)
                                .where(DatasetVersion.version == version,
                                       Dataset.short_name == dataset)).get()
         except DatasetVersion.DoesNotExist:
@@ -600,16 +918,98 @@ def get_dataset_version(dataset: str, version: str = None):
     else:
         try:
             dataset_version = (DatasetVersionCurrent
-                               .select(DatasetVersionCurrent, Dataset)
+                               .select(DatasetVersionCurrent, Dataset, ReferenceSet)
                                .join(Dataset)
+                               .switch(DatasetVersionCurrent)
+                               .join(ReferenceSet)
                                .where(Dataset.short_name == dataset)).get()
         except DatasetVersionCurrent.DoesNotExist:
             logging.error(f"get_dataset_version({dataset}, version=None): " +
                           "cannot retrieve dataset version")
             return None
+        next_release = (DatasetVersion
+                        .select(fn.MIN(DatasetVersion.available_from))
+                        .where(DatasetVersion.dataset == dataset_version.dataset,
+                               DatasetVersion.available_from > datetime.now())
+                        .scalar())
+    DATASET_VERSION_CACHE.set(dataset, version, dataset_version, next_release)
     return dataset_version
 
 
+def region_bin(start_pos, end_pos):
+    """
+    Get the region bin of a start/end pair, calculated by data.region_bin() in the database.
+
+    Args:
+        start_pos: first position of the region (e.g. a Field)
+        end_pos: last position of the region (e.g. a Field)
+
+    Returns:
+        Function: the database function call
+
+    """
+    return getattr(fn, 'data.region_bin')(start_pos, end_pos)
+
+
+def region_bins(start_pos: int, end_pos: int) -> list:
+    """
+    Get the bins that may contain regions overlapping start_pos-end_pos (inclusive).
+
+    Uses the UCSC binning scheme, see data.region_bin() in the database schema.
+
+    Args:
+        start_pos (int): first position of the region
+        end_pos (int): last position of the region
+
+    Returns:
+        list: the bins (int)
+
+    """
+    bins = [0]
+    for shift, offset in ((26, 1), (23, 9), (20, 73), (17, 585)):
+        bins.extend(range(offset + (start_pos >> shift), offset + (end_pos >> shift) + 1))
+    return bins
+
+
+COVERAGE_RESOLUTIONS = (10, 100, 1000)
+
+
+def build_coverage_summaries(dataset_version: int):
+    """
+    Summarise the coverage of a dataset version at each of COVERAGE_RESOLUTIONS.
+
+    Any existing summaries for the dataset version are replaced.
+
+    Args:
+        dataset_version (int): id of the dataset version
+
+    """
+    cov20 = Coverage.coverage[4]
+    with database.atomic():
+        (CoverageSummary.delete()
+         .where(CoverageSummary.dataset_version == dataset_version)
+         .execute())
+        for resolution in COVERAGE_RESOLUTIONS:
+            bin_pos = (Coverage.pos / resolution) * resolution
+            query = (Coverage.select(Coverage.dataset_version, Value(resolution), Coverage.chrom,
+                                     bin_pos, fn.MIN(Coverage.mean), fn.AVG(Coverage.mean),
+                                     fn.MAX(Coverage.mean), fn.MIN(cov20), fn.AVG(cov20),
+                                     fn.MAX(cov20))
+                     .where(Coverage.dataset_version == dataset_version)
+                     .group_by(Coverage.dataset_version, Coverage.chrom, bin_pos))
+            insert = CoverageSummary.insert_from(query, [CoverageSummary.dataset_version,
+                                                         CoverageSummary.resolution,
+                                                         CoverageSummary.chrom,
+                                                         CoverageSummary.pos,
+                                                         CoverageSummary.mean_min,
+                                                         CoverageSummary.mean_avg,
+                                                         CoverageSummary.mean_max,
+                                                         CoverageSummary.cov20_min,
+                                                         CoverageSummary.cov20_avg,
+                                                         CoverageSummary.cov20_max])
+            insert.execute()  # pylint: disable=no-value-for-parameter
+
+
 def build_dict_from_row(row) -> dict:
     """Build a dictionary from a row object"""
     outdict = {}
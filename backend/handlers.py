@@ -1,6 +1,11 @@
+import collections
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
 import logging
 import os.path
 import datetime
+import queue
+import threading
 import urllib.parse
 
 import peewee
@@ -8,9 +13,118 @@ import tornado.auth
 import tornado.escape
 from tornado.escape import json_encode
 import tornado.httpclient
+import tornado.ioloop
+import tornado.locks
 import tornado.web
 
 import db
+import settings
+
+# pylint: disable=no-member
+DB_EXECUTOR = ThreadPoolExecutor(max_workers=settings.db_threads,
+                                 thread_name_prefix='db')
+DB_STREAM_EXECUTOR = ThreadPoolExecutor(max_workers=settings.db_stream_threads,
+                                        thread_name_prefix='db-stream')
+# pylint: enable=no-member
+
+
+def _run_in_db_thread(func, *args):
+    """
+    Run a database function in a worker thread.
+
+    The worker checks out a connection from the pool for the duration of the call.
+    """
+    with db.database.connection_context():
+        return func(*args)
+
+
+_END_OF_STREAM = object()
+
+
+class ResponseCache:
+    """
+    Process-wide cache of rendered responses.
+
+    Entries are evicted, least recently used first, when the total size of
+    the cached bodies exceeds ``max_size`` bytes. A ``max_size`` of 0
+    disables the cache.
+    """
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: collections.OrderedDict = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple):
+        """
+        Retrieve a cached response.
+
+        Args:
+            key (tuple): identifier for the response
+
+        Returns:
+            tuple: (body, etag, content type); None if not cached
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: tuple, body: bytes, etag: str, content_type: str):
+        """
+        Add a response to the cache, evicting the least recently used responses if needed.
+
+        Args:
+            key (tuple): identifier for the response
+            body (bytes): the response body
+            etag (str): the ETag of the body
+            content_type (str): the Content-Type of the body
+
+        """
+        if len(body) > self.max_size:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self.size -= len(old[0])
+            self._entries[key] = (body, etag, content_type)
+            self.size += len(body)
+            while self.size > self.max_size:
+                _, (old_body, _, _) = self._entries.popitem(last=False)
+                self.size -= len(old_body)
+
+    def invalidate(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        """
+        Get statistics for the cache.
+
+        Returns:
+            dict: number of entries, size and max size (bytes), hits and misses
+
+        """
+        with self._lock:
+            return {'entries': len(self._entries),
+                    'size': self.size,
+                    'max_size': self.max_size,
+                    'hits': self.hits,
+                    'misses': self.misses}
+
+
+# pylint: disable=no-member
+RESPONSE_CACHE = ResponseCache(settings.response_cache_size)
+# pylint: enable=no-member
 
 
 class BaseHandler(tornado.web.RequestHandler):
@@ -19,6 +133,10 @@ class BaseHandler(tornado.web.RequestHandler):
     class directly but from either SafeHandler or UnsafeHandler
     to make security status explicit.
     """
+    lookup_cache = None
+    response_cache_key = None
+    response_etag = None
+
     def prepare(self):
         # Make sure we have the xsrf_token, this will generate the xsrf cookie if it isn't set
         self.xsrf_token  # pylint: disable=pointless-statement
@@ -27,8 +145,146 @@ class BaseHandler(tornado.web.RequestHandler):
                 db.database.connect()
             except peewee.DatabaseError as err:
                 logging.error(f"Failed to connect to database: {err}")
+        self.lookup_cache = db.LookupCache()
+        db.REQUEST_LOOKUP_CACHE.set(self.lookup_cache)
+
+    async def run_query(self, func, *args):
+        """
+        Run a blocking database function without blocking the IOLoop.
+
+        The function is executed in the database thread pool, in a copy of
+        the current context so the request lookup cache is kept.
+
+        Args:
+            func (function): the function to run
+            args: arguments for the function
+
+        Returns:
+            the return value of the function
+
+        """
+        context = contextvars.copy_context()
+        return await tornado.ioloop.IOLoop.current().run_in_executor(DB_EXECUTOR, context.run,
+                                                                     _run_in_db_thread,
+                                                                     func, *args)
+
+    async def stream_query(self, func, *args, buffer_size: int = 4):
+        """
+        Iterate over the values of a blocking database function without blocking the IOLoop.
+
+        The function is called, and the iterable it returns consumed, in the
+        stream thread pool. At most buffer_size values are buffered, so the
+        worker pauses, holding its connection, when the consumer falls behind.
+        Slow clients therefore only wait for the few stream threads and never
+        block the threads of the browser queries.
+
+        Args:
+            func (function): the function to run, returning an iterable
+            args: arguments for the function
+            buffer_size (int): maximum number of values waiting to be consumed
+
+        Yields:
+            the values of the iterable; exceptions raised by the function are re-raised
+
+        """
+        values: queue.Queue = queue.Queue(maxsize=buffer_size)
+        ready = tornado.locks.Event()
+        stop = threading.Event()
+        io_loop = tornado.ioloop.IOLoop.current()
+
+        def put(value, err=None):
+            while not stop.is_set():
+                try:
+                    values.put((value, err), timeout=0.5)
+                except queue.Full:
+                    continue
+                io_loop.add_callback(ready.set)
+                return True
+            return False
+
+        def produce():
+            iterator = None
+            try:
+                iterator = iter(func(*args))
+                for value in iterator:
+                    if not put(value):
+                        return
+            except Exception as err:  # pylint: disable=broad-except
+                put(_END_OF_STREAM, err)
+                return
+            finally:
+                # release server-side cursors before the connection goes back to the pool
+                if hasattr(iterator, 'close'):
+                    iterator.close()
+            put(_END_OF_STREAM)
+
+        context = contextvars.copy_context()
+        producer = io_loop.run_in_executor(DB_STREAM_EXECUTOR, context.run,
+                                           _run_in_db_thread, produce)
+        try:
+            while True:
+                try:
+                    value, err = values.get_nowait()
+                except queue.Empty:
+                    ready.clear()
+                    await ready.wait()
+                    continue
+                if value is _END_OF_STREAM:
+                    if err:
+                        raise err
+                    break
+                yield value
+        finally:
+            stop.set()
+            await producer
+
+    def serve_cached_response(self, key: tuple, cache_control: str) -> bool:
+        """
+        Finish the request with a response from RESPONSE_CACHE.
+
+        If the response is not cached, the response the handler finishes
+        with is added to the cache instead, provided the status is 200.
+        The ETag of a cached response is reused, and a matching
+        If-None-Match header gives a 304 as for any GET request.
+
+        Args:
+            key (tuple): identifier for the response
+            cache_control (str): value of the Cache-Control header
+
+        Returns:
+            bool: True if the request was finished from the cache
+
+        """
+        self.set_header('Cache-Control', cache_control)
+        entry = RESPONSE_CACHE.get(key)
+        if entry is None:
+            self.response_cache_key = key
+            return False
+        body, self.response_etag, content_type = entry
+        self.set_header('Content-Type', content_type)
+        self.finish(body)
+        return True
+
+    def compute_etag(self):
+        if self.response_etag is not None:
+            return self.response_etag
+        return super().compute_etag()
+
+    def finish(self, chunk=None):
+        if chunk is not None:
+            self.write(chunk)
+        if self.response_cache_key is not None and self.get_status() == 200:
+            self.response_etag = super().compute_etag()
+            RESPONSE_CACHE.set(self.response_cache_key, b''.join(self._write_buffer),
+                               self.response_etag, self._headers.get('Content-Type'))
+            self.response_cache_key = None
+        return super().finish()
 
     def on_finish(self):
+        if self.lookup_cache is not None and self.lookup_cache.hits:
+            logging.debug(f"Lookup cache saved {self.lookup_cache.saved_queries} queries " +
+                          f"({self.lookup_cache.hits} hits, {self.lookup_cache.misses} misses)")
+        db.REQUEST_LOOKUP_CACHE.set(None)
         if not db.database.is_closed():
             db.database.close()
 
@@ -80,23 +336,59 @@ class BaseHandler(tornado.web.RequestHandler):
         super().write(new_chunk)
 
 
+class _HumpBackKeys(dict):
+    """
+    Memoized translation of dict keys to humpBack-case.
+
+    Responses reuse the same few keys for every row, so each key is only
+    converted once. At most ``max_keys`` translations are kept.
+    """
+    max_keys = 10000
+
+    def __missing__(self, key):
+        # First character should be the same as in the original string
+        new_key = key[0] + "".join([a[0].upper() + a[1:] for a in key.split("_")])[1:]
+        if len(self) < self.max_keys:
+            self[key] = new_key
+        return new_key
+
+
+_HUMP_BACK_KEYS = _HumpBackKeys()
+
+# values that are returned as they are by _convert_keys_to_hump_back
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def hump_back_key(key: str) -> str:
+    """
+    Convert a key given in snake_case to humpBack-case, while preserving the
+    capitalization of the first letter.
+
+    Args:
+        key (str): the key
+
+    Returns:
+        str: the converted key
+
+    """
+    return _HUMP_BACK_KEYS[key]
+
+
 def _convert_keys_to_hump_back(chunk):
     """
     Converts keys given in snake_case to humpBack-case, while preserving the
     capitalization of the first letter.
+
+    Scalar values are copied without a recursive call.
     """
+    if isinstance(chunk, dict):
+        return {_HUMP_BACK_KEYS[k]: (v if v.__class__ in _SCALAR_TYPES
+                                     else _convert_keys_to_hump_back(v))
+                for k, v in chunk.items()}
     if isinstance(chunk, list):
-        return [_convert_keys_to_hump_back(e) for e in chunk]
-
-    if not isinstance(chunk, dict):
-        return chunk
-
-    new_chunk = {}
-    for k, v in chunk.items():
-        # First character should be the same as in the original string
-        new_key = k[0] + "".join([a[0].upper() + a[1:] for a in k.split("_")])[1:]
-        new_chunk[new_key] = _convert_keys_to_hump_back(v)
-    return new_chunk
+        return [e if e.__class__ in _SCALAR_TYPES else _convert_keys_to_hump_back(e)
+                for e in chunk]
+    return chunk
 
 
 class UnsafeHandler(BaseHandler):
@@ -160,6 +452,21 @@ class AdminHandler(SafeHandler):
             return
 
 
+class MonitoringHandler(SafeHandler):
+    """
+    Server status for monitoring, only available to users who are admin of a dataset.
+    """
+    def prepare(self):
+        super().prepare()
+
+        if self._finished:
+            return
+
+        if db.get_admin_datasets(self.current_user).count() <= 0:
+            logging.debug("No user admin: Send error 403")
+            self.send_error(status_code=403)
+
+
 class SafeStaticFileHandler(tornado.web.StaticFileHandler, SafeHandler):
     """
     Serve static files for logged in users
@@ -1,7 +1,13 @@
 """Request handlers for the variant browser."""
 
+from datetime import datetime
+import functools
 import logging
 
+import tornado.escape
+import tornado.iostream
+
+import consequences
 import db
 import handlers
 
@@ -9,11 +15,57 @@ from . import error
 from . import lookups
 from . import utils
 
+# Seconds clients may reuse responses for an explicitly requested (released) dataset version
+CACHE_MAX_AGE = 86400
+
+
+def cached_response(arguments: tuple = (), other_datasets: bool = False):
+    """
+    Serve a GET handler from the response cache for released dataset versions.
+
+    Responses are cached per handler, dataset, resolved dataset version and
+    path arguments (e.g. the gene), plus the given query arguments.
+    Responses for a version that is not yet available are never cached.
+    Requests for an explicit version may be reused by the client for
+    CACHE_MAX_AGE seconds, while requests for the current version have to
+    be revalidated (using the ETag) as the current version may change.
+
+    A response that also includes data from the current versions of the other
+    datasets (other_datasets) is cached per resolved version of those as
+    well, and always has to be revalidated.
+
+    Args:
+        arguments (tuple): names of the query arguments used by the handler
+        other_datasets (bool): whether the response depends on the current
+                               versions of the other datasets
+
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, **kwargs):
+            dataset, ds_version = utils.parse_dataset(kwargs['dataset'], kwargs.get('ds_version'))
+            dataset_version = await self.run_query(db.get_dataset_version, dataset, ds_version)
+            if dataset_version and dataset_version.available_from <= datetime.now():
+                key = (self.__class__.__name__, dataset, dataset_version.id,
+                       tuple(sorted((name, value) for name, value in kwargs.items()
+                                    if name not in ('dataset', 'ds_version'))),
+                       tuple(self.get_argument(name, None) for name in arguments))
+                cache_control = f'public, max-age={CACHE_MAX_AGE}' if ds_version else 'no-cache'
+                if other_datasets:
+                    key += (tuple(await self.run_query(lookups.get_other_dataset_versions,
+                                                       dataset, dataset_version)),)
+                    cache_control = 'no-cache'
+                if self.serve_cached_response(key, cache_control):
+                    return
+            await method(self, **kwargs)
+        return wrapper
+    return decorator
+
 
 class Autocomplete(handlers.UnsafeHandler):
     """Provide autocompletion for protein names based on current query."""
 
-    def get(self, dataset: str, query: str, ds_version: str = None):
+    async def get(self, dataset: str, query: str, ds_version: str = None):
         """
         Provide autocompletion for protein names based on current query.
 
@@ -24,19 +76,19 @@ class Autocomplete(handlers.UnsafeHandler):
 
         """
         dataset, ds_version = utils.parse_dataset(dataset, ds_version)
-        ret = {}
-
-        results = lookups.autocomplete(dataset, query, ds_version)
-        ret = {'values': sorted(list(set(results)))[:20]}
-
-        self.finish(ret)
+        try:
+            results = await self.run_query(lookups.autocomplete, dataset, query, ds_version)
+        except error.NotFoundError as err:
+            self.send_error(status_code=404, reason=str(err))
+            return
+        self.finish({'values': results})
 
 
 class Download(handlers.UnsafeHandler):
     """Download variants in CSV format."""
 
-    def get(self, dataset: str, datatype: str, item: str,  # pylint: disable=too-many-arguments
-            ds_version: str = None, filter_type: str = None):
+    async def get(self, dataset: str, datatype: str, item: str,  # pylint: disable=too-many-arguments
+                  ds_version: str = None, filter_type: str = None):
         """
         Download variants in CSV format.
 
@@ -57,36 +109,35 @@ class Download(handlers.UnsafeHandler):
         self.set_header(f'content-Disposition',
                         f'attachment; filename={filename}')
 
-        data = utils.get_variant_list(dataset, datatype, item, ds_version)
-        # filter variants based on what is shown
-        if filter_type:
-            filters = filter_type.split('~')
-            if filters[1] == 'false':
-                data['variants'] = [variant for variant in data['variants']
-                                    if variant['filter_string'] == 'PASS']
-            if filters[0] == 'mislof':
-                data['variants'] = [variant for variant in data['variants']
-                                    if variant['major_consequence'] == 'missense'
-                                    or 'LoF' in variant['flags']]
-            elif 'lof' in filters[0]:
-                data['variants'] = [variant for variant in data['variants']
-                                    if 'LoF' in variant['flags']]
-
-        # Write header
-        self.write(','.join([h[1] for h in data['headers']]) + '\n')
-
-        for variant in data['variants']:
-            headers = [h[0] for h in data['headers']]
-            self.write(','.join(map(str, [variant[h] for h in headers])) + '\n')
+        # rows are formatted in a database thread and sent to the client as they arrive
+        chunks = self.stream_query(functools.partial(utils.get_variant_csv,
+                                                     filter_type=filter_type),
+                                   dataset, datatype, item, ds_version)
+        try:
+            async for chunk in chunks:
+                self.write(chunk)
+                await self.flush()
+        except error.NotFoundError as err:
+            self.send_error(status_code=404, reason=str(err))
+        except (error.ParsingError, error.MalformedRequest) as err:
+            self.send_error(status_code=400, reason=str(err))
+        except tornado.iostream.StreamClosedError:
+            logging.info(f'Download of {filename} aborted by the client')
+        finally:
+            await chunks.aclose()
 
 
 class GetCoverage(handlers.UnsafeHandler):
     """Retrieve coverage."""
 
-    def get(self, dataset: str, datatype: str, item: str, ds_version: str = None):
+    @cached_response(arguments=('resolution',))
+    async def get(self, dataset: str, datatype: str, item: str, ds_version: str = None):
         """
         Retrieve coverage.
 
+        The optional query argument resolution gives the bin size in bases,
+        or "auto" to choose it from the length of the region.
+
         Args:
             dataset (str): dataset short name
             datatype (str): type of data
@@ -95,8 +146,10 @@ class GetCoverage(handlers.UnsafeHandler):
 
         """
         dataset, ds_version = utils.parse_dataset(dataset, ds_version)
+        resolution = self.get_argument('resolution', '1')
         try:
-            ret = utils.get_coverage(dataset, datatype, item, ds_version)
+            ret = await self.run_query(utils.get_coverage, dataset, datatype, item, ds_version,
+                                       resolution)
         except error.NotFoundError as err:
             self.send_error(status_code=404, reason=str(err))
             return
@@ -109,7 +162,7 @@ class GetCoverage(handlers.UnsafeHandler):
 class GetCoveragePos(handlers.UnsafeHandler):
     """Retrieve coverage range."""
 
-    def get(self, dataset: str, datatype: str, item: str, ds_version: str = None):
+    async def get(self, dataset: str, datatype: str, item: str, ds_version: str = None):
         """
         Retrieve coverage range.
 
@@ -122,7 +175,7 @@ class GetCoveragePos(handlers.UnsafeHandler):
         """
         dataset, ds_version = utils.parse_dataset(dataset, ds_version)
         try:
-            ret = utils.get_coverage_pos(dataset, datatype, item, ds_version)
+            ret = await self.run_query(utils.get_coverage_pos, dataset, datatype, item, ds_version)
         except error.NotFoundError as err:
             self.send_error(status_code=404, reason=str(err))
             return
@@ -136,7 +189,8 @@ class GetCoveragePos(handlers.UnsafeHandler):
 class GetGene(handlers.UnsafeHandler):
     """Request information about a gene."""
 
-    def get(self, dataset: str, gene: str, ds_version: str = None):
+    @cached_response()
+    async def get(self, dataset: str, gene: str, ds_version: str = None):
         """
         Request information about a gene.
 
@@ -153,7 +207,7 @@ class GetGene(handlers.UnsafeHandler):
 
         # Gene
         try:
-            gene = lookups.get_gene(dataset, gene_id, ds_version)
+            gene = await self.run_query(lookups.get_gene, dataset, gene_id, ds_version)
         except error.NotFoundError as err:
             self.send_error(status_code=404, reason=str(err))
             return
@@ -161,7 +215,8 @@ class GetGene(handlers.UnsafeHandler):
         ret['gene'] = gene
 
         # Add exons from transcript
-        transcript = lookups.get_transcript(dataset, gene['canonical_transcript'], ds_version)
+        transcript = await self.run_query(lookups.get_transcript, dataset,
+                                          gene['canonical_transcript'], ds_version)
         ret['exons'] = []
         for exon in sorted(transcript['exons'], key=lambda k: k['start']):
             ret['exons'] += [{'start': exon['start'],
@@ -169,7 +224,8 @@ class GetGene(handlers.UnsafeHandler):
                               'type': exon['feature_type']}]
 
         # Transcripts
-        transcripts_in_gene = lookups.get_transcripts_in_gene(dataset, gene_id, ds_version)
+        transcripts_in_gene = await self.run_query(lookups.get_transcripts_in_gene,
+                                                   dataset, gene_id, ds_version)
         if transcripts_in_gene:
             ret['transcripts'] = []
             for transcript in transcripts_in_gene:
@@ -185,7 +241,8 @@ class GetGene(handlers.UnsafeHandler):
 class GetRegion(handlers.UnsafeHandler):
     """Request information about genes in a region."""
 
-    def get(self, dataset: str, region: str, ds_version: str = None):
+    @cached_response()
+    async def get(self, dataset: str, region: str, ds_version: str = None):
         """
         Request information about genes in a region.
 
@@ -212,7 +269,8 @@ class GetRegion(handlers.UnsafeHandler):
             self.send_error(status_code=400, reason='Region too large')
             return
 
-        genes_in_region = lookups.get_genes_in_region(dataset, chrom, start, stop, ds_version)
+        genes_in_region = await self.run_query(lookups.get_genes_in_region,
+                                               dataset, chrom, start, stop, ds_version)
         if genes_in_region:
             ret['region']['genes'] = []
             for gene in genes_in_region:
@@ -222,10 +280,65 @@ class GetRegion(handlers.UnsafeHandler):
         self.finish(ret)
 
 
+class GetRegionSetVariants(handlers.UnsafeHandler):
+    """Retrieve the variants in a set of regions and genes as NDJSON or CSV."""
+
+    def check_xsrf_cookie(self):
+        """Accept posts without an XSRF token, as the lookup does not change anything."""
+
+    async def post(self, dataset: str, ds_version: str = None):
+        """
+        Retrieve the variants in a set of regions and genes as NDJSON or CSV.
+
+        The body holds BED-like regions and/or gene ids, one per line (see
+        utils.parse_region_set). The format is given by the `format` argument
+        (ndjson or csv, default ndjson). The variants are streamed, ordered by
+        chromosome and position.
+
+        Args:
+            dataset (str): short name of the dataset
+            ds_version (str): dataset version
+
+        """
+        dataset, ds_version = utils.parse_dataset(dataset, ds_version)
+        export_format = self.get_argument('format', 'ndjson')
+        try:
+            region_set = self.request.body.decode('utf-8')
+        except UnicodeDecodeError:
+            self.send_error(status_code=400, reason='Unable to decode the regions')
+            return
+
+        if export_format == 'csv':
+            self.set_header('Content-Type', 'text/csv')
+            self.set_header('Content-Disposition',
+                            f'attachment; filename={dataset}_regions.csv')
+        else:
+            self.set_header('Content-Type', 'application/x-ndjson')
+
+        # NDJSON uses the same keys as the JSON responses
+        chunks = self.stream_query(functools.partial(utils.get_region_set_export,
+                                                     export_format=export_format,
+                                                     json_key=handlers.hump_back_key),
+                                   dataset, region_set, ds_version)
+        try:
+            async for chunk in chunks:
+                self.write(chunk)
+                await self.flush()
+        except error.NotFoundError as err:
+            self.send_error(status_code=404, reason=str(err))
+        except (error.ParsingError, error.MalformedRequest) as err:
+            self.send_error(status_code=400, reason=str(err))
+        except tornado.iostream.StreamClosedError:
+            logging.info(f'Region set export for {dataset} aborted by the client')
+        finally:
+            await chunks.aclose()
+
+
 class GetTranscript(handlers.UnsafeHandler):
     """Request information about a transcript."""
 
-    def get(self, dataset: str, transcript: str, ds_version: str = None):
+    @cached_response()
+    async def get(self, dataset: str, transcript: str, ds_version: str = None):
         """
         Request information about a transcript.
 
@@ -241,7 +354,8 @@ class GetTranscript(handlers.UnsafeHandler):
 
         # Add transcript information
         try:
-            transcript = lookups.get_transcript(dataset, transcript_id, ds_version)
+            transcript = await self.run_query(lookups.get_transcript,
+                                              dataset, transcript_id, ds_version)
         except error.NotFoundError as err:
             self.send_error(status_code=404, reason=str(err))
             return
@@ -258,13 +372,14 @@ class GetTranscript(handlers.UnsafeHandler):
                               'type': exon['feature_type']}]
 
         # Add gene information
-        gene = lookups.get_gene_by_dbid(transcript['gene'])
+        gene = await self.run_query(lookups.get_gene_by_dbid, transcript['gene'])
         ret['gene']['id'] = gene['gene_id']
         ret['gene']['name'] = gene['name']
         ret['gene']['full_name'] = gene['full_name']
         ret['gene']['canonical_transcript'] = gene['canonical_transcript']
 
-        gene_transcripts = lookups.get_transcripts_in_gene_by_dbid(transcript['gene'])
+        gene_transcripts = await self.run_query(lookups.get_transcripts_in_gene_by_dbid,
+                                                transcript['gene'])
         ret['gene']['transcripts'] = [g['transcript_id'] for g in gene_transcripts]
 
         self.finish(ret)
@@ -273,7 +388,8 @@ class GetTranscript(handlers.UnsafeHandler):
 class GetVariant(handlers.UnsafeHandler):
     """Request information about a gene."""
 
-    def get(self, dataset: str, variant: str, ds_version: str = None):
+    @cached_response(other_datasets=True)
+    async def get(self, dataset: str, variant: str, ds_version: str = None):
         """
         Request information about a gene.
 
@@ -300,8 +416,8 @@ class GetVariant(handlers.UnsafeHandler):
             return
         orig_variant = variant
         try:
-            variant = lookups.get_variant(dataset, split_var[1], split_var[0],
-                                          split_var[2], split_var[3], ds_version)
+            variant = await self.run_query(lookups.get_variant, dataset, split_var[1],
+                                           split_var[0], split_var[2], split_var[3], ds_version)
         except error.NotFoundError as err:
             logging.info('Variant not found ({})'.format(orig_variant))
             self.send_error(status_code=404, reason=str(err))
@@ -318,14 +434,14 @@ class GetVariant(handlers.UnsafeHandler):
         # https://www.ensembl.org/info/docs/tools/vep/vep_formats.html
         ret['variant']['consequences'] = []
         if 'vep_annotations' in variant:
-            utils.add_consequence_to_variant(variant)
+            consequences.add_consequence_to_variant(variant)
             variant['vep_annotations'] = \
                 utils.remove_extraneous_vep_annotations(variant['vep_annotations'])
             # Adds major_consequence
             variant['vep_annotations'] = utils.order_vep_by_csq(variant['vep_annotations'])
             ret['variant']['annotations'] = {}
             for annotation in variant['vep_annotations']:
-                annotation['HGVS'] = utils.get_proper_hgvs(annotation)
+                annotation['HGVS'] = consequences.get_proper_hgvs(annotation)
 
                 # Add consequence type to the annotations if it doesn't exist
                 consequence_type = (annotation['Consequence'].split('&')[0]
@@ -351,20 +467,10 @@ class GetVariant(handlers.UnsafeHandler):
         # data easier to use in the template
 
         # get the variant for other datasets with the same reference_set
-        curr_dsv = db.get_dataset_version(dataset, ds_version)
-        dsvs = [db.get_dataset_version(dset.short_name) for dset in db.Dataset.select()
-                if dset.short_name != dataset]
-        # if the only available version is not released yet
-        dsvs = list(filter(lambda dsv: dsv, dsvs))
-        dsvs = [dsv for dsv in dsvs if dsv.reference_set == curr_dsv.reference_set]
-        dsv_groups = [(curr_dsv, variant)]
-        for dsv in dsvs:
-            try:
-                hit = lookups.get_variant(dsv.dataset.short_name, split_var[1], split_var[0],
-                                          split_var[2], split_var[3], dsv.version)
-            except error.NotFoundError:
-                continue
-            dsv_groups.append((dsv, hit))
+        dataset_hits = await self.run_query(functools.partial(lookups.get_variant_frequencies,
+                                                              ds_version=ds_version),
+                                            dataset, split_var[1], split_var[0], split_var[2],
+                                            split_var[3])
 
         frequencies = {'headers': [['Dataset', 'pop'],
                                    ['Allele Count', 'acs'],
@@ -378,19 +484,19 @@ class GetVariant(handlers.UnsafeHandler):
                     'allele_freq': 'freq',
                     'hom_count': 'homs'}
 
-        for dsv_group in dsv_groups:
-            ds_name = dsv_group[0].dataset.short_name
+        for hit in dataset_hits:
+            ds_name = hit['dataset']
 
             if ds_name not in frequencies['datasets']:
                 frequencies['datasets'][ds_name] = {'pop': ds_name}
             for item in term_map:
                 if term_map[item] not in frequencies['total']:
                     frequencies['total'][term_map[item]] = 0
-                if dsv_group[1][item] is None:
+                if hit[item] is None:
                     frequencies['datasets'][ds_name][term_map[item]] = 0
                 else:
-                    frequencies['datasets'][ds_name][term_map[item]] = dsv_group[1][item]
-                    frequencies['total'][term_map[item]] += dsv_group[1][item]
+                    frequencies['datasets'][ds_name][term_map[item]] = hit[item]
+                    frequencies['total'][term_map[item]] += hit[item]
 
             if 'freq' in frequencies['total']:
                 frequencies['total']['freq'] = \
@@ -400,10 +506,51 @@ class GetVariant(handlers.UnsafeHandler):
         self.finish(ret)
 
 
+class GetVariantBatch(handlers.UnsafeHandler):
+    """Retrieve frequencies, filters and consequences for a batch of variants."""
+
+    def check_xsrf_cookie(self):
+        """Accept posts without an XSRF token, as the lookup does not change anything."""
+
+    async def post(self, dataset: str, ds_version: str = None):
+        """
+        Retrieve frequencies, filters and consequences for a batch of variants.
+
+        The body is a JSON object with a list of variant ids (chrom-pos-ref-alt)
+        and/or rsids, e.g. ``{"variants": ["22-46615715-C-T", "rs4823"]}``.
+
+        Args:
+            dataset (str): short name of the dataset
+            ds_version (str): dataset version
+
+        """
+        dataset, ds_version = utils.parse_dataset(dataset, ds_version)
+        try:
+            queries = tornado.escape.json_decode(self.request.body)['variants']
+        except (ValueError, KeyError, TypeError):
+            queries = None
+        if not isinstance(queries, list):
+            self.send_error(status_code=400,
+                            reason='Expected a JSON object with a list of variants')
+            return
+
+        try:
+            ret = await self.run_query(utils.get_variant_batch, dataset, queries, ds_version)
+        except error.NotFoundError as err:
+            self.send_error(status_code=404, reason=str(err))
+            return
+        except (error.ParsingError, error.MalformedRequest) as err:
+            self.send_error(status_code=400, reason=str(err))
+            return
+
+        self.finish({'variants': ret})
+
+
 class GetVariants(handlers.UnsafeHandler):
     """Retrieve variants."""
 
-    def get(self, dataset: str, datatype: str, item: str, ds_version: str = None):
+    @cached_response()
+    async def get(self, dataset: str, datatype: str, item: str, ds_version: str = None):
         """
         Retrieve variants.
 
@@ -415,7 +562,7 @@ class GetVariants(handlers.UnsafeHandler):
         """
         dataset, ds_version = utils.parse_dataset(dataset, ds_version)
         try:
-            ret = utils.get_variant_list(dataset, datatype, item, ds_version)
+            ret = await self.run_query(utils.get_variant_list, dataset, datatype, item, ds_version)
         except error.NotFoundError as err:
             self.send_error(status_code=404, reason=str(err))
             return
@@ -423,19 +570,15 @@ class GetVariants(handlers.UnsafeHandler):
             self.send_error(status_code=400, reason=str(err))
             return
 
-        # inconvenient way of doing humpBack-conversion
-        headers = []
-        for a, h in ret['headers']:
-            n = a[0] + "".join([b[0].upper() + b[1:] for b in a.split("_")])[1:]
-            headers += [[n, h]]
-        ret['headers'] = headers
+        ret['headers'] = [[handlers.hump_back_key(key), header]
+                          for key, header in ret['headers']]
         self.finish(ret)
 
 
 class Search(handlers.UnsafeHandler):
     """Perform a search for the wanted object."""
 
-    def get(self, dataset: str, query: str, ds_version: str = None):
+    async def get(self, dataset: str, query: str, ds_version: str = None):
         """
         Perform a search for the wanted object.
 
@@ -447,7 +590,8 @@ class Search(handlers.UnsafeHandler):
         dataset, ds_version = utils.parse_dataset(dataset, ds_version)
         ret = {"dataset": dataset, "value": None, "type": None}
 
-        datatype, identifier = lookups.get_awesomebar_result(dataset, query, ds_version)
+        datatype, identifier = await self.run_query(lookups.get_awesomebar_result,
+                                                    dataset, query, ds_version)
 
         if datatype == "dbsnp_variant_set":
             datatype = "dbsnp"
@@ -1,18 +1,133 @@
 """Lookup functions for the variant browser."""
+# pylint: disable=too-many-lines
 
+import bisect
+from datetime import datetime, timedelta
 import logging
 import re
+import threading
+
+from peewee import Case, NodeList, SQL, Tuple, Value, fn
+from playhouse.postgres_ext import ServerSide
 
 import db
+import settings
+from coverage_store import CoverageStore
 
 from . import error
 
 SEARCH_LIMIT = 10000
+AUTOCOMPLETE_LIMIT = 20
+
+# VEP annotation keys used to compute the consequence of a variant in a variant list
+LIST_ANNOTATION_FIELDS = ('Consequence', 'CANONICAL', 'LoF', 'LoF_filter', 'LoF_flags',
+                          'HGVSp', 'HGVSc', 'Amino_acids', 'Protein_position')
+
+COVERAGE_STORE = CoverageStore(settings.coverage_dir) if settings.coverage_dir else None
 
 REGION_REGEX = re.compile(r'^\s*(\d+|X|Y|M|MT)\s*([-:]?)\s*(\d*)-?([\dACTG]*)-?([ACTG]*)')
+RSID_REGEX = re.compile(r'^rs\d+$', re.IGNORECASE)
+ENSEMBL_ID_REGEX = re.compile(r'^ENS[A-Z]*([GT])\d+$')
+
 
+class GeneNameIndex():
+    """
+    In-memory prefix index of the gene names (including other names) of reference sets.
+
+    The names of a reference set are loaded on first use and shared by all
+    requests. They are kept sorted case-insensitively, so the names starting
+    with a prefix are found by binary search. An index is reloaded once it is
+    ``ttl`` seconds old, so names of re-imported reference data are picked up.
+    """
 
-def autocomplete(dataset: str, query: str, ds_version: str = None) -> list:
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._indexes: dict = {}
+        self._lock = threading.Lock()
+
+    def get_index(self, reference_set: int) -> tuple:
+        """
+        Get the index of a reference set, loading it if needed.
+
+        Args:
+            reference_set (int): id of the reference set
+
+        Returns:
+            tuple: (upper case names, names), both in the order of the index
+
+        """
+        with self._lock:
+            entry = self._indexes.get(reference_set)
+            if entry is None or entry[1] <= datetime.now():
+                entry = (self._load(reference_set),
+                         datetime.now() + timedelta(seconds=self.ttl))
+                self._indexes[reference_set] = entry
+        return entry[0]
+
+    @staticmethod
+    def _load(reference_set: int) -> tuple:
+        """
+        Read the gene names of a reference set.
+
+        Args:
+            reference_set (int): id of the reference set
+
+        Returns:
+            tuple: (upper case names, names), sorted case-insensitively
+
+        """
+        names = {gene.name for gene in (db.Gene.select(db.Gene.name)
+                                        .where(db.Gene.reference_set == reference_set))}
+        names.update(other.name for other in (db.GeneOtherNames.select(db.GeneOtherNames.name)
+                                              .join(db.Gene)
+                                              .where(db.Gene.reference_set == reference_set)))
+        names.discard(None)
+        names = sorted(names, key=lambda name: (name.upper(), name))
+        logging.debug(f'Loaded {len(names)} gene names for reference set {reference_set}')
+        return [name.upper() for name in names], names
+
+    def search(self, reference_set: int, prefix: str, limit: int) -> list:
+        """
+        Find the gene names starting with a prefix, ignoring case.
+
+        Args:
+            reference_set (int): id of the reference set
+            prefix (str): the beginning of the names
+            limit (int): maximum number of names to return
+
+        Returns:
+            list: the first matching names, in case-insensitive order
+
+        """
+        keys, names = self.get_index(reference_set)
+        prefix = prefix.upper()
+        first = bisect.bisect_left(keys, prefix)
+        last = first
+        end = min(first + limit, len(keys))
+        while last < end and keys[last].startswith(prefix):
+            last += 1
+        return names[first:last]
+
+    def invalidate(self, reference_set: int = None):
+        """
+        Remove loaded indexes, e.g. after importing reference data.
+
+        Args:
+            reference_set (int): id of the reference set; None to clear all indexes
+
+        """
+        with self._lock:
+            if reference_set is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(reference_set, None)
+
+
+GENE_NAME_INDEX = GeneNameIndex(settings.gene_name_index_ttl)
+
+
+def autocomplete(dataset: str, query: str, ds_version: str = None,
+                 limit: int = AUTOCOMPLETE_LIMIT) -> list:
     """
     Provide autocomplete suggestions based on the query.
 
@@ -20,20 +135,77 @@ def autocomplete(dataset: str, query: str, ds_version: str = None) -> list:
         dataset (str): short name of dataset
         query (str): the query to compare to the available gene names
         ds_version (str): the dataset version
+        limit (int): maximum number of suggestions
 
     Returns:
-        list: A list of genes names whose beginning matches the query
+        list: gene names (or other names) whose beginning matches the query, ignoring case
 
     """
     try:
         ref_set = db.get_dataset_version(dataset, ds_version).reference_set
     except AttributeError as err:
         raise error.NotFoundError(f'Reference set not found for dataset {dataset}.') from err
-    query = (db.Gene.select(db.Gene.name)
-             .where(((db.Gene.name.startswith(query)) &
-                     (db.Gene.reference_set == ref_set))))
-    gene_names = [str(gene.name) for gene in query]
-    return gene_names
+    return GENE_NAME_INDEX.search(ref_set.id, query, limit)
+
+
+def classify_query(query: str) -> str:
+    """
+    Determine the type of a search query from its syntax alone.
+
+    Type is one of:
+
+    * `rsid`
+    * `gene_id` (Ensembl)
+    * `transcript_id` (Ensembl)
+    * `variant` (chrom-pos-ref-alt)
+    * `region` (chrom, chrom-pos or chrom-start-stop)
+    * `gene_name`, for anything else
+
+    Args:
+        query (str): the search query, without surrounding whitespace
+
+    Returns:
+        str: the query type
+
+    """
+    if RSID_REGEX.match(query):
+        return 'rsid'
+    query = query.upper()
+    match = ENSEMBL_ID_REGEX.match(query)
+    if match:
+        return 'gene_id' if match.group(1) == 'G' else 'transcript_id'
+    match = _match_region(query)
+    if match and match.end() == len(query) - (3 if query.startswith('CHR') else 0):
+        return 'variant' if _is_variant_match(match) else 'region'
+    return 'gene_name'
+
+
+def _match_region(query: str):
+    """
+    Match an upper case query, with an optional CHR prefix, against REGION_REGEX.
+
+    Args:
+        query (str): the upper case search query
+
+    Returns:
+        re.Match: the match; None if the query does not start like a region
+
+    """
+    return REGION_REGEX.match(query[3:] if query.startswith('CHR') else query)
+
+
+def _is_variant_match(match) -> bool:
+    """
+    Check whether a REGION_REGEX match describes a variant (chrom-pos-ref-alt).
+
+    Args:
+        match (re.Match): the match
+
+    Returns:
+        bool: True for a variant
+
+    """
+    return bool(match.group(5)) and set(match.group(4)).issubset(set("ACGT"))
 
 
 def get_awesomebar_result(dataset: str, query: str, ds_version: str = None) -> tuple:
@@ -47,6 +219,7 @@ def get_awesomebar_result(dataset: str, query: str, ds_version: str = None) -> t
     * `variant`
     * `dbsnp_variant_set`
     * `region`
+    * `not_found`
 
     Identifier is one of:
 
@@ -54,12 +227,16 @@ def get_awesomebar_result(dataset: str, query: str, ds_version: str = None) -> t
     * variant ID string for variant (eg. 1-1000-A-T)
     * region ID string for region (eg. 1-1000-2000)
 
-    Follow these steps:
+    The type of the query is determined by classify_query, and only the
+    lookup for that type is performed:
 
     * if query is an ensembl ID, return it
-    * if a gene symbol, return that gene's ensembl ID
+    * if a gene symbol (or other name), return that gene's ensembl ID
     * if an RSID, return that variant's string
 
+    Gene symbols may look like regions (e.g. XG or MT3), so region queries
+    are looked up as gene symbols first.
+
     Args:
         dataset (str): short name of dataset
         query (str): the search query
@@ -71,48 +248,41 @@ def get_awesomebar_result(dataset: str, query: str, ds_version: str = None) -> t
     """
     # pylint: disable=too-many-return-statements,too-many-branches
     query = query.strip()
+    query_type = classify_query(query)
 
-    # Parse Variant types
-    try:
-        variant = get_variants_by_rsid(dataset, query.lower(), ds_version=ds_version)
-    except (error.NotFoundError, error.ParsingError):
-        pass
-    else:
-        if len(variant) == 1:
-            return ('variant', variant[0]['variant_id'])
-        return ('dbsnp_variant_set', variant[0]['rsid'])
+    if query_type == 'rsid':
+        try:
+            variant = get_variants_by_rsid(dataset, query.lower(), ds_version=ds_version)
+        except error.NotFoundError:
+            pass
+        else:
+            if len(variant) == 1:
+                return ('variant', variant[0]['variant_id'])
+            return ('dbsnp_variant_set', variant[0]['rsid'])
 
-    # Gene
-    try:
-        gene = get_gene_by_name(dataset, query)
-        return 'gene', gene['gene_id']
-    except error.NotFoundError:
-        pass
+    elif query_type in ('gene_name', 'region'):
+        try:
+            gene = get_gene_by_name(dataset, query, ds_version)
+            return 'gene', gene['gene_id']
+        except error.NotFoundError:
+            pass
 
-    # Capital letters for all other queries
-    query = query.upper()
-    try:
-        gene = get_gene_by_name(dataset, query)
-        return 'gene', gene['gene_id']
-    except error.NotFoundError:
-        pass
-
-    # Ensembl formatted queries
-    if query.startswith('ENS'):
-        # Gene
+    elif query_type == 'gene_id':
         try:
-            gene = get_gene(dataset, query)
+            gene = get_gene(dataset, query.upper(), ds_version)
             return 'gene', gene['gene_id']
         except error.NotFoundError:
             pass
-        # Transcript
+
+    elif query_type == 'transcript_id':
         try:
-            transcript = get_transcript(dataset, query)
+            transcript = get_transcript(dataset, query.upper(), ds_version)
             return 'transcript', transcript['transcript_id']
         except error.NotFoundError:
             pass
 
-    # Region and variant queries
+    # Region and variant queries; also the beginning of unknown gene names
+    query = query.upper()
     query = query[3:] if query.startswith('CHR') else query
 
     match = REGION_REGEX.match(query)
@@ -122,7 +292,7 @@ def get_awesomebar_result(dataset: str, query: str, ds_version: str = None) -> t
         if match.group(2) == ":":
             target = target.replace(":", "-")
 
-        if match.group(5) and set(match.group(4)).issubset(set("ACGT")):
+        if _is_variant_match(match):
             target_type = 'variant'
             try:
                 get_raw_variant(dataset, int(match.group(3)), match.group(1),
@@ -140,6 +310,9 @@ def get_coverage_for_bases(dataset: str, chrom: str, start_pos: int,
     """
     Get the coverage for the list of bases given by start_pos->end_pos, inclusive.
 
+    The memory-mapped coverage store is used if the dataset version has been
+    written to it, otherwise the coverage is read from the database.
+
     Args:
         dataset (str): short name for the dataset
         chrom (str): chromosome
@@ -157,17 +330,62 @@ def get_coverage_for_bases(dataset: str, chrom: str, start_pos: int,
 
     if end_pos is None:
         end_pos = start_pos
-    coverage = list(db.Coverage.select()
-                    .where((db.Coverage.pos >= start_pos) &
-                           (db.Coverage.pos <= end_pos) &
-                           (db.Coverage.chrom == chrom) &
-                           (db.Coverage.dataset_version == dataset_version.id))
-                    .dicts())
+    if COVERAGE_STORE and COVERAGE_STORE.has_version(dataset_version.id):
+        coverage = COVERAGE_STORE.get_coverage(dataset_version.id, chrom, start_pos, end_pos)
+    else:
+        coverage = list(db.Coverage.select()
+                        .where((db.Coverage.pos >= start_pos) &
+                               (db.Coverage.pos <= end_pos) &
+                               (db.Coverage.chrom == chrom) &
+                               (db.Coverage.dataset_version == dataset_version.id))
+                        .dicts())
     if not coverage:
         raise error.NotFoundError('No coverage found for the region')
     return coverage
 
 
+def get_coverage_summary(dataset: str, chrom: str, start_pos: int, end_pos: int,  # pylint: disable=too-many-arguments
+                         resolution: int, *, ds_version: str = None) -> list:
+    """
+    Get the binned coverage summaries overlapping start_pos->end_pos, inclusive.
+
+    Args:
+        dataset (str): short name for the dataset
+        chrom (str): chromosome
+        start_pos (int): first position of interest
+        end_pos (int): last position of interest
+        resolution (int): bin size, one of db.COVERAGE_RESOLUTIONS
+        ds_version (str): version of the dataset
+
+    Returns:
+        list: coverage summary dicts for the bins covering the region
+
+    """
+    dataset_version = db.get_dataset_version(dataset, ds_version)
+    if not dataset_version:
+        raise error.NotFoundError('Unable to find the dataset version in the database')
+
+    first_bin = start_pos - start_pos % resolution
+    summaries = list(db.CoverageSummary.select(db.CoverageSummary.chrom,
+                                               db.CoverageSummary.pos,
+                                               db.CoverageSummary.mean_min,
+                                               db.CoverageSummary.mean_avg,
+                                               db.CoverageSummary.mean_max,
+                                               db.CoverageSummary.cov20_min,
+                                               db.CoverageSummary.cov20_avg,
+                                               db.CoverageSummary.cov20_max)
+                     .where((db.CoverageSummary.dataset_version == dataset_version.id) &
+                            (db.CoverageSummary.resolution == resolution) &
+                            (db.CoverageSummary.chrom == chrom) &
+                            (db.CoverageSummary.pos >= first_bin) &
+                            (db.CoverageSummary.pos <= end_pos))
+                     .order_by(db.CoverageSummary.pos)
+                     .dicts())
+    if not summaries:
+        raise error.NotFoundError('No coverage found for the region')
+    return summaries
+
+
 def get_coverage_for_transcript(dataset: str, chrom: str, start_pos: int,
                                 end_pos: int = None, ds_version: str = None) -> list:
     """
@@ -195,6 +413,7 @@ def get_coverage_for_transcript(dataset: str, chrom: str, start_pos: int,
     return covered
 
 
+@db.request_cached(queries=2)
 def get_exons_in_transcript(dataset: str, transcript_id: str, ds_version: str = None) -> list:
     """
     Retrieve exons associated with the given transcript id.
@@ -237,6 +456,7 @@ def get_exons_in_transcript(dataset: str, transcript_id: str, ds_version: str =
     return features
 
 
+@db.request_cached(queries=1)
 def get_gene(dataset: str, gene_id: str, ds_version: str = None) -> dict:
     """
     Retrieve gene by gene id.
@@ -262,6 +482,7 @@ def get_gene(dataset: str, gene_id: str, ds_version: str = None) -> dict:
         raise error.NotFoundError(f'Gene {gene_id} not found in reference data.') from err
 
 
+@db.request_cached(queries=1)
 def get_gene_by_dbid(gene_dbid: str) -> dict:
     """
     Retrieve gene by gene database id.
@@ -283,7 +504,11 @@ def get_gene_by_dbid(gene_dbid: str) -> dict:
 
 def get_gene_by_name(dataset: str, gene_name: str, ds_version: str = None) -> dict:
     """
-    Retrieve gene by gene_name.
+    Retrieve gene by gene_name, or by one of its other names, ignoring case.
+
+    Both names are searched in one query. A gene whose name matches exactly
+    is preferred, then one whose name matches ignoring case, and last one
+    with a matching other name.
 
     Args:
         dataset (str): short name of the dataset
@@ -299,27 +524,28 @@ def get_gene_by_name(dataset: str, gene_name: str, ds_version: str = None) -> di
     except AttributeError as err:
         raise error.NotFoundError(f'Reference set not found for dataset {dataset}.') from err
 
-    try:
-        return (db.Gene.select()
-                .where((db.Gene.reference_set == ref_set) &
-                       (db.Gene.name == gene_name))
-                .dicts()
-                .get())
-    except db.Gene.DoesNotExist:
-        try:
-            return (db.GeneOtherNames.select(db.Gene)
-                    .join(db.Gene)
-                    .where((db.GeneOtherNames.name == gene_name) &
-                           (db.Gene.reference_set == ref_set))
-                    .dicts()
-                    .get())
-        except db.GeneOtherNames.DoesNotExist as err:
-            logging.info(f'get_gene_by_name({dataset}, {gene_name}): unable to retrieve gene')
-            raise error.NotFoundError(f'Gene {gene_name} not found in reference data') from err
+    upper_name = gene_name.upper()
+    by_name = (db.Gene.select(db.Gene, Case(None, [(db.Gene.name == gene_name, 0)], 1)
+                              .alias('rank'))
+               .where((db.Gene.reference_set == ref_set) &
+                      (fn.UPPER(db.Gene.name) == upper_name)))
+    by_other_name = (db.Gene.select(db.Gene, Value(2).alias('rank'))
+                     .join(db.GeneOtherNames)
+                     .where((db.Gene.reference_set == ref_set) &
+                            (fn.UPPER(db.GeneOtherNames.name) == upper_name)))
+    gene = next(iter((by_name + by_other_name)
+                     .order_by(SQL('rank'), SQL('id'))
+                     .limit(1)
+                     .dicts()), None)
+    if gene is None:
+        logging.info(f'get_gene_by_name({dataset}, {gene_name}): unable to retrieve gene')
+        raise error.NotFoundError(f'Gene {gene_name} not found in reference data')
+    del gene['rank']
+    return gene
 
 
 def get_genes_in_region(dataset: str, chrom: str, start_pos: int,
-                        stop_pos: int, ds_version: str = None) -> dict:
+                        stop_pos: int, ds_version: str = None) -> list:
     """
     Retrieve genes located within a region.
 
@@ -331,7 +557,7 @@ def get_genes_in_region(dataset: str, chrom: str, start_pos: int,
         ds_version (str): dataset version
 
     Returns:
-        dict: values for the gene; empty if not found
+        list: values for the genes (dict); empty if not found
 
     """
     try:
@@ -339,13 +565,50 @@ def get_genes_in_region(dataset: str, chrom: str, start_pos: int,
     except AttributeError as err:
         raise error.NotFoundError(f'Reference set not found for dataset {dataset}.') from err
 
-    genes = db.Gene.select().where((db.Gene.reference_set == ref_set) &
-                                   (db.Gene.start <= stop_pos) &
-                                   (db.Gene.stop >= start_pos) &
-                                   (db.Gene.chrom == chrom)).dicts()
+    genes = list(db.Gene.select()
+                 .where((db.Gene.reference_set == ref_set) &
+                        (db.Gene.chrom == chrom) &
+                        (db.region_bin(db.Gene.start, db.Gene.stop)
+                         .in_(db.region_bins(start_pos, stop_pos))) &
+                        (db.Gene.start <= stop_pos) &
+                        (db.Gene.stop >= start_pos))
+                 .dicts())
     return genes
 
 
+def get_gene_regions(dataset: str, gene_ids: list, ds_version: str = None) -> list:
+    """
+    Retrieve the regions of a list of genes in one query.
+
+    Args:
+        dataset (str): short name of the dataset
+        gene_ids (list): ids of the genes (ENSG)
+        ds_version (str): dataset version
+
+    Returns:
+        list: regions as (chrom, start, stop) tuples, in the order of gene_ids
+
+    """
+    try:
+        ref_set = db.get_dataset_version(dataset, ds_version).reference_set
+    except AttributeError as err:
+        raise error.NotFoundError(f'Reference set not found for dataset {dataset}.') from err
+    if not gene_ids:
+        return []
+
+    genes = {gene.gene_id: (gene.chrom, gene.start, gene.stop)
+             for gene in (db.Gene.select(db.Gene.gene_id, db.Gene.chrom,
+                                         db.Gene.start, db.Gene.stop)
+                          .where((db.Gene.reference_set == ref_set) &
+                                 (db.Gene.gene_id.in_(list(set(gene_ids))))))}
+    missing = [gene_id for gene_id in gene_ids if gene_id not in genes]
+    if missing:
+        logging.info(f'get_gene_regions({dataset}, ...): unable to retrieve {missing}')
+        raise error.NotFoundError(f'Gene {missing[0]} not found in reference data')
+    return [genes[gene_id] for gene_id in gene_ids]
+
+
+@db.request_cached(queries=1)
 def get_raw_variant(dataset: str, pos: int, chrom: str, ref: str,  # pylint: disable=too-many-arguments
                     alt: str, ds_version: str = None) -> dict:
     """
@@ -368,8 +631,7 @@ def get_raw_variant(dataset: str, pos: int, chrom: str, ref: str,  # pylint: dis
         raise error.NotFoundError(f'Unable to find the dataset version in the database')
 
     try:
-        variant = (db.Variant
-                   .select()
+        variant = (select_variants_with_genes()
                    .where((db.Variant.pos == pos) &
                           (db.Variant.ref == ref) &
                           (db.Variant.alt == alt) &
@@ -377,16 +639,6 @@ def get_raw_variant(dataset: str, pos: int, chrom: str, ref: str,  # pylint: dis
                           (db.Variant.dataset_version == dataset_version))
                    .dicts()
                    .get())
-        variant['genes'] = [gene['gene_id'] for gene in
-                            db.VariantGenes.select(db.Gene.gene_id)
-                            .join(db.Gene)
-                            .where(db.VariantGenes.variant == variant['id'])
-                            .dicts()]
-        variant['transcripts'] = [transcript['transcript_id'] for transcript in
-                                  db.VariantTranscripts.select(db.Transcript.transcript_id)
-                                  .join(db.Transcript)
-                                  .where(db.VariantTranscripts.variant == variant['id'])
-                                  .dicts()]
         return variant
     except db.Variant.DoesNotExist as err:
         logging.info('get_raw_variant({}, {}, {}, {}, {}, {}): unable to retrieve variant'
@@ -394,6 +646,31 @@ def get_raw_variant(dataset: str, pos: int, chrom: str, ref: str,  # pylint: dis
         raise error.NotFoundError(f'Variant {chrom}-{pos}-{ref}-{alt} not found') from err
 
 
+def select_variants_with_genes():
+    """
+    Select variants together with the ids of their genes and transcripts.
+
+    The ids are aggregated into arrays (`genes` and `transcripts`) in the same
+    query as the variants, so no additional queries are needed per variant.
+
+    Returns:
+        ModelSelect: query for variants, to be filtered by the caller
+
+    """
+    genes = (db.VariantGenes
+             .select(db.Gene.gene_id)
+             .join(db.Gene)
+             .where(db.VariantGenes.variant == db.Variant.id))
+    transcripts = (db.VariantTranscripts
+                   .select(db.Transcript.transcript_id)
+                   .join(db.Transcript)
+                   .where(db.VariantTranscripts.variant == db.Variant.id))
+    return db.Variant.select(db.Variant,
+                             fn.ARRAY(genes).alias('genes'),
+                             fn.ARRAY(transcripts).alias('transcripts'))
+
+
+@db.request_cached(queries=3)
 def get_transcript(dataset: str, transcript_id: str, ds_version: str = None) -> dict:
     """
     Retrieve transcript by transcript id.
@@ -421,7 +698,7 @@ def get_transcript(dataset: str, transcript_id: str, ds_version: str = None) ->
                              (db.Gene.reference_set == ref_set))
                       .dicts()
                       .get())
-        transcript['exons'] = get_exons_in_transcript(dataset, transcript_id)
+        transcript['exons'] = get_exons_in_transcript(dataset, transcript_id, ds_version)
         return transcript
     except db.Transcript.DoesNotExist as err:
         logging.info(f'get_transcript({dataset}, {transcript_id}): unable to retrieve transcript')
@@ -496,12 +773,81 @@ def get_variant(dataset: str, pos: int, chrom: str, ref: str,  # pylint: disable
 
     """
     variant = get_raw_variant(dataset, pos, chrom, ref, alt, ds_version)
-    variant = get_raw_variant(dataset, pos, chrom, ref, alt, ds_version)
     if variant and variant.get('rsid') and not str(variant['rsid']).startswith('rs'):
         variant['rsid'] = 'rs{}'.format(variant['rsid'])
     return variant
 
 
+def get_other_dataset_versions(dataset: str, dataset_version) -> list:
+    """
+    Get the current versions of the other datasets using the same reference set.
+
+    Args:
+        dataset (str): short name of the dataset
+        dataset_version (DatasetVersion): the dataset version
+
+    Returns:
+        list: ids of the current versions of the other datasets, sorted
+
+    """
+    return [version.id for version in (db.DatasetVersionCurrent
+                                       .select(db.DatasetVersionCurrent.id)
+                                       .join(db.Dataset)
+                                       .where((db.DatasetVersionCurrent.reference_set ==
+                                               dataset_version.reference_set) &
+                                              (db.Dataset.short_name != dataset))
+                                       .order_by(db.DatasetVersionCurrent.id))]
+
+
+def get_variant_frequencies(dataset: str, pos: int, chrom: str, ref: str,  # pylint: disable=too-many-arguments
+                            alt: str, *, ds_version: str = None) -> list:
+    """
+    Retrieve the frequencies of a variant in all datasets using the same reference set.
+
+    The given dataset version and the current versions of the other datasets
+    are searched using a single query.
+
+    Args:
+        dataset (str): short name of the dataset
+        pos (int): position of the variant
+        chrom (str): name of the chromosome
+        ref (str): reference sequence
+        alt (str): variant sequence
+        ds_version (str): version of the dataset
+
+    Returns:
+        list: one dict (dataset, allele_num, allele_count, allele_freq, hom_count) per
+              dataset containing the variant, starting with the given dataset
+
+    """
+    dataset_version = db.get_dataset_version(dataset, ds_version)
+    if not dataset_version:
+        raise error.NotFoundError('Unable to find the dataset version in the database')
+
+    other_versions = get_other_dataset_versions(dataset, dataset_version)
+    hits = (db.Variant
+            .select(db.Dataset.short_name.alias('dataset'),
+                    db.Variant.allele_num,
+                    db.Variant.allele_count,
+                    db.Variant.allele_freq,
+                    db.Variant.hom_count)
+            .join(db.DatasetVersion)
+            .join(db.Dataset)
+            .where((db.Variant.pos == pos) &
+                   (db.Variant.ref == ref) &
+                   (db.Variant.alt == alt) &
+                   (db.Variant.chrom == chrom) &
+                   ((db.Variant.dataset_version == dataset_version.id) |
+                    (db.Variant.dataset_version.in_(other_versions))))
+            .order_by(db.Dataset.id, db.Variant.id)
+            .dicts())
+
+    frequencies = {}
+    for hit in hits:
+        frequencies.setdefault(hit['dataset'], hit)
+    return sorted(frequencies.values(), key=lambda hit: hit['dataset'] != dataset)
+
+
 def get_variants_by_rsid(dataset: str, rsid: str, ds_version: str = None) -> list:
     """
     Retrieve variants by their associated rsid.
@@ -540,17 +886,94 @@ def get_variants_by_rsid(dataset: str, rsid: str, ds_version: str = None) -> lis
     return variants
 
 
-def get_variants_in_gene(dataset: str, gene_id: str, ds_version: str = None) -> list:
+def parse_variant_id(query: str) -> tuple:
+    """
+    Parse a variant id (chrom-pos-ref-alt), accepting the same forms as the search.
+
+    Args:
+        query (str): the variant id, e.g. `22-46615715-C-T` or `chr22:46615715-C-T`
+
+    Returns:
+        tuple: (chrom, pos, ref, alt)
+
+    """
+    query = query.strip().upper()
+    match = _match_region(query)
+    if (not match or match.end() != len(query) - (3 if query.startswith('CHR') else 0) or
+            not _is_variant_match(match) or not match.group(3)):
+        raise error.ParsingError(f'Unable to parse variant {query}')
+    return (match.group(1), int(match.group(3)), match.group(4), match.group(5))
+
+
+def get_variants_by_ids(dataset: str, variant_ids: list, rsids: list,
+                        ds_version: str = None) -> list:
+    """
+    Retrieve the variants matching any of a set of variant ids or rsids.
+
+    The ids are passed as arrays and joined to the variants in the database
+    (`unnest` for the variant ids, `IN` for the rsids), so the number of
+    queries does not depend on the number of ids. vep_annotations is only
+    selected for variants without a stored major_consequence.
+
+    Args:
+        dataset (str): short name of the dataset
+        variant_ids (list): variants as (chrom, pos, ref, alt) tuples
+        rsids (list): rsids as integers (without the rs prefix)
+        ds_version (str): version of the dataset
+
+    Returns:
+        list: variants (dict); a variant matched by both kinds of id is included once
+
+    """
+    dataset_version = db.get_dataset_version(dataset, ds_version)
+    if not dataset_version:
+        raise error.NotFoundError('Unable to find the dataset version in the database')
+
+    fields = [db.Variant.id, db.Variant.variant_id, db.Variant.chrom, db.Variant.pos,
+              db.Variant.ref, db.Variant.alt, db.Variant.rsid, db.Variant.allele_count,
+              db.Variant.allele_num, db.Variant.allele_freq, db.Variant.hom_count,
+              db.Variant.filter_string, db.Variant.major_consequence,
+              Case(None, [(db.Variant.major_consequence.is_null(), db.Variant.vep_annotations)],
+                   None).alias('vep_annotations')]
+    queries = []
+    if variant_ids:
+        columns = [list(column) for column in zip(*variant_ids)]
+        wanted = SQL('(SELECT * FROM unnest(%s::varchar[], %s::integer[], '
+                     '%s::varchar[], %s::varchar[]))', columns)
+        queries.append(db.Variant
+                       .select(*fields)
+                       .where((db.Variant.dataset_version == dataset_version) &
+                              (Tuple(db.Variant.chrom, db.Variant.pos,
+                                     db.Variant.ref, db.Variant.alt).in_(wanted))))
+    if rsids:
+        queries.append(db.Variant
+                       .select(*fields)
+                       .where((db.Variant.dataset_version == dataset_version) &
+                              (db.Variant.rsid.in_(list(set(rsids))))))
+    if not queries:
+        return []
+
+    query = queries[0] if len(queries) == 1 else queries[0].union_all(queries[1])
+    variants = {}
+    for variant in query.dicts():
+        variants.setdefault(variant['id'], variant)
+    return sorted(variants.values(), key=lambda variant: variant['id'])
+
+
+def get_variants_in_gene(dataset: str, gene_id: str, ds_version: str = None):
     """
     Retrieve variants present inside a gene.
 
+    The variants are read lazily through a server-side cursor. vep_annotations only
+    holds the annotations needed for the variant list (see _list_annotations).
+
     Args:
         dataset (str): short name of the dataset
         gene_id (str): id of the gene
         ds_version (str): version of the dataset
 
     Returns:
-        list: values for the variants
+        iterator: values for the variants
 
     """
     dataset_version = db.get_dataset_version(dataset, ds_version)
@@ -560,27 +983,23 @@ def get_variants_in_gene(dataset: str, gene_id: str, ds_version: str = None) ->
     if not gene:
         raise error.NotFoundError(f'Gene {gene_id} not found in reference data')
 
-    variants = list(db.Variant.select()
-                    .join(db.VariantGenes)
-                    .where((db.VariantGenes.gene == gene['id']) &
-                           (db.Variant.dataset_version == dataset_version))
-                    .dicts())
-    for variant in variants:
-        if not variant['hom_count']:
-            variant['hom_count'] = 0
-        variant['filter'] = variant['filter_string']
-
-    for variant in variants:
-        if variant['rsid']:
-            variant['rsid'] = 'rs{}'.format(variant['rsid'])
-    return variants
+    annotations = _list_annotations(db.VariantGenes, (('Gene', gene_id),))
+    query = (db.Variant.select(*_variant_list_fields(db.VariantGenes, annotations))
+             .join(db.VariantGenes)
+             .where((db.VariantGenes.gene == gene['id']) &
+                    (db.Variant.dataset_version == dataset_version))
+             .dicts())
+    return _iter_variants(query)
 
 
 def get_variants_in_region(dataset: str, chrom: str, start_pos: int,
-                           end_pos: int, ds_version: str = None) -> list:
+                           end_pos: int, ds_version: str = None):
     """
     Variants that overlap a region.
 
+    The variants are read lazily through a server-side cursor. vep_annotations only
+    holds the annotations needed for the variant list (see _list_annotations).
+
     Args:
         dataset (str): short name of the dataset
         chrom (str): name of the chromosom
@@ -589,44 +1008,77 @@ def get_variants_in_region(dataset: str, chrom: str, start_pos: int,
         ds_version (str): version of the dataset
 
     Returns:
-        list: variant dicts, None if no hits
+        iterator: variant dicts
 
     """
     dataset_version = db.get_dataset_version(dataset, ds_version)
     if not dataset_version:
         raise error.NotFoundError(f'Unable to find the dataset version in the database')
     query = (db.Variant
-             .select()
+             .select(*_variant_list_fields(db.Variant, _list_annotations(db.Variant)))
              .where((db.Variant.pos >= start_pos) &
                     (db.Variant.pos <= end_pos) &
                     (db.Variant.chrom == chrom) &
                     (db.Variant.dataset_version == dataset_version))
              .dicts())
+    return _iter_variants(query)
 
-    variants = list(query)
 
-    for variant in variants:
-        if not variant['hom_count']:
-            variant['hom_count'] = 0
-        variant['filter'] = variant['filter_string']
+def get_variants_in_regions(dataset: str, regions: list, ds_version: str = None):
+    """
+    Variants that overlap any of a list of regions, read in one pass.
 
-    for variant in variants:
-        if variant['rsid']:
-            variant['rsid'] = 'rs{}'.format(variant['rsid'])
-    return variants
+    The regions are passed as arrays and joined to the variants, so a single
+    query scans all of them. The variants are returned in the order of the
+    regions, and by position within a region; overlapping regions return the
+    same variant more than once, so they should be merged by the caller.
+
+    The variants are read lazily through a server-side cursor. vep_annotations only
+    holds the annotations needed for the variant list (see _list_annotations).
 
+    Args:
+        dataset (str): short name of the dataset
+        regions (list): regions as (chrom, start, stop) tuples, both positions included
+        ds_version (str): version of the dataset
+
+    Returns:
+        iterator: variant dicts
 
-def get_variants_in_transcript(dataset: str, transcript_id: str, ds_version: str = None) -> list:
+    """
+    dataset_version = db.get_dataset_version(dataset, ds_version)
+    if not dataset_version:
+        raise error.NotFoundError('Unable to find the dataset version in the database')
+    if not regions:
+        return iter(())
+    columns = [list(column) for column in zip(*regions)]
+    wanted = SQL('unnest(%s::varchar[], %s::integer[], %s::integer[]) '
+                 'WITH ORDINALITY AS regions (chrom, start, stop, index)', columns)
+    query = (db.Variant
+             .select(*_variant_list_fields(db.Variant, _list_annotations(db.Variant)))
+             .from_(db.Variant, wanted)
+             .where((db.Variant.chrom == SQL('regions.chrom')) &
+                    (db.Variant.pos >= SQL('regions.start')) &
+                    (db.Variant.pos <= SQL('regions.stop')) &
+                    (db.Variant.dataset_version == dataset_version))
+             .order_by(SQL('regions.index'), db.Variant.pos, db.Variant.id)
+             .dicts())
+    return _iter_variants(query)
+
+
+def get_variants_in_transcript(dataset: str, transcript_id: str, ds_version: str = None):
     """
     Retrieve variants inside a transcript.
 
+    The variants are read lazily through a server-side cursor. vep_annotations only
+    holds the annotations needed for the variant list (see _list_annotations).
+
     Args:
         dataset (str): short name of the dataset
         transcript_id (str): id of the transcript (ENST)
         ds_version (str): version of the dataset
 
     Returns:
-        list: values for the variant; None if not found
+        iterator: values for the variants
 
     """
     dataset_version = db.get_dataset_version(dataset, ds_version)
@@ -637,20 +1089,107 @@ def get_variants_in_transcript(dataset: str, transcript_id: str, ds_version: str
     if not transcript:
         raise error.NotFoundError(f'Transcript {transcript_id} not found in reference data')
 
-    variants = list(db.Variant.select()
-                    .join(db.VariantTranscripts)
-                    .where((db.VariantTranscripts.transcript == transcript['id']) &
-                           (db.Variant.dataset_version == dataset_version))
-                    .dicts())
+    annotations = _list_annotations(db.VariantTranscripts, (('Feature', transcript_id),
+                                                            ('Gene', transcript['gene_id'])))
+    query = (db.Variant.select(*_variant_list_fields(db.VariantTranscripts, annotations))
+             .join(db.VariantTranscripts)
+             .where((db.VariantTranscripts.transcript == transcript['id']) &
+                    (db.Variant.dataset_version == dataset_version))
+             .dicts())
+    return _iter_variants(query)
+
+
+def _variant_list_fields(link, annotations) -> list:
+    """
+    Get the variant fields for a variant list.
+
+    The consequence fields are taken from the gene or transcript link, as
+    they are computed from the annotations of that gene or transcript.
+
+    Args:
+        link: db.VariantGenes, db.VariantTranscripts or db.Variant (region lists)
+        annotations: expression selecting the VEP annotations, see _list_annotations
 
-    for variant in variants:
+    Returns:
+        list: fields to select
+
+    """
+    consequence_fields = db.ConsequenceModel._meta.sorted_fields  # pylint: disable=protected-access
+    variant_fields = db.Variant._meta.sorted_fields  # pylint: disable=protected-access
+    consequence = [field.name for field in consequence_fields if field.name != 'id']
+    return ([field for field in variant_fields
+             if field.name not in consequence and field.name != 'vep_annotations'] +
+            [getattr(link, name) for name in consequence] +
+            [annotations])
+
+
+def _list_annotations(link, filters: tuple = ()):
+    """
+    Get an expression selecting the VEP annotations needed for a variant list.
+
+    The annotations are filtered and projected to LIST_ANNOTATION_FIELDS in
+    the database. Nothing is selected for rows with stored consequence fields,
+    as the annotations are then not used at all.
+
+    Args:
+        link: db.VariantGenes, db.VariantTranscripts or db.Variant, holding the consequence fields
+        filters (tuple): (key, value) pairs, tried in order; the annotations matching
+                         the first filter that matches any are selected, otherwise
+                         all annotations
+
+    Returns:
+        the expression, selected as vep_annotations
+
+    """
+    annotations = ([_annotation_subset(filter_key, filter_value)
+                    for filter_key, filter_value in filters] +
+                   [_annotation_subset()])
+    return (Case(None,
+                 [(link.major_consequence.is_null(), fn.COALESCE(*annotations, SQL("'[]'")))])
+            .alias('vep_annotations'))
+
+
+def _annotation_subset(filter_key: str = None, filter_value: str = None):
+    """
+    Get a subquery aggregating the LIST_ANNOTATION_FIELDS of (matching) VEP annotations.
+
+    Args:
+        filter_key (str): only include annotations where this key...
+        filter_value (str): ...has this value
+
+    Returns:
+        NodeList: the subquery, NULL if no annotation matches
+
+    """
+    projection = ', '.join(f"'{key}', anno->'{key}'" for key in LIST_ANNOTATION_FIELDS)
+    condition = SQL(' WHERE anno->>%s = %s', [filter_key, filter_value]) if filter_key else SQL('')
+    return NodeList((SQL(f'(SELECT jsonb_agg(jsonb_strip_nulls(jsonb_build_object({projection})))'
+                         ' FROM jsonb_array_elements('),
+                     db.Variant.vep_annotations,
+                     SQL(') AS anno'),
+                     condition,
+                     SQL(')')),
+                    glue='')
+
+
+def _iter_variants(query):
+    """
+    Read variants through a server-side cursor, settings.db_cursor_size rows at a time.
+
+    The cursor is kept open in a transaction until the iterator is exhausted
+    or closed, so it has to be consumed in the thread that created it.
+
+    Args:
+        query: variant query returning dicts
+
+    Yields:
+        dict: variant
+
+    """
+    for variant in ServerSide(query, array_size=settings.db_cursor_size):
         if not variant['hom_count']:
             variant['hom_count'] = 0
         variant['filter'] = variant['filter_string']
-
-    for variant in variants:
-        variant['vep_annotations'] = [anno for anno in variant['vep_annotations']
-                                      if anno['Feature'] == transcript_id]
         if variant['rsid']:
             variant['rsid'] = 'rs{}'.format(variant['rsid'])
-    return variants
+        yield variant
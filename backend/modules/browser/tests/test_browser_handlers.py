@@ -18,8 +18,11 @@ def test_get_autocomplete():
     query = 'PA'
     response = requests.get('{}/api/dataset/{}/browser/autocomplete/{}'.format(BASE_URL, dataset, query))
     data = json.loads(response.text)
-    assert set(data["values"]) == set(["PABPC1P9", "PACSIN2", "PANX2", "PARP4P3",
-                                       "PARVB", "PARVG", "PATZ1", "PAXBP1", "PAXBP1-AS1"])
+    assert data["values"] == ["PABPC1P9", "PACSIN2", "PANX2", "PARP4P3", "PARVB",
+                              "PARVG", "PATZ", "PATZ1", "PAXBP1", "PAXBP1-AS1"]
+
+    response = requests.get('{}/api/dataset/{}/browser/autocomplete/{}'.format(BASE_URL, 'Bad_dataset', query))
+    assert response.status_code == 404
 
 
 def test_download():
@@ -50,6 +53,11 @@ def test_download():
     filename = f'{dataset}_{data_type}_{data_item}.csv'
     assert response.headers['content-disposition'] == f'attachment; filename={filename}'
 
+    response = requests.get('{}/api/dataset/{}/browser/download/{}/{}'.format(BASE_URL, dataset, data_type, '22-1-1000000'))
+    assert response.status_code == 400
+    response = requests.get('{}/api/dataset/{}/browser/download/{}/{}'.format(BASE_URL, dataset, 'gene', 'ENSG1234321'))
+    assert response.status_code == 404
+
 
 def test_get_coverage():
     """
@@ -70,6 +78,19 @@ def test_get_coverage():
     response = requests.get('{}/api/dataset/{}/browser/coverage/{}/{}'.format(BASE_URL, dataset, data_type, data_item))
     assert response.status_code == 404
 
+    # binned coverage
+    data_item = '22-46546000-46549999'
+    response = requests.get('{}/api/dataset/{}/browser/coverage/{}/{}?resolution=auto'.format(BASE_URL, dataset, data_type, data_item))
+    data = json.loads(response.text)
+    assert data['resolution'] == 10
+    assert len(data['coverage']) == 333
+    response = requests.get('{}/api/dataset/{}/browser/coverage/{}/{}?resolution=1000'.format(BASE_URL, dataset, data_type, data_item))
+    data = json.loads(response.text)
+    assert len(data['coverage']) == 4
+    assert data['coverage'][0]['meanMax'] == 32.38
+    response = requests.get('{}/api/dataset/{}/browser/coverage/{}/{}?resolution=7'.format(BASE_URL, dataset, data_type, data_item))
+    assert response.status_code == 400
+
 
 def test_get_coverage_pos():
     """
@@ -128,6 +149,54 @@ def test_get_gene():
     assert response.status_code == 404
 
 
+def test_response_cache():
+    """
+    Test the response cache of the browser handlers
+    """
+    admin = requests.Session()
+    admin.get(f'{BASE_URL}/developer/login?user=admin12&email=admin12')
+
+    def cache_stats():
+        return json.loads(admin.get(f'{BASE_URL}/api/status/response_cache').text)
+
+    url = f'{BASE_URL}/api/dataset/SweGen/browser/transcript/ENST00000438441'
+    first = requests.get(url)
+    assert first.headers['Cache-Control'] == 'no-cache'
+    etag = first.headers['ETag']
+
+    stats = cache_stats()
+    second = requests.get(url)
+    assert second.text == first.text
+    assert second.headers['ETag'] == etag
+    assert cache_stats()['hits'] == stats['hits'] + 1
+
+    # revalidation
+    response = requests.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert not response.text
+
+    # explicit version
+    response = requests.get(f'{BASE_URL}/api/dataset/SweGen/version/20180409/browser/transcript/ENST00000438441')
+    assert response.headers['Cache-Control'] == 'public, max-age=86400'
+    assert response.headers['ETag'] == etag
+
+    # a variant includes the frequencies in the current versions of the other datasets
+    response = requests.get(f'{BASE_URL}/api/dataset/SweGen/version/20180409/browser/variant/22-29461622-G-A')
+    assert json.loads(response.text)['variant']['variantId'] == '22-29461622-G-A'
+    assert response.headers['Cache-Control'] == 'no-cache'
+
+    # the query arguments used by the handler are part of the key
+    url = f'{BASE_URL}/api/dataset/SweGen/browser/coverage/transcript/ENST00000438441'
+    assert requests.get(url).text != requests.get(url + '?resolution=100').text
+
+    # unreleased versions are not cached
+    stats = cache_stats()
+    response = requests.get(f'{BASE_URL}/api/dataset/SweGen2/version/UNRELEASED/browser/transcript/ENST00000438441')
+    assert 'Cache-Control' not in response.headers
+    new_stats = cache_stats()
+    assert (new_stats['hits'], new_stats['misses']) == (stats['hits'], stats['misses'])
+
+
 def test_get_region():
     """
     Test GetRegion.get()
@@ -164,6 +233,31 @@ def test_get_region():
     assert response.status_code == 400
 
 
+def test_get_region_set_variants():
+    """
+    Test GetRegionSetVariants.post()
+    """
+    dataset = 'SweGen'
+    url = '{}/api/dataset/{}/browser/region_set'.format(BASE_URL, dataset)
+    region_set = 'chr22\t16079199\t16080500\nENSG00000198062\n'
+    response = requests.post(url, data=region_set)
+    assert response.headers['Content-Type'] == 'application/x-ndjson'
+    variants = [json.loads(line) for line in response.text.splitlines()]
+    assert len(variants) == 358
+    assert variants[0]['variantId'] == '22-16079227-C-T'
+
+    response = requests.post(url + '?format=csv', data=region_set)
+    assert response.headers['Content-Type'] == 'text/csv'
+    assert len(response.text.splitlines()) == 359
+
+    response = requests.post(url, data='22\tx\t200\n')
+    assert response.status_code == 400
+    response = requests.post(url, data='ENSG00000000001\n')
+    assert response.status_code == 404
+    response = requests.post('{}/api/dataset/{}/browser/region_set'.format(BASE_URL, 'Bad_dataset'), data=region_set)
+    assert response.status_code == 404
+
+
 def test_get_transcript():
     """
     Test GetTranscript.get()
@@ -221,6 +315,37 @@ def test_get_variant():
     assert response.status_code == 400
 
 
+def test_get_variant_batch():
+    """
+    Test GetVariantBatch.post()
+    """
+    dataset = 'SweGen'
+    url = '{}/api/dataset/{}/browser/variant_batch'.format(BASE_URL, dataset)
+    response = requests.post(url, json={'variants': ['22-16080482-CAT-C', 'rs142856307', '22-1-A-G']})
+    data = json.loads(response.text)
+    assert [item['query'] for item in data['variants']] == ['22-16080482-CAT-C', 'rs142856307', '22-1-A-G']
+    assert [len(item['variants']) for item in data['variants']] == [1, 5, 0]
+    variant = data['variants'][0]['variants'][0]
+    assert variant['variantId'] == '22-16080482-CAT-C'
+    assert variant['alleleFreq'] and variant['filter'] and variant['majorConsequence']
+
+    version = '20161223'
+    response = requests.post('{}/api/dataset/{}/version/{}/browser/variant_batch'.format(BASE_URL, dataset, version),
+                             json={'variants': ['21-9411609-G-T']})
+    data = json.loads(response.text)
+    assert data['variants'][0]['variants'][0]['variantId'] == '21-9411609-G-T'
+
+    response = requests.post(url, json={'variants': ['22-94358sfsdfsdf52-T-C']})
+    assert response.status_code == 400
+    response = requests.post(url, json={'variants': 'rs142856307'})
+    assert response.status_code == 400
+    response = requests.post(url, data='not json')
+    assert response.status_code == 400
+    response = requests.post('{}/api/dataset/{}/browser/variant_batch'.format(BASE_URL, 'Bad_dataset'),
+                             json={'variants': ['rs142856307']})
+    assert response.status_code == 404
+
+
 def test_get_variants():
     """
     Test GetVariants.get()
@@ -4,6 +4,9 @@ Tests for the functions available in lookups.py
 
 import pytest
 
+import db
+from coverage_store import CoverageStore, CoverageWriter
+
 from .. import error
 from .. import lookups
 
@@ -13,13 +16,36 @@ def test_autocomplete():
     Test get_autocomplete()
     """
     res = lookups.autocomplete('SweGen', 'PA')
-    expected = set(["PABPC1P9", "PACSIN2", "PANX2", "PARP4P3",
-                    "PARVB", "PARVG", "PATZ1", "PAXBP1", "PAXBP1-AS1"])
-    assert set(res) == expected
+    expected = ["PABPC1P9", "PACSIN2", "PANX2", "PARP4P3", "PARVB",
+                "PARVG", "PATZ", "PATZ1", "PAXBP1", "PAXBP1-AS1"]
+    assert res == expected
+    assert lookups.autocomplete('SweGen', 'pa', limit=3) == expected[:3]
+    assert lookups.autocomplete('SweGen', 'hpan') == ['hPANX2']
+    assert not lookups.autocomplete('SweGen', 'PA%')
     with pytest.raises(error.NotFoundError):
         res = lookups.autocomplete('Bad_dataset', 'PA')
 
 
+def test_gene_name_index():
+    """
+    Test GeneNameIndex
+    """
+    index = lookups.GeneNameIndex(ttl=300)
+    ref_set = db.get_dataset_version('SweGen').reference_set.id
+    assert index.search(ref_set, 'PATZ', 20) == ['PATZ', 'PATZ1']
+    assert index.search(ref_set, 'PAXBP1', 1) == ['PAXBP1']
+    assert index.search(ref_set, 'ZZZZ', 20) == []
+    assert not index.search(-1, 'PA', 20)
+    index.invalidate(ref_set)
+    assert index.search(ref_set, 'PATZ1', 20) == ['PATZ1']
+
+    # expired ttl
+    index = lookups.GeneNameIndex(ttl=0)
+    keys = index.get_index(ref_set)[0]
+    assert index.get_index(ref_set)[0] is not keys
+    assert index.search(ref_set, 'PATZ1', 20) == ['PATZ1']
+
+
 def test_get_awesomebar_result():
     """
     Test get_awesomebar_result()
@@ -36,6 +62,11 @@ def test_get_awesomebar_result():
     assert result == ('transcript', 'ENST00000457709')
     result = lookups.get_awesomebar_result('SweGen', '22-46615715-46615880')
     assert result == ('region', '22-46615715-46615880')
+    # a gene name that also reads as a region
+    result = lookups.get_awesomebar_result('SweGen', 'MCT3')
+    assert result == ('gene', lookups.get_gene_by_name('SweGen', 'MCT3')['gene_id'])
+    result = lookups.get_awesomebar_result('SweGen', 'X')
+    assert result == ('region', 'X')
     result = lookups.get_awesomebar_result('SweGen', '22-1234321-A-A')
     assert result == ('not_found', '22-1234321-A-A')
     result = lookups.get_awesomebar_result('SweGen', 'CHR22:46615715-46615880')
@@ -44,6 +75,31 @@ def test_get_awesomebar_result():
     assert result == ('variant', '22-29461622-G-A')
     result = lookups.get_awesomebar_result('SweGen', 'DOES_NOT_EXIST')
     assert result == ('not_found', 'DOES_NOT_EXIST')
+    result = lookups.get_awesomebar_result('SweGen', ' nf1p3 ')
+    assert result == ('gene', 'ENSG00000183249')
+    result = lookups.get_awesomebar_result('SweGen', 'rs1')
+    assert result == ('not_found', 'RS1')
+    result = lookups.get_awesomebar_result('SweGen', 'ENSG00000000001')
+    assert result == ('not_found', 'ENSG00000000001')
+
+
+def test_classify_query():
+    """
+    Test classify_query()
+    """
+    assert lookups.classify_query('rs142856307') == 'rsid'
+    assert lookups.classify_query('RS142856307') == 'rsid'
+    assert lookups.classify_query('ENSG00000183249') == 'gene_id'
+    assert lookups.classify_query('enst00000457709') == 'transcript_id'
+    assert lookups.classify_query('22-46615715-46615880') == 'region'
+    assert lookups.classify_query('chr22:46615715-46615880') == 'region'
+    assert lookups.classify_query('X') == 'region'
+    assert lookups.classify_query('22-29461622-G-A') == 'variant'
+    assert lookups.classify_query('CHR22-29461622-G-A') == 'variant'
+    assert lookups.classify_query('NF1P3') == 'gene_name'
+    assert lookups.classify_query('ENSA') == 'gene_name'
+    assert lookups.classify_query('MT-ND1') == 'gene_name'
+    assert lookups.classify_query('rs12a') == 'gene_name'
 
 
 def test_get_coverage_for_bases():
@@ -77,6 +133,58 @@ def test_get_coverage_for_bases():
         lookups.get_coverage_for_bases('BAD_DATASET', '1', 55500283, 55500320)
 
 
+def test_get_coverage_for_bases_store(tmp_path, monkeypatch):
+    """
+    Test get_coverage_for_bases() using the memory-mapped coverage store
+    """
+    rows = (db.Coverage.select()
+            .where(db.Coverage.dataset_version == 4)
+            .order_by(db.Coverage.chrom, db.Coverage.pos)
+            .dicts())
+    with CoverageWriter(str(tmp_path), 4) as writer:
+        for row in rows:
+            writer.add(row)
+
+    expected = lookups.get_coverage_for_bases('SweGen', '22', 46546423, 46549652)
+    monkeypatch.setattr(lookups, 'COVERAGE_STORE', CoverageStore(str(tmp_path)))
+    coverage = lookups.get_coverage_for_bases('SweGen', '22', 46546423, 46549652)
+    assert len(coverage) == len(expected)
+    for row in expected:
+        row['id'] = None
+    assert coverage == expected
+
+    assert len(lookups.get_coverage_for_bases('SweGen', '22', 46546430)) == 1
+
+    # no hits
+    with pytest.raises(error.NotFoundError):
+        lookups.get_coverage_for_bases('SweGen', '1', 55500283, 55500285)
+
+    # version not in the store
+    monkeypatch.setattr(lookups, 'COVERAGE_STORE', CoverageStore(str(tmp_path / 'empty')))
+    coverage = lookups.get_coverage_for_bases('SweGen', '22', 46546423, 46549652)
+    assert coverage[0]['id'] is not None
+
+
+def test_get_coverage_summary():
+    """
+    Test get_coverage_summary()
+    """
+    coverage = lookups.get_coverage_summary('SweGen', '22', 46546423, 46549652, 1000)
+    assert [cov['pos'] for cov in coverage] == [46546000, 46547000, 46548000, 46549000]
+    assert coverage[0] == {'chrom': '22', 'pos': 46546000,
+                           'mean_min': 20.79, 'mean_avg': 27.01484, 'mean_max': 32.38,
+                           'cov20_min': 0.462, 'cov20_avg': 0.7718871, 'cov20_max': 0.951}
+    assert len(lookups.get_coverage_summary('SweGen', '22', 46546423, 46549652, 100)) == 33
+
+    # no hits
+    with pytest.raises(error.NotFoundError):
+        lookups.get_coverage_summary('SweGen', '1', 55500283, 55500285, 10)
+
+    # incorrect dataset
+    with pytest.raises(error.NotFoundError):
+        lookups.get_coverage_summary('BAD_DATASET', '22', 46546423, 46549652, 10)
+
+
 def test_get_coverage_for_transcript():
     """
     Test get_coverage_for_transcript()
@@ -203,6 +311,11 @@ def test_get_gene_by_name():
     # name in other_names
     result = lookups.get_gene_by_name('SweGen', 'BCL8C')
     assert result['gene_id'] == 'ENSG00000223875'
+    assert 'rank' not in result
+
+    # case-insensitive
+    assert lookups.get_gene_by_name('SweGen', 'actr3bp6')['gene_id'] == 'ENSG00000226444'
+    assert lookups.get_gene_by_name('SweGen', 'bcl8c')['gene_id'] == 'ENSG00000223875'
 
 
 def test_get_genes_in_region():
@@ -225,6 +338,36 @@ def test_get_genes_in_region():
     assert not lookups.get_genes_in_region('SweGen', '22', 25595800, 25595801)
 
 
+def test_get_gene_regions():
+    """
+    Test get_gene_regions()
+    """
+    assert lookups.get_gene_regions('SweGen', ['ENSG00000251940', 'ENSG00000223875']) == \
+        [('22', 19237396, 19237489), ('22', 16100517, 16124973)]
+    assert lookups.get_gene_regions('SweGen', []) == []
+    with pytest.raises(error.NotFoundError):
+        lookups.get_gene_regions('SweGen', ['ENSG00000251940', 'ENSG00000000001'])
+    with pytest.raises(error.NotFoundError):
+        lookups.get_gene_regions('BAD_DATASET', ['ENSG00000251940'])
+
+
+def test_select_variants_with_genes():
+    """
+    Test select_variants_with_genes()
+    """
+    variants = list(lookups.select_variants_with_genes()
+                    .where(lookups.db.Variant.variant_id.in_(['22-16080482-CAT-C',
+                                                              '21-9411609-G-T']))
+                    .dicts())
+    variant = [var for var in variants if var['variant_id'] == '22-16080482-CAT-C'][0]
+    assert set(variant['genes']) == set(['ENSG00000229286', 'ENSG00000235265'])
+    assert set(variant['transcripts']) == set(['ENST00000448070', 'ENST00000413156'])
+    # variants without genes get empty lists
+    variant = [var for var in variants if var['variant_id'] == '21-9411609-G-T'][0]
+    assert variant['genes'] == []
+    assert variant['transcripts'] == []
+
+
 def test_get_transcript():
     """
     Test get_transcript()
@@ -313,6 +456,37 @@ def test_get_variant():
     assert result['variant_id'] == '21-9411609-G-T'
 
 
+def test_get_other_dataset_versions():
+    """
+    Test get_other_dataset_versions()
+    """
+    result = lookups.get_other_dataset_versions('SweGen', db.get_dataset_version('SweGen'))
+    assert result == [db.get_dataset_version('SweGen2').id]
+
+
+def test_get_variant_frequencies():
+    """
+    Test get_variant_frequencies()
+    """
+    result = lookups.get_variant_frequencies('SweGen', 29461622, '22', 'G', 'A')
+    assert [hit['dataset'] for hit in result] == ['SweGen', 'SweGen2']
+    assert result[1] == {'dataset': 'SweGen2', 'allele_count': 1247, 'allele_num': 2000,
+                         'hom_count': 772, 'allele_freq': 0.6235}
+    result = lookups.get_variant_frequencies('SweGen2', 29461622, '22', 'G', 'A')
+    assert [hit['dataset'] for hit in result] == ['SweGen2', 'SweGen']
+
+    # only present in one dataset
+    result = lookups.get_variant_frequencies('SweGen', 16080482, '22', 'CAT', 'C')
+    assert [hit['dataset'] for hit in result] == ['SweGen']
+
+    # not found
+    assert not lookups.get_variant_frequencies('SweGen', 12, '22', 'A', 'C')
+
+    # bad dataset
+    with pytest.raises(error.NotFoundError):
+        lookups.get_variant_frequencies('bad_dataset', 29461622, '22', 'G', 'A')
+
+
 def test_get_variants_by_rsid():
     '''
     Test get_variants_by_rsid()
@@ -342,15 +516,57 @@ def test_get_variants_by_rsid():
         lookups.get_variants_by_rsid('SweGen', 'rs1')
 
 
-def test_get_variants_in_gene():
+def test_parse_variant_id():
+    """
+    Test parse_variant_id()
+    """
+    assert lookups.parse_variant_id('22-16080482-CAT-C') == ('22', 16080482, 'CAT', 'C')
+    assert lookups.parse_variant_id(' chr22:16080482-cat-c') == ('22', 16080482, 'CAT', 'C')
+    for query in ('22-16080482', '22-16080482-CAT', 'rs373706802', '22-160x80482-CAT-C',
+                  'PABPC1P9'):
+        with pytest.raises(error.ParsingError):
+            lookups.parse_variant_id(query)
+
+
+def test_get_variants_by_ids():
+    """
+    Test get_variants_by_ids()
+    """
+    result = lookups.get_variants_by_ids('SweGen',
+                                         [('22', 16080482, 'CAT', 'C'), ('22', 1, 'A', 'G')],
+                                         [142856307, 373706802, 1])
+    assert [variant['pos'] for variant in result].count(16285954) == 5
+    assert len(result) == 6
+    assert [variant['variant_id'] for variant in result].count('22-16080482-CAT-C') == 1
+    assert 'vep_annotations' in result[0]
+
+    # with version
+    result = lookups.get_variants_by_ids('SweGen', [('21', 9411609, 'G', 'T')], [], '20161223')
+    assert [variant['variant_id'] for variant in result] == ['21-9411609-G-T']
+    assert not lookups.get_variants_by_ids('SweGen', [('21', 9411609, 'G', 'T')], [])
+    assert not lookups.get_variants_by_ids('SweGen', [], [])
+
+    with pytest.raises(error.NotFoundError):
+        lookups.get_variants_by_ids('incorrect_name', [], [373706802])
+
+
+def test_get_variants_in_gene(monkeypatch):
     """
     Test get_variants_in_gene()
     """
-    res = lookups.get_variants_in_gene('SweGen', 'ENSG00000198062')
+    res = list(lookups.get_variants_in_gene('SweGen', 'ENSG00000198062'))
     assert len(res) == 512
 
+    # read lazily; the cursor is released when the iterator is closed
+    monkeypatch.setattr(lookups.settings, 'db_cursor_size', 10)
+    variants = lookups.get_variants_in_gene('SweGen', 'ENSG00000198062')
+    assert next(variants)['variant_id'] == res[0]['variant_id']
+    assert db.database.in_transaction()
+    variants.close()
+    assert not db.database.in_transaction()
+
     # existing gene without variants
-    assert not lookups.get_variants_in_gene('SweGen', 'ENSG00000128298')
+    assert not list(lookups.get_variants_in_gene('SweGen', 'ENSG00000128298'))
 
     # bad requests
     with pytest.raises(error.NotFoundError):
@@ -366,28 +582,81 @@ def test_get_variants_in_region():
     Test get_variants_in_region()
     """
     # normal
-    result = lookups.get_variants_in_region('SweGen', '22', 16079200, 16079400)
+    result = list(lookups.get_variants_in_region('SweGen', '22', 16079200, 16079400))
     expected_pos = [16079227, 16079289]
     assert [res['pos'] for res in result] == expected_pos
 
     # no positions covered
-    assert not lookups.get_variants_in_region('SweGen', '22', 16079200, 16079000)
+    assert not list(lookups.get_variants_in_region('SweGen', '22', 16079200, 16079000))
 
     # no variants found
-    assert not lookups.get_variants_in_region('SweGen', '22', 106079000, 106079200)
+    assert not list(lookups.get_variants_in_region('SweGen', '22', 106079000, 106079200))
 
     # incorrect dataset
     with pytest.raises(error.NotFoundError):
         lookups.get_variants_in_region('Incorrect_dataset', '22', 16079200, 16079400)
 
 
+def test_get_variants_in_regions():
+    """
+    Test get_variants_in_regions()
+    """
+    # same variants as for the single regions, in the order of the regions
+    regions = [('22', 16285800, 16286000), ('22', 16079200, 16080500)]
+    res = list(lookups.get_variants_in_regions('SweGen', regions))
+    expected = []
+    for chrom, start, stop in regions:
+        expected += sorted(lookups.get_variants_in_region('SweGen', chrom, start, stop),
+                           key=lambda variant: (variant['pos'], variant['id']))
+    assert [variant['id'] for variant in res] == [variant['id'] for variant in expected]
+    assert len(res) == 28
+
+    assert not list(lookups.get_variants_in_regions('SweGen', []))
+    with pytest.raises(error.NotFoundError):
+        lookups.get_variants_in_regions('BAD_DATASET', regions)
+
+
 def test_get_variants_in_transcript():
     """
     Test get_variants_in_transcript()
     """
-    res = lookups.get_variants_in_transcript('SweGen', 'ENST00000452800')
+    res = list(lookups.get_variants_in_transcript('SweGen', 'ENST00000452800'))
     assert len(res) == 508
 
+    # only the annotation fields used for the list, for the transcript
+    variant = lookups.get_variant('SweGen', res[0]['pos'], res[0]['chrom'],
+                                  res[0]['ref'], res[0]['alt'])
+    expected = [{key: value for key, value in annotation.items()
+                 if key in lookups.LIST_ANNOTATION_FIELDS}
+                for annotation in variant['vep_annotations']
+                if annotation['Feature'] == 'ENST00000452800']
+    assert res[0]['vep_annotations'] == expected
+
+    # the annotations of the gene if none is for the transcript, otherwise all annotations
+    def list_fields(annotations):
+        return [{key: value for key, value in annotation.items()
+                 if key in lookups.LIST_ANNOTATION_FIELDS}
+                for annotation in annotations]
+
+    gene_id = lookups.get_transcript('SweGen', 'ENST00000452800')['gene_id']
+    annotations = [dict(annotation, Feature='ENST00000000000')
+                   for annotation in variant['vep_annotations']]
+    annotations[0]['Gene'] = 'ENSG00000000000'
+    gene_annotations = [annotation for annotation in annotations if annotation['Gene'] == gene_id]
+    assert gene_annotations
+    cases = ((annotations, gene_annotations),
+             (annotations[:1], annotations[:1]))
+    with db.database.atomic() as transaction:
+        for variant_annotations, expected in cases:
+            (db.Variant.update(vep_annotations=variant_annotations)
+             .where(db.Variant.id == variant['id'])
+             .execute())
+            result = [row for row in lookups.get_variants_in_transcript('SweGen',
+                                                                        'ENST00000452800')
+                      if row['id'] == variant['id']]
+            assert result[0]['vep_annotations'] == list_fields(expected)
+        transaction.rollback()
+
     # bad requests
     with pytest.raises(error.NotFoundError):
         assert not lookups.get_variants_in_transcript('BAD_DATASET', 'ENST00000452800')
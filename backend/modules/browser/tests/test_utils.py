@@ -2,71 +2,37 @@
 Tests for utils.py
 """
 
+import json
+
 import pytest
 
+import consequences
+import db
+
 from .. import error
-from .. import lookups
 from .. import utils
 
 
-def test_add_consequence_to_variants():
-    """
-    Test add_consequence_to_variants()
-    """
-    variants = []
-    variants.append(lookups.get_variant('SweGen', 16252949, '22', 'T', 'G'))
-    variants.append(lookups.get_variant('SweGen', 16269934, '22', 'A', 'G'))
-
-    utils.add_consequence_to_variants(variants)
-    assert variants[0]['major_consequence'] == 'downstream_gene_variant'
-    assert variants[1]['major_consequence'] == 'missense_variant'
-
-
-def test_add_consequence_to_variant():
+def test_add_stored_consequence():
     """
-    Test add_consequence_to_variant()
+    Test add_stored_consequence()
     """
-    variant = lookups.get_variant('SweGen', 16252949, '22', 'T', 'G')
-    utils.add_consequence_to_variant(variant)
-    assert variant['major_consequence'] == 'downstream_gene_variant'
-
-    variant['vep_annotations'][0]['Consequence'] = "stop_gained"
-    utils.add_consequence_to_variant(variant)
-    assert variant['category'] == 'lof_variant'
-    assert variant['major_consequence'] == 'stop_gained'
+    variant = {'variant_id': '22-1-A-G', 'major_consequence': 'missense_variant',
+               'category': 'missense_variant', 'flags': [], 'hgvs': None,
+               'hgvsp': 'p.Thr100Ala', 'hgvsc': 'c.298A>G', 'canonical': 'YES'}
+    assert utils.add_stored_consequence(variant)
+    assert variant == {'variant_id': '22-1-A-G', 'major_consequence': 'missense_variant',
+                       'category': 'missense_variant', 'flags': [],
+                       'HGVSp': 'p.Thr100Ala', 'HGVSc': 'c.298A>G', 'CANONICAL': 'YES'}
 
-    variant = lookups.get_variant('SweGen', 16269985, '22', 'C', 'G')
-    utils.add_consequence_to_variant(variant)
-    assert variant['category'] == 'other_variant'
-    assert variant['major_consequence'] == 'intron_variant'
+    # not computed
+    variant = {'variant_id': '22-1-A-G', 'major_consequence': None, 'category': None}
+    assert not utils.add_stored_consequence(variant)
+    assert variant == {'variant_id': '22-1-A-G'}
 
-    variant = lookups.get_variant('SweGen', 16277852, '22', 'C', 'T')
-    utils.add_consequence_to_variant(variant)
-    assert variant['major_consequence'] == 'synonymous_variant'
-    assert variant['category'] == 'synonymous_variant'
 
-    variant = lookups.get_variant('SweGen', 16269934, '22', 'A', 'G')
-    utils.add_consequence_to_variant(variant)
-    assert variant['category'] == 'missense_variant'
-    assert variant['major_consequence'] == 'missense_variant'
 
-    variant['vep_annotations'] = []
-    utils.add_consequence_to_variant(variant)
-    assert variant['major_consequence'] == ''
 
-    # bad variant
-    variant = {}
-    utils.add_consequence_to_variant(variant)
-    assert not variant
-
-
-def test_annotation_severity():
-    """
-    Test annotation_severity()
-    """
-    variant = lookups.get_variant('SweGen', 16269934, '22', 'A', 'G')
-    res = utils.annotation_severity(variant['vep_annotations'][0])
-    assert res == -26.9
 
 
 def test_get_coverage():
@@ -94,6 +60,31 @@ def test_get_coverage():
     with pytest.raises(error.MalformedRequest):
         res = utils.get_coverage('SweGen', 'region', '22-1-1000000')
 
+    # binned coverage
+    res = utils.get_coverage('SweGen', 'gene', 'ENSG00000231565', resolution='100')
+    assert res['resolution'] == 100
+    assert [cov['pos'] for cov in res['coverage']][:3] == [16364800, 16364900, 16365000]
+    res = utils.get_coverage('SweGen', 'region', '22-46546000-46549999', resolution='1000')
+    assert len(res['coverage']) == 4
+    res = utils.get_coverage('SweGen', 'region', '22-46000000-47000000', resolution='auto')
+    assert res['resolution'] == 1000
+    with pytest.raises(error.MalformedRequest):
+        utils.get_coverage('SweGen', 'region', '22-1-1000000', resolution='bad')
+
+
+def test_get_coverage_resolution():
+    """
+    Test get_coverage_resolution()
+    """
+    assert utils.get_coverage_resolution(1, 2000) == 1
+    assert utils.get_coverage_resolution(1, 2000, 'auto') == 1
+    assert utils.get_coverage_resolution(1, 2001, 'auto') == 10
+    assert utils.get_coverage_resolution(1, 200000, 'auto') == 100
+    assert utils.get_coverage_resolution(1, 300000000, 'auto') == 1000
+    assert utils.get_coverage_resolution(1, 2000, '100') == 100
+    with pytest.raises(error.MalformedRequest):
+        utils.get_coverage_resolution(1, 2000, '50')
+
 
 def test_get_coverage_pos():
     """
@@ -127,76 +118,71 @@ def test_get_coverage_pos():
         utils.get_coverage_pos('SweGen', 'region', '1-1-10000000')
 
 
-def test_data_structures():
-    """
-    Test the constants
-    """
-    assert len(utils.CSQ_ORDER) == len(set(utils.CSQ_ORDER))  # No duplicates
-    assert all(csq == utils.REV_CSQ_ORDER_DICT[utils.CSQ_ORDER_DICT[csq]]
-               for csq in utils.CSQ_ORDER)
 
 
-def test_get_flags_from_variant():
-    """
-    Test get_flags_from_variant()
-    """
-    fake_variant = {'vep_annotations': [{'LoF': 'LC', 'LoF_flags': 'something'},
-                                        {'LoF': '', 'LoF_flags': ''},
-                                        {'LoF': 'LC', 'LoF_flags': 'something'}]}
-    flags = utils.get_flags_from_variant(fake_variant)
-    assert flags == ['LC LoF', 'LoF flag']
 
-    fake_variant = {'vep_annotations': [{'LoF': 'LC', 'LoF_flags': 'something'},
-                                        {'LoF': 'HC', 'LoF_flags': 'something'}]}
-    flags = utils.get_flags_from_variant(fake_variant)
-    assert flags == ['LoF', 'LoF flag']
 
-    fake_variant = {'mnps': 'no idea', 'vep_annotations': []}
-    flags = utils.get_flags_from_variant(fake_variant)
-    assert flags == ['MNP']
 
 
-def test_get_proper_hgvs():
+
+
+
+
+def test_get_region_set_export():
     """
-    Test get_proper_hgvs()
+    Test get_region_set_export()
     """
-    annotation = {'HGVSc': 'ENST00000343518.6:c.35C>T',
-                  'HGVSp': 'ENSP00000340610.6:p.Ser12Phe',
-                  'major_consequence': 'splice_donor_variant'}
-    assert utils.get_proper_hgvs(annotation) == 'c.35C>T'
-    annotation['major_consequence'] = 'coding_sequence_variant'
-    assert utils.get_proper_hgvs(annotation) == 'p.Ser12Phe'
-    assert not utils.get_proper_hgvs(dict())
+    region_set = 'chr22\t16079199\t16080500\nENSG00000198062\n22\t16250000\t16260000\n'
+    res = ''.join(utils.get_region_set_export('SweGen', region_set,
+                                              json_key=lambda key: key.upper()))
+    variants = [json.loads(line) for line in res.splitlines()]
+    expected = (utils.get_variant_list('SweGen', 'region', '22-16079200-16080500')['variants'] +
+                utils.get_variant_list('SweGen', 'region', '22-16250001-16287937')['variants'])
+    assert sorted(variant['VARIANT_ID'] for variant in variants) == \
+        sorted(variant['variant_id'] for variant in expected)
+    positions = [variant['POS'] for variant in variants]
+    assert positions == sorted(positions)
+    assert variants[0]['ALLELE_FREQ'] == expected[0]['allele_freq']
 
+    res = ''.join(utils.get_region_set_export('SweGen', region_set, export_format='csv',
+                                              chunk_size=10))
+    lines = res.splitlines()
+    assert lines[0].startswith('Variant,Chrom,Position')
+    assert len(lines) == len(expected) + 1
 
-def test_get_protein_hgvs():
-    """
-    Test get_protein_hgvs()
+    with pytest.raises(error.ParsingError):
+        utils.get_region_set_export('SweGen', region_set, export_format='xml')
+    with pytest.raises(error.MalformedRequest):
+        utils.get_region_set_export('SweGen', '22 1 2\n' * (utils.REGION_SET_LIMIT + 1))
+    with pytest.raises(error.NotFoundError):
+        utils.get_region_set_export('SweGen', 'ENSG00000000001')
+
+
+def test_get_variant_batch():
     """
-    annotation = {'HGVSc': 'ENST00000343518.6:c.35C>T',
-                  'HGVSp': 'ENSP00000340610.6:p.Ser12Phe'}
-    result = utils.get_protein_hgvs(annotation)
-    assert result == 'p.Ser12Phe'
-    annotation = {'HGVSc': 'ENST00000343518.6:c.27G>A',
-                  'HGVSp': 'ENST00000343518.6:c.27G>A(p.%3D)',
-                  'Protein_position': '9',
-                  'Amino_acids': 'P'}
-    result = utils.get_protein_hgvs(annotation)
-    assert result == 'p.Pro9Pro'
-    annotation['Amino_acids'] = 'Z'
-    assert not utils.get_protein_hgvs(annotation)
-    assert not utils.get_protein_hgvs(dict())
-
-
-def test_get_transcript_hgvs():
+    Test get_variant_batch()
     """
-    Test get_transcript_hgvs()
+    res = utils.get_variant_batch('SweGen', ['22-16080482-CAT-C', 'rs142856307', 'RS373706802',
+                                             '22-1-A-G', '22-16080482-CAT-C'])
+    assert [item['query'] for item in res] == ['22-16080482-CAT-C', 'rs142856307', 'RS373706802',
+                                               '22-1-A-G', '22-16080482-CAT-C']
+    assert [len(item['variants']) for item in res] == [1, 5, 1, 0, 1]
+    variant = res[0]['variants'][0]
+    assert set(variant) == set(utils.VARIANT_BATCH_FIELDS)
+    assert variant['variant_id'] == '22-16080482-CAT-C'
+    assert variant['rsid'] == 'rs373706802'
+    assert variant['filter'] == 'PASS'
+    assert res[2]['variants'] == res[0]['variants']
+    assert all(variant['rsid'] == 'rs142856307' for variant in res[1]['variants'])
 
-    """
-    annotation = {'HGVSc': 'ENST00000343518.6:c.35C>T',
-                  'HGVSp': 'ENSP00000340610.6:p.Ser12Phe'}
-    assert utils.get_transcript_hgvs(annotation) == 'c.35C>T'
-    assert not utils.get_transcript_hgvs(dict())
+    with pytest.raises(error.ParsingError):
+        utils.get_variant_batch('SweGen', ['22-16080482-CAT-C', 'BAD'])
+    with pytest.raises(error.ParsingError):
+        utils.get_variant_batch('SweGen', [16080482])
+    with pytest.raises(error.MalformedRequest):
+        utils.get_variant_batch('SweGen', ['rs1'] * (utils.VARIANT_BATCH_LIMIT + 1))
+    with pytest.raises(error.NotFoundError):
+        utils.get_variant_batch('Bad_dataset', ['rs1'])
 
 
 def test_get_variant_list():
@@ -227,6 +213,63 @@ def test_get_variant_list():
         utils.get_variant_list('SweGen', 'region', '22-1-1000000')
 
 
+def test_get_variant_list_stored_consequence():
+    """
+    Test get_variant_list() with consequence fields stored at import time
+    """
+    expected = utils.get_variant_list('SweGen', 'transcript', 'ENST00000438441')
+    links = (db.VariantTranscripts.select(db.VariantTranscripts.id,
+                                          db.Variant.vep_annotations)
+             .join(db.Transcript)
+             .switch(db.VariantTranscripts)
+             .join(db.Variant)
+             .where(db.Transcript.transcript_id == 'ENST00000438441')
+             .dicts())
+    with db.database.atomic() as transaction:
+        for link in links:
+            fields = consequences.get_consequence_fields([ann for ann in link['vep_annotations']
+                                                   if ann['Feature'] == 'ENST00000438441'])
+            (db.VariantTranscripts.update(**fields)
+             .where(db.VariantTranscripts.id == link['id'])
+             .execute())
+        res = utils.get_variant_list('SweGen', 'transcript', 'ENST00000438441')
+        transaction.rollback()
+    # updated rows may be returned in a different order
+    assert res['headers'] == expected['headers']
+    assert (sorted(res['variants'], key=lambda variant: variant['variant_id']) ==
+            sorted(expected['variants'], key=lambda variant: variant['variant_id']))
+
+
+def test_get_variant_csv():
+    """
+    Test get_variant_csv()
+    """
+    chunks = list(utils.get_variant_csv('SweGen', 'transcript', 'ENST00000438441', chunk_size=50))
+    assert [len(chunk.split('\n')) - 1 for chunk in chunks] == [50, 50, 50, 29]
+    assert chunks[0].startswith('Variant,Chrom,Position,Consequence,Filter,Annotation,Flags,')
+    chunks = list(utils.get_variant_csv('SweGen', 'transcript', 'ENST00000438441',
+                                        filter_type='all~false'))
+    assert len(chunks) == 1
+    assert len(chunks[0].split('\n')) == 8
+    chunks = list(utils.get_variant_csv('SweGen', 'region', '22-29450622-29465622',
+                                        filter_type='mislof~false'))
+    assert len(chunks[0].split('\n')) == 3
+
+    # errors are raised before iterating
+    with pytest.raises(error.NotFoundError):
+        utils.get_variant_csv('SweGen', 'gene', 'ENSG1234321')
+
+
+def test_merge_regions():
+    """
+    Test merge_regions()
+    """
+    regions = [('X', 1, 5), ('22', 10, 20), ('22', 21, 30), ('22', 5, 12),
+               ('22', 40, 50), ('1', 3, 4), ('22', 15, 16)]
+    assert utils.merge_regions(regions) == [('1', 3, 4), ('22', 5, 30), ('22', 40, 50), ('X', 1, 5)]
+    assert utils.merge_regions([]) == []
+
+
 def test_order_vep_by_csq():
     """
     Test order_vep_by_csq()
@@ -251,6 +294,19 @@ def test_parse_dataset():
     assert utils.parse_dataset('hg19:SweGen:180101') == ('SweGen', '180101')
 
 
+def test_parse_region_set():
+    """
+    Test parse_region_set()
+    """
+    region_set = ('track name=panel\n# comment\n\nchr22\t99\t200\tname\t0\t+\n'
+                  'ensg00000223875\n22 1000 1001\n')
+    assert utils.parse_region_set(region_set) == ([('22', 100, 200), ('22', 1001, 1001)],
+                                                  ['ENSG00000223875'])
+    for region_set in ('22\t100\n', '22\tx\t200\n', '22\t200\t100\n', 'PABPC1P9\n'):
+        with pytest.raises(error.ParsingError):
+            utils.parse_region_set(region_set)
+
+
 def test_parse_region():
     assert utils.parse_region('1-2-3') == ('1', 2, 3)
     assert utils.parse_region('X-15-30') == ('X', 15, 30)
@@ -279,50 +335,13 @@ def test_remove_extraneous_vep_annotations():
         [{'Consequence': 'frameshift_variant'}]
 
 
-def test_worst_csq_from_csq():
-    """
-    Test worst_csq_from_csq()
-    """
-    variant = lookups.get_variant('SweGen', 16269941, '22', 'G', 'C')
-    res = utils.worst_csq_from_csq(variant['vep_annotations'][0]['Consequence'])
-    assert res == 'splice_region_variant'
-    res = utils.worst_csq_from_csq('non_coding_exon_variant&nc_transcript_variant')
-    assert res == 'non_coding_exon_variant'
 
 
-def test_worst_csq_from_list():
-    """
-    Test worst_csq_from_list()
-    """
-    csqs = ['frameshift_variant', 'missense_variant']
-    assert utils.worst_csq_from_list(csqs) == 'frameshift_variant'
 
 
-def test_worst_csq_index():
-    """
-    Test worst_csq_index()
-    """
-    csqs = ['frameshift_variant', 'missense_variant']
-    assert utils.worst_csq_index(csqs) == 4
 
 
-def test_worst_csq_with_vep():
-    """
-    Test worst_csq_from_vep()
-    """
-    veps = [{'SYMBOL': '1', 'Consequence': 'intergenic_variant', 'CANONICAL': ''},
-            {'SYMBOL': '2', 'Consequence': 'frameshift_variant', 'CANONICAL': ''},
-            {'SYMBOL': '3', 'Consequence': 'intron_variant', 'CANONICAL': ''},
-            {'SYMBOL': '4', 'Consequence': 'stop_lost', 'CANONICAL': ''}]
-    res = utils.worst_csq_with_vep(veps)
-    assert res == {'SYMBOL': '2', 'Consequence': 'frameshift_variant',
-                   'CANONICAL': '', 'major_consequence': 'frameshift_variant'}
-
-    veps = [{'SYMBOL': '1', 'Consequence': 'frameshift_variant', 'CANONICAL': 'YES'},
-            {'SYMBOL': '2', 'Consequence': 'frameshift_variant', 'CANONICAL': ''},
-            {'SYMBOL': '3', 'Consequence': 'intron_variant', 'CANONICAL': ''},
-            {'SYMBOL': '4', 'Consequence': 'stop_lost', 'CANONICAL': ''}]
-    res = utils.worst_csq_with_vep(veps)
-    assert res == {'SYMBOL': '1', 'Consequence': 'frameshift_variant',
-                   'CANONICAL': 'YES', 'major_consequence': 'frameshift_variant'}
-    assert not utils.worst_csq_with_vep([])
+
+
+
+
@@ -1,62 +1,44 @@
 """Utility functions for lookups and browser_handlers."""
 
+import json
 import logging
 
+import db
+from consequences import (CONSEQUENCE_FIELDS, CSQ_ORDER_DICT, add_consequence_to_variant,
+                          worst_csq_from_csq, worst_csq_index_from_csq)
+
 from . import error
 from . import lookups
 
 # for coverage
 AF_BUCKETS = [0.0001, 0.0002, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1]
 EXON_PADDING = 50
+MAX_COVERAGE_POINTS = 2000
+
+# maximum number of variant ids and rsids in one batch lookup
+VARIANT_BATCH_LIMIT = 5000
+# maximum number of regions and genes in one region set
+REGION_SET_LIMIT = 10000
 
 CHROMOSOMES = ['chr%s' % x for x in range(1, 23)]
 CHROMOSOMES.extend(['chrX', 'chrY', 'chrM'])
 CHROMOSOME_TO_CODE = {item: i+1 for i, item in enumerate(CHROMOSOMES)}
 
-# Note that this is the current as of v81 with some included for backwards compatibility (VEP <= 75)
-
-CSQ_ORDER = ["transcript_ablation",
-             "splice_acceptor_variant",
-             "splice_donor_variant",
-             "stop_gained",
-             "frameshift_variant",
-             "stop_lost",
-             "start_lost",  # new in v81
-             "initiator_codon_variant",  # deprecated
-             "transcript_amplification",
-             "inframe_insertion",
-             "inframe_deletion",
-             "missense_variant",
-             "protein_altering_variant",  # new in v79
-             "splice_region_variant",
-             "incomplete_terminal_codon_variant",
-             "stop_retained_variant",
-             "synonymous_variant",
-             "coding_sequence_variant",
-             "mature_miRNA_variant",
-             "5_prime_UTR_variant",
-             "3_prime_UTR_variant",
-             "non_coding_transcript_exon_variant",
-             "non_coding_exon_variant",  # deprecated
-             "intron_variant",
-             "NMD_transcript_variant",
-             "non_coding_transcript_variant",
-             "nc_transcript_variant",  # deprecated
-             "upstream_gene_variant",
-             "downstream_gene_variant",
-             "TFBS_ablation",
-             "TFBS_amplification",
-             "TF_binding_site_variant",
-             "regulatory_region_ablation",
-             "regulatory_region_amplification",
-             "feature_elongation",
-             "regulatory_region_variant",
-             "feature_truncation",
-             "intergenic_variant",
-             ""]
-
-CSQ_ORDER_DICT = {csq: i for i, csq in enumerate(CSQ_ORDER)}
-REV_CSQ_ORDER_DICT = dict(enumerate(CSQ_ORDER))
+VARIANT_LIST_HEADERS = [['variant_id', 'Variant'],
+                        ['chrom', 'Chrom'],
+                        ['pos', 'Position'],
+                        ['HGVS', 'Consequence'],
+                        ['filter', 'Filter'],
+                        ['major_consequence', 'Annotation'],
+                        ['flags', 'Flags'],
+                        ['allele_count', 'Allele Count'],
+                        ['allele_num', 'Allele Number'],
+                        ['hom_count', 'Number of Homozygous Alleles'],
+                        ['allele_freq', 'Allele Frequency']]
+
+# keys of the variants returned by a batch lookup
+VARIANT_BATCH_FIELDS = ('variant_id', 'chrom', 'pos', 'ref', 'alt', 'rsid', 'allele_count',
+                        'allele_num', 'allele_freq', 'hom_count', 'filter', 'major_consequence')
 
 METRICS = ['BaseQRankSum',
            'ClippingRankSum',
@@ -69,89 +51,32 @@ METRICS = ['BaseQRankSum',
            'ReadPosRankSum',
            'VQSLOD']
 
-PROTEIN_LETTERS_1TO3 = {
-    'A': 'Ala', 'C': 'Cys', 'D': 'Asp', 'E': 'Glu',
-    'F': 'Phe', 'G': 'Gly', 'H': 'His', 'I': 'Ile',
-    'K': 'Lys', 'L': 'Leu', 'M': 'Met', 'N': 'Asn',
-    'P': 'Pro', 'Q': 'Gln', 'R': 'Arg', 'S': 'Ser',
-    'T': 'Thr', 'V': 'Val', 'W': 'Trp', 'Y': 'Tyr',
-    'X': 'Ter', '*': 'Ter', 'U': 'Sec'
-}
-
-
-def add_consequence_to_variants(variant_list: list):
-    """
-    Add information about variant consequence to multiple variants.
-    Changes are performed in-place.
-
-    Args:
-        variant_list (list): list of variants
-        datatype (str): type of data
-        item (str): query item
-    """
-    for variant in variant_list:
-        add_consequence_to_variant(variant)
-
 
-def add_consequence_to_variant(variant: dict):
+def add_stored_consequence(variant: dict) -> bool:
     """
-    Add information about variant consequence to a variant.
-    Changes are performed in-place.
-
-    Args:
-        variant (dict): variant information
-    """
-    if not variant:
-        return
-    worst_csq = worst_csq_with_vep(variant['vep_annotations'])
-    variant['major_consequence'] = ''
-    variant['category'] = ''
-    variant['flags'] = ''
-
-    if not worst_csq:
-        return
-
-    variant['major_consequence'] = worst_csq['major_consequence']
-    variant['HGVSp'] = get_protein_hgvs(worst_csq)
-    variant['HGVSc'] = get_transcript_hgvs(worst_csq)
-    variant['HGVS'] = get_proper_hgvs(worst_csq)
-    variant['CANONICAL'] = worst_csq['CANONICAL']
-
-    if CSQ_ORDER_DICT[variant['major_consequence']] <= CSQ_ORDER_DICT["frameshift_variant"]:
-        variant['category'] = 'lof_variant'
-        for annotation in variant['vep_annotations']:
-            if annotation['LoF'] == '':
-                annotation['LoF'] = 'NC'
-                annotation['LoF_filter'] = 'Non-protein-coding gene'
-    elif CSQ_ORDER_DICT[variant['major_consequence']] <= CSQ_ORDER_DICT["missense_variant"]:
-        # Should be noted that this grabs inframe deletion, etc.
-        variant['category'] = 'missense_variant'
-    elif CSQ_ORDER_DICT[variant['major_consequence']] <= CSQ_ORDER_DICT["synonymous_variant"]:
-        variant['category'] = 'synonymous_variant'
-    else:
-        variant['category'] = 'other_variant'
-    variant['flags'] = get_flags_from_variant(variant)
-    return
+    Add consequence information stored at import time to a variant.
 
-
-def annotation_severity(annotation: dict) -> float:
-    """
-    Evaluate severity of the consequences; "bigger is more important".
+    Sets the same keys as add_consequence_to_variant, using the
+    db.ConsequenceModel fields of the variant. Changes are performed in-place.
 
     Args:
-        annotation (dict): vep_annotation from a variant
+        variant (dict): variant information, including the stored consequence fields
 
     Returns:
-        float: severity score
+        bool: False if the fields were never computed for the variant
 
     """
-    score = float(-CSQ_ORDER_DICT[worst_csq_from_csq(annotation['Consequence'])])
-    if annotation['CANONICAL'] == 'YES':
-        score += 0.1
-    return score
+    stored = {column: variant.pop(column, None) for column in CONSEQUENCE_FIELDS}
+    if stored['major_consequence'] is None:
+        return False
+    for column, key in CONSEQUENCE_FIELDS.items():
+        if stored[column] is not None:
+            variant[key] = stored[column]
+    return True
 
 
-def get_coverage(dataset: str, datatype: str, item: str, ds_version: str = None) -> dict:
+def get_coverage(dataset: str, datatype: str, item: str, ds_version: str = None,
+                 resolution: str = '1') -> dict:
     """
     Retrieve coverage for a gene/region/transcript.
 
@@ -160,37 +85,50 @@ def get_coverage(dataset: str, datatype: str, item: str, ds_version: str = None)
         datatype (str): type of "region" (gene/region/transcript)
         item (str): the datatype item to look up
         ds_version (str): the dataset version
+        resolution (str): bin size in bases, or "auto" to choose from the region length
 
     Returns:
-        dict: start, stop, coverage list
+        dict: coverage list and the resolution used
 
     """
-    ret: dict = {'coverage': []}
+    ret: dict = {'coverage': [], 'resolution': 1}
 
+    region = None
     if datatype == 'gene':
-        gene = lookups.get_gene(dataset, item)
+        gene = lookups.get_gene(dataset, item, ds_version)
         if gene:
-            transcript = lookups.get_transcript(dataset, gene['canonical_transcript'])
+            transcript = lookups.get_transcript(dataset, gene['canonical_transcript'], ds_version)
             if transcript:
-                start = transcript['start'] - EXON_PADDING
-                stop = transcript['stop'] + EXON_PADDING
-                ret['coverage'] = lookups.get_coverage_for_transcript(dataset, transcript['chrom'],
-                                                                      start, stop, ds_version)
+                region = (transcript['chrom'],
+                          transcript['start'] - EXON_PADDING,
+                          transcript['stop'] + EXON_PADDING)
 
     elif datatype == 'region':
-        chrom, start, stop = parse_region(item)
-
-        if is_region_too_large(start, stop):
-            raise error.MalformedRequest('Region too large')
-        ret['coverage'] = lookups.get_coverage_for_bases(dataset, chrom, start, stop, ds_version)
+        region = parse_region(item)
 
     elif datatype == 'transcript':
-        transcript = lookups.get_transcript(dataset, item)
+        transcript = lookups.get_transcript(dataset, item, ds_version)
         if transcript:
-            start = transcript['start'] - EXON_PADDING
-            stop = transcript['stop'] + EXON_PADDING
-            ret['coverage'] = lookups.get_coverage_for_transcript(dataset, transcript['chrom'],
-                                                                  start, stop, ds_version)
+            region = (transcript['chrom'],
+                      transcript['start'] - EXON_PADDING,
+                      transcript['stop'] + EXON_PADDING)
+
+    if region:
+        chrom, start, stop = region
+        ret['resolution'] = get_coverage_resolution(start, stop, resolution)
+        if datatype == 'region' and is_region_too_large(start // ret['resolution'],
+                                                        stop // ret['resolution']):
+            raise error.MalformedRequest('Region too large')
+        if ret['resolution'] > 1:
+            ret['coverage'] = lookups.get_coverage_summary(dataset, chrom, start, stop,
+                                                           ret['resolution'],
+                                                           ds_version=ds_version)
+        elif datatype == 'region':
+            ret['coverage'] = lookups.get_coverage_for_bases(dataset, chrom, start, stop,
+                                                             ds_version)
+        else:
+            ret['coverage'] = lookups.get_coverage_for_transcript(dataset, chrom, start, stop,
+                                                                  ds_version)
 
     return ret
 
@@ -219,7 +157,7 @@ def get_coverage_pos(dataset: str, datatype: str, item: str, ds_version: str = N
         ret['chrom'] = chrom
     else:
         if datatype == 'gene':
-            gene = lookups.get_gene(dataset, item)
+            gene = lookups.get_gene(dataset, item, ds_version)
             transcript = lookups.get_transcript(dataset, gene['canonical_transcript'], ds_version)
         elif datatype == 'transcript':
             transcript = lookups.get_transcript(dataset, item, ds_version)
@@ -231,94 +169,131 @@ def get_coverage_pos(dataset: str, datatype: str, item: str, ds_version: str = N
     return ret
 
 
-def get_flags_from_variant(variant: dict) -> list:
+def get_coverage_resolution(start: int, stop: int, resolution: str = '1') -> int:
     """
-    Get flags from variant.
+    Get the coverage resolution to use for a region.
 
-    Checks for:
-    * MNP
-    * LoF (loss of function)
+    With "auto", the finest resolution giving at most MAX_COVERAGE_POINTS
+    values for the region is chosen.
 
     Args:
-        variant (dict): a variant
+        start (int): start position of the region
+        stop (int): end position of the region
+        resolution (str): bin size in bases, or "auto"
 
     Returns:
-        list: flags for the variant
+        int: 1 for per-base coverage, otherwise one of db.COVERAGE_RESOLUTIONS
 
     """
-    flags = []
-    if 'mnps' in variant:
-        flags.append('MNP')
-    lof_annotations = [x for x in variant['vep_annotations'] if x['LoF'] != '']
-    if not lof_annotations:
-        return flags
-    if any([x['LoF'] == 'HC' for x in lof_annotations]):
-        flags.append('LoF')
-    if all([x['LoF'] != 'HC' for x in lof_annotations]):
-        flags.append('LC LoF')
-    if all([x['LoF_flags'] != '' for x in lof_annotations]):
-        flags.append('LoF flag')
-    return flags
+    resolutions = (1,) + db.COVERAGE_RESOLUTIONS
+    if resolution == 'auto':
+        for res in resolutions:
+            if (stop - start + 1) / res <= MAX_COVERAGE_POINTS:
+                return res
+        return resolutions[-1]
+    if resolution not in [str(res) for res in resolutions]:
+        raise error.MalformedRequest(f'Unsupported resolution: {resolution}')
+    return int(resolution)
 
 
-def get_proper_hgvs(annotation: dict) -> str:
+def get_region_set_export(dataset: str, region_set: str, ds_version: str = None,  # pylint: disable=too-many-arguments
+                          *, export_format: str = 'ndjson', chunk_size: int = 1000, json_key=None):
     """
-    Get HGVS for change, either at transcript or protein level.
+    Export the variants in a set of regions and genes as NDJSON or CSV, in chunks of lines.
+
+    The regions are merged and sorted, and all of them are read by one
+    query (see lookups.get_variants_in_regions). NDJSON lines hold the
+    VARIANT_LIST_HEADERS columns.
 
     Args:
-        annotation (dict): VEP annotation with HGVS information
+        dataset (str): dataset short name
+        region_set (str): BED-like regions and/or gene ids, see parse_region_set
+        ds_version (str): dataset version
+        export_format (str): ndjson or csv
+        chunk_size (int): number of lines per chunk
+        json_key (function): converts a column name to its NDJSON key; default unchanged
 
     Returns:
-        str: variant effect at aa level in HGVS format (p.), None if parsing fails
+        iterator: text chunks; CSV starts with the header line
 
     """
-    # Needs major_consequence
-    try:
-        if annotation['major_consequence'] in ('splice_donor_variant',
-                                               'splice_acceptor_variant',
-                                               'splice_region_variant'):
-            return get_transcript_hgvs(annotation)
-        return get_protein_hgvs(annotation)
-    except KeyError:
-        return ''
+    if export_format not in ('ndjson', 'csv'):
+        raise error.ParsingError(f'Unknown format {export_format}')
+    regions, gene_ids = parse_region_set(region_set)
+    if len(regions) + len(gene_ids) > REGION_SET_LIMIT:
+        raise error.MalformedRequest(f'Too many regions (limit {REGION_SET_LIMIT})')
+    regions += lookups.get_gene_regions(dataset, gene_ids, ds_version)
 
+    variants = lookups.get_variants_in_regions(dataset, merge_regions(regions), ds_version)
+    variants = (_format_list_variant(variant) for variant in variants)
+    if export_format == 'csv':
+        return _csv_chunks(variants, chunk_size)
+    return _ndjson_chunks(variants, chunk_size, json_key or str)
 
-def get_protein_hgvs(annotation: dict) -> str:
+
+def get_variant_batch(dataset: str, queries: list, ds_version: str = None) -> list:
     """
-    Aa changes in HGVS format.
+    Look up a batch of variant ids (chrom-pos-ref-alt) and rsids.
+
+    All queries are resolved by one call to lookups.get_variants_by_ids.
 
     Args:
-        annotation (dict): VEP annotation with HGVS information
+        dataset (str): dataset short name
+        queries (list): variant ids and/or rsids (str)
+        ds_version (str): dataset version
 
     Returns:
-        str: variant effect at aa level in HGVS format (p.), None if parsing fails
+        list: {query:str, variants:list} per query, in the order of the queries;
+              variants is empty if nothing was found
 
     """
-    try:
-        if '%3D' in annotation['HGVSp']:  # "%3D" is "="
-            amino_acids = ''.join([PROTEIN_LETTERS_1TO3[aa] for aa in annotation['Amino_acids']])
-            return "p." + amino_acids + annotation['Protein_position'] + amino_acids
-        return annotation['HGVSp'].split(':')[-1]
-    except KeyError:
-        logging.error("Could not fetch protein hgvs")
-        return ''
+    if len(queries) > VARIANT_BATCH_LIMIT:
+        raise error.MalformedRequest(f'Too many variants (limit {VARIANT_BATCH_LIMIT})')
 
+    keys = []
+    for query in queries:
+        if not isinstance(query, str):
+            raise error.ParsingError(f'Unable to parse variant {query}')
+        query = query.strip()
+        if lookups.RSID_REGEX.match(query):
+            keys.append(('rsid', int(query[2:])))
+        else:
+            keys.append(('variant', lookups.parse_variant_id(query)))
 
-def get_transcript_hgvs(annotation: dict) -> str:
+    variants = lookups.get_variants_by_ids(dataset,
+                                           [value for kind, value in keys if kind == 'variant'],
+                                           [value for kind, value in keys if kind == 'rsid'],
+                                           ds_version)
+    matches: dict = {}
+    for variant in variants:
+        key = (variant['chrom'], variant['pos'], variant['ref'], variant['alt'])
+        rsid = variant['rsid']
+        variant = _format_batch_variant(variant)
+        matches.setdefault(('variant', key), []).append(variant)
+        if rsid:
+            matches.setdefault(('rsid', rsid), []).append(variant)
+
+    return [{'query': query, 'variants': matches.get(key, [])}
+            for query, key in zip(queries, keys)]
+
+
+def _format_batch_variant(variant: dict) -> dict:
     """
-    Nucleotide change in HGVS format.
+    Format a variant for a batch lookup.
 
     Args:
-        annotation (dict): VEP annotation with HGVS information
+        variant (dict): variant from lookups.get_variants_by_ids
 
     Returns:
-        str: variant effect at nucleotide level in HGVS format (c.), None if parsing fails
+        dict: the VARIANT_BATCH_FIELDS of the variant
 
     """
-    try:
-        return annotation['HGVSc'].split(':')[-1]
-    except KeyError:
-        return ''
+    if variant['major_consequence'] is None:
+        add_consequence_to_variant(variant)
+    variant['filter'] = variant['filter_string']
+    if variant['rsid']:
+        variant['rsid'] = f'rs{variant["rsid"]}'
+    return {key: variant[key] for key in VARIANT_BATCH_FIELDS}
 
 
 def get_variant_list(dataset: str, datatype: str, item: str, ds_version: str = None) -> dict:
@@ -335,18 +310,27 @@ def get_variant_list(dataset: str, datatype: str, item: str, ds_version: str = N
         dict: {variants:list, headers:list}
 
     """
-    headers = [['variant_id', 'Variant'],
-               ['chrom', 'Chrom'],
-               ['pos', 'Position'],
-               ['HGVS', 'Consequence'],
-               ['filter', 'Filter'],
-               ['major_consequence', 'Annotation'],
-               ['flags', 'Flags'],
-               ['allele_count', 'Allele Count'],
-               ['allele_num', 'Allele Number'],
-               ['hom_count', 'Number of Homozygous Alleles'],
-               ['allele_freq', 'Allele Frequency']]
+    variants = list(iter_variant_list(dataset, datatype, item, ds_version))
+    return {'variants': variants, 'headers': VARIANT_LIST_HEADERS}
+
+
+def iter_variant_list(dataset: str, datatype: str, item: str, ds_version: str = None):
+    """
+    Retrieve variants for a datatype, formatting them as they are consumed.
+
+    The lookup is done by this call, so errors are raised immediately.
+
+    Args:
+        dataset (str): dataset short name
+        datatype (str): type of data
+        item (str): query item
+        ds_version (str): dataset version
+
+    Returns:
+        iterator: formatted variant dicts
 
+    """
+    variants: list = []
     if datatype == 'gene':
         variants = lookups.get_variants_in_gene(dataset, item, ds_version)
 
@@ -359,39 +343,155 @@ def get_variant_list(dataset: str, datatype: str, item: str, ds_version: str = N
 
     elif datatype == 'transcript':
         variants = lookups.get_variants_in_transcript(dataset, item, ds_version)
-        transcript = lookups.get_transcript(dataset, item, ds_version)
-        refgene = transcript['gene_id']
 
-    if variants:
-        for variant in variants:
-            if datatype in ('gene', 'transcript'):
-                anno = None
-                if datatype == 'transcript':
-                    anno = [ann for ann in variant['vep_annotations'] if ann['Feature'] == item]
-                    if not anno:
-                        anno = [ann for ann in variant['vep_annotations'] if ann['Gene'] == refgene]
-                else:
-                    anno = [ann for ann in variant['vep_annotations'] if ann['Gene'] == item]
-                if anno:
-                    variant['vep_annotations'] = anno
+    return (_format_list_variant(variant) for variant in variants)
+
+
+def _format_list_variant(variant: dict) -> dict:
+    """
+    Format a variant for a variant list.
+
+    The lookups select the stored consequence fields of the variant, or of the
+    gene or transcript link, and only the VEP annotations (of the gene or
+    transcript) needed to compute them when they have not been stored.
+
+    Args:
+        variant (dict): variant from the lookup
+
+    Returns:
+        dict: the formatted variant
+
+    """
+    if not add_stored_consequence(variant):
+        add_consequence_to_variant(variant)
+    remove_extraneous_information(variant)
+
+    variant['major_consequence'] = (variant['major_consequence'].replace('_variant', '')
+                                    .replace('_prime_', '\'')
+                                    .replace('_', ' '))
+
+    # This is so an array values turns into a comma separated string instead
+    return {k: ", ".join(v) if isinstance(v, list) else v for k, v in variant.items()}
+
+
+def filter_variant_list(variants, filter_type: str):
+    """
+    Filter formatted variants the same way as the variant table in the browser.
+
+    Args:
+        variants (iterable): formatted variant dicts
+        filter_type (str): <consequence filter>~<include non-pass>, e.g. mislof~false
+
+    Returns:
+        iterator: the variants passing the filter
+
+    """
+    filters = filter_type.split('~')
+    for variant in variants:
+        if filters[1] == 'false' and variant['filter_string'] != 'PASS':
+            continue
+        if filters[0] == 'mislof':
+            if variant['major_consequence'] != 'missense' and 'LoF' not in variant['flags']:
+                continue
+        elif 'lof' in filters[0] and 'LoF' not in variant['flags']:
+            continue
+        yield variant
+
+
+def get_variant_csv(dataset: str, datatype: str, item: str,  # pylint: disable=too-many-arguments
+                    ds_version: str = None, *, filter_type: str = None, chunk_size: int = 1000):
+    """
+    Export variants for a datatype as CSV, in chunks of lines.
+
+    Args:
+        dataset (str): dataset short name
+        datatype (str): type of data
+        item (str): query item
+        ds_version (str): dataset version
+        filter_type (str): filter to apply, see filter_variant_list
+        chunk_size (int): number of lines per chunk
+
+    Returns:
+        iterator: CSV text chunks, starting with the header line
+
+    """
+    variants = iter_variant_list(dataset, datatype, item, ds_version)
+    if filter_type:
+        variants = filter_variant_list(variants, filter_type)
+    return _csv_chunks(variants, chunk_size)
+
 
-        add_consequence_to_variants(variants)
+def _csv_chunks(variants, chunk_size: int):
+    """
+    Format variants as CSV lines, joined in chunks of chunk_size lines.
+
+    Args:
+        variants (iterable): formatted variant dicts
+        chunk_size (int): number of lines per chunk
 
-        for variant in variants:
-            remove_extraneous_information(variant)
+    Returns:
+        iterator: CSV text chunks
 
-        # Format output
-        def format_variant(variant):
-            variant['major_consequence'] = (variant['major_consequence'].replace('_variant', '')
-                                            .replace('_prime_', '\'')
-                                            .replace('_', ' '))
+    """
+    columns = [header[0] for header in VARIANT_LIST_HEADERS]
+    lines = [','.join([header[1] for header in VARIANT_LIST_HEADERS]) + '\n']
+    for variant in variants:
+        # variants without VEP annotations have no HGVS
+        lines.append(','.join(map(str, [variant.get(column, '') for column in columns])) + '\n')
+        if len(lines) >= chunk_size:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
 
-            # This is so an array values turns into a comma separated string instead
-            return {k: ", ".join(v) if isinstance(v, list) else v for k, v in variant.items()}
 
-        variants = list(map(format_variant, variants))
+def _ndjson_chunks(variants, chunk_size: int, json_key):
+    """
+    Format variants as JSON lines, joined in chunks of chunk_size lines.
 
-    return {'variants': variants, 'headers': headers}
+    Args:
+        variants (iterable): formatted variant dicts
+        chunk_size (int): number of lines per chunk
+        json_key (function): converts a column name to its key
+
+    Returns:
+        iterator: NDJSON text chunks
+
+    """
+    columns = [(header[0], json_key(header[0])) for header in VARIANT_LIST_HEADERS]
+    lines = []
+    for variant in variants:
+        lines.append(json.dumps({key: variant.get(column) for column, key in columns}) + '\n')
+        if len(lines) >= chunk_size:
+            yield ''.join(lines)
+            lines = []
+    if lines:
+        yield ''.join(lines)
+
+
+def merge_regions(regions: list) -> list:
+    """
+    Sort regions by chromosome and position, merging overlapping and adjacent regions.
+
+    Args:
+        regions (list): regions as (chrom, start, stop) tuples, both positions included
+
+    Returns:
+        list: the merged regions as (chrom, start, stop) tuples
+
+    """
+    def sort_key(region):
+        chrom_code = CHROMOSOME_TO_CODE.get(f'chr{region[0]}', len(CHROMOSOMES) + 1)
+        return (chrom_code, region[0], region[1])
+
+    merged: list = []
+    for chrom, start, stop in sorted(regions, key=sort_key):
+        if merged and merged[-1][0] == chrom and start <= merged[-1][2] + 1:
+            if stop > merged[-1][2]:
+                merged[-1] = (chrom, merged[-1][1], stop)
+        else:
+            merged.append((chrom, start, stop))
+    return merged
 
 
 def order_vep_by_csq(annotation_list: list) -> list:
@@ -447,6 +547,42 @@ def parse_dataset(dataset: str, ds_version: str = None) -> tuple:
     return (dataset, ds_version)
 
 
+def parse_region_set(region_set: str) -> tuple:
+    """
+    Parse a BED-like list of regions and gene ids, one per line.
+
+    Region lines hold the chromosome, start and end (0-based, end excluded,
+    as in BED), followed by any other columns. Lines with only a gene id
+    (ENSG) are genes. Empty lines, comments and track/browser lines are skipped.
+
+    Args:
+        region_set (str): the regions and gene ids
+
+    Returns:
+        tuple: (regions as (chrom, start, stop) tuples with 1-based positions, both included,
+                gene ids)
+
+    """
+    regions = []
+    gene_ids = []
+    for line_number, line in enumerate(region_set.splitlines(), 1):
+        fields = line.split()
+        if not fields or fields[0].startswith('#') or fields[0] in ('track', 'browser'):
+            continue
+        if len(fields) == 1 and lookups.classify_query(fields[0]) == 'gene_id':
+            gene_ids.append(fields[0].upper())
+            continue
+        try:
+            chrom = fields[0][3:] if fields[0].lower().startswith('chr') else fields[0]
+            start, stop = int(fields[1]), int(fields[2])
+        except (IndexError, ValueError) as err:
+            raise error.ParsingError(f'Unable to parse line {line_number}: {line}') from err
+        if not chrom or start < 0 or stop <= start:
+            raise error.ParsingError(f'Invalid region on line {line_number}: {line}')
+        regions.append((chrom.upper(), start + 1, stop))
+    return regions, gene_ids
+
+
 def parse_region(region: str) -> tuple:
     """
     Parse a region with either one or two positions
@@ -504,68 +640,6 @@ def remove_extraneous_vep_annotations(annotation_list: list) -> list:
 
     """
     return [ann for ann in annotation_list
-            if worst_csq_index(ann['Consequence'].split('&')) <= CSQ_ORDER_DICT['intron_variant']]
-
-
-def worst_csq_from_list(csq_list: list) -> str:
-    """
-    Choose the worst consequence.
-
-    Args:
-        csq_list (list): list of consequences
-
-    Returns:
-        str: the worst consequence
+            if worst_csq_index_from_csq(ann['Consequence']) <= CSQ_ORDER_DICT['intron_variant']]
 
-    """
-    return REV_CSQ_ORDER_DICT[worst_csq_index(csq_list)]
-
-
-def worst_csq_from_csq(csq: str) -> str:
-    """
-    Find worst consequence in a possibly &-filled consequence string.
-
-    Args:
-        csq (str): string of consequences, seperated with & (if multiple)
-
-    Returns:
-        str: the worst consequence
-
-    """
-    return REV_CSQ_ORDER_DICT[worst_csq_index(csq.split('&'))]
 
-
-def worst_csq_index(csq_list: list) -> int:
-    """
-    Find the index of the worst consequence.
-
-    Corresponds to the lowest value (index) from CSQ_ORDER_DICT.
-
-    Args:
-        csq_list (list): consequences
-
-    Returns:
-        int: index in CSQ_ODER_DICT of the worst consequence
-
-    """
-    return min([CSQ_ORDER_DICT[csq] for csq in csq_list])
-
-
-def worst_csq_with_vep(annotation_list: list) -> dict:
-    """
-    Choose the vep annotation with the most severe consequence.
-
-    Add a"major_consequence" field for that annotation.
-
-    Args:
-        annotation_list (list): VEP annotations
-
-    Returns:
-        dict: the annotation with the most severe consequence
-
-    """
-    if not annotation_list:
-        return {}
-    worst = max(annotation_list, key=annotation_severity)
-    worst['major_consequence'] = worst_csq_from_csq(worst['Consequence'])
-    return worst
@@ -54,6 +54,8 @@ class Application(tornado.web.Application):
             (r"/api/users/datasets", application.UserDatasetAccess),
             (r"/api/users/sftp_access", application.SFTPAccess),
             (r"/api/schema", application.GetSchema),
+            (r"/api/status/database", application.DatabasePoolStatus),
+            (r"/api/status/response_cache", application.ResponseCacheStatus),
             # Dataset Api
             (r"/api/dataset", application.ListDatasets),
             (r"/api/dataset/(?P<dataset>[^\/]+)", application.GetDataset),
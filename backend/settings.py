@@ -34,6 +34,35 @@ psql_name = json_settings["postgresName"]
 psql_user = json_settings["postgresUser"]
 psql_pass = json_settings["postgresPass"]
 
+# Connection pool: max connections, seconds before an idle connection is
+# recycled, and seconds to wait for a free connection
+psql_max_connections = json_settings.get("postgresMaxConnections", 20)
+psql_stale_timeout = json_settings.get("postgresStaleTimeout", 300)
+psql_pool_timeout = json_settings.get("postgresPoolTimeout", 10)
+
+# Seconds to keep resolved dataset versions in the cache
+dataset_version_cache_ttl = json_settings.get("datasetVersionCacheTTL", 300)
+
+# Seconds before the gene names used for autocompletion are reloaded
+gene_name_index_ttl = json_settings.get("geneNameIndexTTL", 3600)
+
+# Number of threads used for browser queries; should not exceed postgresMaxConnections
+db_threads = json_settings.get("databaseThreads", 8)
+
+# Number of threads used for streamed downloads, kept apart from the browser queries;
+# databaseThreads + databaseStreamThreads should not exceed postgresMaxConnections
+db_stream_threads = json_settings.get("databaseStreamThreads", 2)
+
+# Number of rows fetched per round trip when streaming large results
+db_cursor_size = json_settings.get("databaseCursorSize", 1000)
+
+# Memory budget in bytes for cached browser responses of released dataset versions; 0 disables
+response_cache_size = json_settings.get("responseCacheSize", 64 * 1024 * 1024)
+
+# Directory with memory-mapped coverage files written by the importer
+# (--coverage_dir); coverage is read from the database when unset
+coverage_dir = json_settings.get("coverageDirectory")
+
 # e-mail config
 mail_server = json_settings["mailServer"]
 from_address = json_settings["fromAddress"]
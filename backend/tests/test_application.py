@@ -65,6 +65,41 @@ def test_get_schema():
         assert data[value] == expected[value]
 
 
+def test_get_database_pool_status():
+    """
+    Test DatabasePoolStatus.get()
+    """
+    response = requests.get(f'{BASE_URL}/api/status/database')
+    assert response.status_code == 403
+
+    session = requests.Session()
+    session.get(f'{BASE_URL}/developer/login?user=user&email=user')
+    response = session.get(f'{BASE_URL}/api/status/database')
+    assert response.status_code == 403
+
+    session.get(f'{BASE_URL}/developer/login?user=admin12&email=admin12')
+    response = session.get(f'{BASE_URL}/api/status/database')
+    data = json.loads(response.text)
+    assert set(data) == {'maxConnections', 'inUse', 'idle', 'waits', 'waitTime'}
+    assert data['inUse'] >= 1  # the connection used for this request
+    assert data['inUse'] <= data['maxConnections']
+
+
+def test_get_response_cache_status():
+    """
+    Test ResponseCacheStatus.get()
+    """
+    response = requests.get(f'{BASE_URL}/api/status/response_cache')
+    assert response.status_code == 403
+
+    session = requests.Session()
+    session.get(f'{BASE_URL}/developer/login?user=admin12&email=admin12')
+    response = session.get(f'{BASE_URL}/api/status/response_cache')
+    data = json.loads(response.text)
+    assert set(data) == {'entries', 'size', 'maxSize', 'hits', 'misses'}
+    assert data['size'] <= data['maxSize']
+
+
 def test_get_countrylist():
     """
     Test CountryList.get()
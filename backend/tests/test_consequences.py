@@ -0,0 +1,238 @@
+"""
+Tests for consequences.py
+"""
+
+import pytest
+
+import consequences
+from modules.browser import lookups
+
+
+def test_add_consequence_to_variants():
+    """
+    Test add_consequence_to_variants()
+    """
+    variants = []
+    variants.append(lookups.get_variant('SweGen', 16252949, '22', 'T', 'G'))
+    variants.append(lookups.get_variant('SweGen', 16269934, '22', 'A', 'G'))
+
+    consequences.add_consequence_to_variants(variants)
+    assert variants[0]['major_consequence'] == 'downstream_gene_variant'
+    assert variants[1]['major_consequence'] == 'missense_variant'
+
+
+def test_add_consequence_to_variant():
+    """
+    Test add_consequence_to_variant()
+    """
+    variant = lookups.get_variant('SweGen', 16252949, '22', 'T', 'G')
+    consequences.add_consequence_to_variant(variant)
+    assert variant['major_consequence'] == 'downstream_gene_variant'
+
+    variant['vep_annotations'][0]['Consequence'] = "stop_gained"
+    consequences.add_consequence_to_variant(variant)
+    assert variant['category'] == 'lof_variant'
+    assert variant['major_consequence'] == 'stop_gained'
+
+    variant = lookups.get_variant('SweGen', 16269985, '22', 'C', 'G')
+    consequences.add_consequence_to_variant(variant)
+    assert variant['category'] == 'other_variant'
+    assert variant['major_consequence'] == 'intron_variant'
+
+    variant = lookups.get_variant('SweGen', 16277852, '22', 'C', 'T')
+    consequences.add_consequence_to_variant(variant)
+    assert variant['major_consequence'] == 'synonymous_variant'
+    assert variant['category'] == 'synonymous_variant'
+
+    variant = lookups.get_variant('SweGen', 16269934, '22', 'A', 'G')
+    consequences.add_consequence_to_variant(variant)
+    assert variant['category'] == 'missense_variant'
+    assert variant['major_consequence'] == 'missense_variant'
+
+    variant['vep_annotations'] = []
+    consequences.add_consequence_to_variant(variant)
+    assert variant['major_consequence'] == ''
+
+    # bad variant
+    variant = {}
+    consequences.add_consequence_to_variant(variant)
+    assert not variant
+
+
+def test_get_consequence_fields():
+    """
+    Test get_consequence_fields()
+    """
+    variant = lookups.get_variant('SweGen', 16269934, '22', 'A', 'G')
+    annotations = [dict(annotation) for annotation in variant['vep_annotations']]
+    res = consequences.get_consequence_fields(variant['vep_annotations'])
+    assert variant['vep_annotations'] == annotations
+    assert set(res) == set(consequences.CONSEQUENCE_FIELDS)
+    assert res['major_consequence'] == 'missense_variant'
+    assert res['category'] == 'missense_variant'
+    assert res['flags'] == []
+
+    consequences.add_consequence_to_variant(variant)
+    for column, key in consequences.CONSEQUENCE_FIELDS.items():
+        if key != 'flags':
+            assert res[column] == variant.get(key)
+
+    res = consequences.get_consequence_fields([])
+    assert res['major_consequence'] == ''
+    assert res['flags'] == []
+
+
+def test_annotation_severity():
+    """
+    Test annotation_severity()
+    """
+    variant = lookups.get_variant('SweGen', 16269934, '22', 'A', 'G')
+    res = consequences.annotation_severity(variant['vep_annotations'][0])
+    assert res == -26.9
+
+
+def test_data_structures():
+    """
+    Test the constants
+    """
+    assert len(consequences.CSQ_ORDER) == len(set(consequences.CSQ_ORDER))  # No duplicates
+    assert all(csq == consequences.REV_CSQ_ORDER_DICT[consequences.CSQ_ORDER_DICT[csq]]
+               for csq in consequences.CSQ_ORDER)
+
+
+def test_get_flags_from_variant():
+    """
+    Test get_flags_from_variant()
+    """
+    fake_variant = {'vep_annotations': [{'LoF': 'LC', 'LoF_flags': 'something'},
+                                        {'LoF': '', 'LoF_flags': ''},
+                                        {'LoF': 'LC', 'LoF_flags': 'something'}]}
+    flags = consequences.get_flags_from_variant(fake_variant)
+    assert flags == ['LC LoF', 'LoF flag']
+
+    fake_variant = {'vep_annotations': [{'LoF': 'LC', 'LoF_flags': 'something'},
+                                        {'LoF': 'HC', 'LoF_flags': 'something'}]}
+    flags = consequences.get_flags_from_variant(fake_variant)
+    assert flags == ['LoF', 'LoF flag']
+
+    fake_variant = {'mnps': 'no idea', 'vep_annotations': []}
+    flags = consequences.get_flags_from_variant(fake_variant)
+    assert flags == ['MNP']
+
+
+def test_get_proper_hgvs():
+    """
+    Test get_proper_hgvs()
+    """
+    annotation = {'HGVSc': 'ENST00000343518.6:c.35C>T',
+                  'HGVSp': 'ENSP00000340610.6:p.Ser12Phe',
+                  'major_consequence': 'splice_donor_variant'}
+    assert consequences.get_proper_hgvs(annotation) == 'c.35C>T'
+    annotation['major_consequence'] = 'coding_sequence_variant'
+    assert consequences.get_proper_hgvs(annotation) == 'p.Ser12Phe'
+    assert not consequences.get_proper_hgvs(dict())
+
+
+def test_get_protein_hgvs():
+    """
+    Test get_protein_hgvs()
+    """
+    annotation = {'HGVSc': 'ENST00000343518.6:c.35C>T',
+                  'HGVSp': 'ENSP00000340610.6:p.Ser12Phe'}
+    result = consequences.get_protein_hgvs(annotation)
+    assert result == 'p.Ser12Phe'
+    annotation = {'HGVSc': 'ENST00000343518.6:c.27G>A',
+                  'HGVSp': 'ENST00000343518.6:c.27G>A(p.%3D)',
+                  'Protein_position': '9',
+                  'Amino_acids': 'P'}
+    result = consequences.get_protein_hgvs(annotation)
+    assert result == 'p.Pro9Pro'
+    annotation['Amino_acids'] = 'Z'
+    assert not consequences.get_protein_hgvs(annotation)
+    assert not consequences.get_protein_hgvs(dict())
+
+
+def test_get_transcript_hgvs():
+    """
+    Test get_transcript_hgvs()
+
+    """
+    annotation = {'HGVSc': 'ENST00000343518.6:c.35C>T',
+                  'HGVSp': 'ENSP00000340610.6:p.Ser12Phe'}
+    assert consequences.get_transcript_hgvs(annotation) == 'c.35C>T'
+    assert not consequences.get_transcript_hgvs(dict())
+
+
+def test_worst_csq_from_csq():
+    """
+    Test worst_csq_from_csq()
+    """
+    variant = lookups.get_variant('SweGen', 16269941, '22', 'G', 'C')
+    res = consequences.worst_csq_from_csq(variant['vep_annotations'][0]['Consequence'])
+    assert res == 'splice_region_variant'
+    res = consequences.worst_csq_from_csq('non_coding_exon_variant&nc_transcript_variant')
+    assert res == 'non_coding_exon_variant'
+
+
+def test_worst_csq_from_list():
+    """
+    Test worst_csq_from_list()
+    """
+    csqs = ['frameshift_variant', 'missense_variant']
+    assert consequences.worst_csq_from_list(csqs) == 'frameshift_variant'
+
+
+def test_worst_csq_index():
+    """
+    Test worst_csq_index()
+    """
+    csqs = ['frameshift_variant', 'missense_variant']
+    assert consequences.worst_csq_index(csqs) == 4
+
+
+def test_worst_csq_index_from_csq():
+    """
+    Test worst_csq_index_from_csq()
+    """
+    assert consequences.worst_csq_index_from_csq('missense_variant&frameshift_variant') == 4
+    assert consequences.worst_csq_index_from_csq('missense_variant&frameshift_variant') == 4
+    assert consequences.worst_csq_index_from_csq('intron_variant') == \
+        consequences.CSQ_ORDER_DICT['intron_variant']
+    with pytest.raises(KeyError):
+        consequences.worst_csq_index_from_csq('not_a_consequence')
+    assert consequences.CSQ_STRING_RANKS['missense_variant&frameshift_variant'] == 4
+    assert 'not_a_consequence' not in consequences.CSQ_STRING_RANKS
+
+
+def test_rank_annotations():
+    """
+    Test rank_annotations()
+    """
+    veps = [{'Consequence': 'intron_variant&stop_lost'},
+            {'Consequence': 'upstream_gene_variant'}]
+    assert consequences.rank_annotations(veps) is veps
+    assert [ann['csq_rank'] for ann in veps] == [consequences.CSQ_ORDER_DICT['stop_lost'],
+                                                 consequences.CSQ_ORDER_DICT['upstream_gene_variant']]
+    assert consequences.rank_annotations([]) == []
+
+
+def test_worst_csq_with_vep():
+    """
+    Test worst_csq_from_vep()
+    """
+    veps = [{'SYMBOL': '1', 'Consequence': 'intergenic_variant', 'CANONICAL': ''},
+            {'SYMBOL': '2', 'Consequence': 'frameshift_variant', 'CANONICAL': ''},
+            {'SYMBOL': '3', 'Consequence': 'intron_variant', 'CANONICAL': ''},
+            {'SYMBOL': '4', 'Consequence': 'stop_lost', 'CANONICAL': ''}]
+    res = consequences.worst_csq_with_vep(veps)
+    assert res == {'SYMBOL': '2', 'Consequence': 'frameshift_variant',
+                   'CANONICAL': '', 'major_consequence': 'frameshift_variant'}
+
+    veps = [{'SYMBOL': '1', 'Consequence': 'frameshift_variant', 'CANONICAL': 'YES'},
+            {'SYMBOL': '2', 'Consequence': 'frameshift_variant', 'CANONICAL': ''},
+            {'SYMBOL': '3', 'Consequence': 'intron_variant', 'CANONICAL': ''},
+            {'SYMBOL': '4', 'Consequence': 'stop_lost', 'CANONICAL': ''}]
+    res = consequences.worst_csq_with_vep(veps)
+    assert res == {'SYMBOL': '1', 'Consequence': 'frameshift_variant',
+                   'CANONICAL': 'YES', 'major_consequence': 'frameshift_variant'}
+    assert not consequences.worst_csq_with_vep([])
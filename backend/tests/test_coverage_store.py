@@ -0,0 +1,59 @@
+"""
+Tests for the memory-mapped coverage files in coverage_store.py
+"""
+import pytest
+
+import coverage_store
+
+
+def _row(chrom, pos, mean):
+    return {'chrom': chrom, 'pos': pos, 'mean': mean, 'median': mean,
+            'coverage': [1.0, 0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.2]}
+
+
+def test_coverage_store(tmp_path):
+    """
+    Test CoverageWriter and CoverageStore
+    """
+    root = str(tmp_path)
+    store = coverage_store.CoverageStore(root)
+    assert not store.has_version(1)
+
+    with coverage_store.CoverageWriter(root, 1) as writer:
+        writer.add(_row('1', 100, 10.5))
+        writer.add(_row('1', 105, 11.5))
+        writer.flush()
+        writer.add(_row('1', 110, 12.5))
+        writer.add(_row('2', 50, 20.0))
+    assert store.has_version(1)
+
+    res = store.get_coverage(1, '1', 101, 110)
+    assert [row['pos'] for row in res] == [105, 110]
+    assert res[0] == {'id': None, 'dataset_version': 1, 'chrom': '1', 'pos': 105,
+                      'mean': 11.5, 'median': 11.5,
+                      'coverage': [1.0, 0.9, 0.8, 0.7, 0.6, 0.5, 0.4, 0.3, 0.2]}
+    assert store.get_coverage(1, '1', 111, 120) == []
+    assert store.get_coverage(1, 'X', 1, 120) == []
+    assert len(store.get_chromosome(1, '2')) == 1
+
+    # the region is a view of the mapped file
+    region = store.get_chromosome(1, '1').slice(100, 105)
+    assert isinstance(region['mean'], memoryview)
+    assert region['mean'].tolist() == [10.5, 11.5]
+
+    # a new import replaces the mapped files, and the replaced maps are closed
+    del region
+    old_maps = list(store.get_chromosome(1, '1')._maps)  # pylint: disable=protected-access
+    with coverage_store.CoverageWriter(root, 1) as writer:
+        writer.add(_row('1', 100, 1.0))
+    assert [row['mean'] for row in store.get_coverage(1, '1', 1, 200)] == [1.0]
+    assert old_maps and all(colmap.closed for colmap in old_maps)
+    assert store.get_coverage(1, '2', 1, 200) == []
+
+    # unsorted positions abort the import
+    with pytest.raises(ValueError):
+        with coverage_store.CoverageWriter(root, 1) as writer:
+            writer.add(_row('1', 100, 2.0))
+            writer.add(_row('1', 90, 2.0))
+    assert not (tmp_path / '1.partial').exists()
+    assert [row['mean'] for row in store.get_coverage(1, '1', 1, 200)] == [1.0]
@@ -0,0 +1,142 @@
+"""
+Tests for the helper functions in db.py
+"""
+from datetime import datetime, timedelta
+
+import db
+
+
+def test_dataset_version_cache():
+    """
+    Test DatasetVersionCache
+    """
+    cache = db.DatasetVersionCache(ttl=300)
+    assert cache.get('SweGen') is None
+    cache.set('SweGen', None, 'current')
+    cache.set('SweGen', '20161223', 'pinned')
+    cache.set('Dataset 1', None, 'other')
+    assert cache.get('SweGen') == 'current'
+    assert cache.get('SweGen', '20161223') == 'pinned'
+
+    cache.invalidate('SweGen')
+    assert cache.get('SweGen') is None
+    assert cache.get('SweGen', '20161223') is None
+    assert cache.get('Dataset 1') == 'other'
+
+    cache.invalidate()
+    assert cache.get('Dataset 1') is None
+
+    # a changed stamp drops all entries
+    cache.validate('stamp')
+    cache.set('SweGen', None, 'current')
+    cache.validate('stamp')
+    assert cache.get('SweGen') == 'current'
+    cache.validate('new stamp')
+    assert cache.get('SweGen') is None
+
+    # copies are returned
+    cache.set('SweGen', None, ['current'])
+    cache.get('SweGen').append('modified')
+    assert cache.get('SweGen') == ['current']
+
+    # next release before the ttl
+    cache.set('SweGen', None, 'current', datetime.now() - timedelta(seconds=1))
+    assert cache.get('SweGen') is None
+    cache.set('SweGen', None, 'current', datetime.now() + timedelta(hours=1))
+    assert cache.get('SweGen') == 'current'
+
+    # expired ttl
+    cache = db.DatasetVersionCache(ttl=0)
+    cache.set('SweGen', None, 'current')
+    assert cache.get('SweGen') is None
+
+
+def test_get_dataset_version():
+    """
+    Test get_dataset_version()
+    """
+    db.DATASET_VERSION_CACHE.invalidate()
+    dataset_version = db.get_dataset_version('SweGen')
+    assert dataset_version.dataset.short_name == 'SweGen'
+    assert db.get_dataset_version('SweGen') is not dataset_version
+    assert db.get_dataset_version('SweGen').id == dataset_version.id
+    dataset_version.num_variants = -1
+    assert db.get_dataset_version('SweGen').num_variants != -1
+
+    # changes to the dataset tables are seen without invalidating the cache
+    with db.database.atomic() as transaction:
+        (db.DatasetVersion.update(ref_doi='changed')
+         .where(db.DatasetVersion.id == dataset_version.id)
+         .execute())
+        assert db.get_dataset_version('SweGen').ref_doi == 'changed'
+        transaction.rollback()
+    assert db.get_dataset_version('SweGen').ref_doi == dataset_version.ref_doi
+
+    assert db.get_dataset_version('BAD_DATASET') is None
+    assert db.get_dataset_version('SweGen', 'BAD_VERSION') is None
+
+
+def test_request_cached():
+    """
+    Test LookupCache and request_cached()
+    """
+    calls = []
+
+    @db.request_cached(queries=2)
+    def lookup(item, version=None):
+        calls.append((item, version))
+        return {'item': item, 'values': [version]}
+
+    # no active cache
+    lookup('a')
+    lookup('a')
+    assert len(calls) == 2
+
+    cache = db.LookupCache()
+    token = db.REQUEST_LOOKUP_CACHE.set(cache)
+    try:
+        calls.clear()
+        first = lookup('a')
+        first['values'].append('modified')
+        assert lookup('a') == {'item': 'a', 'values': [None]}
+        assert lookup(item='a', version=None) == {'item': 'a', 'values': [None]}
+        lookup('a', '1')
+        assert calls == [('a', None), ('a', '1')]
+        assert cache.hits == 2
+        assert cache.misses == 2
+        assert cache.saved_queries == 4
+    finally:
+        db.REQUEST_LOOKUP_CACHE.reset(token)
+
+
+def test_region_bins():
+    """
+    Test region_bins() against the bins calculated in the database
+    """
+    regions = [(1, 1), (131071, 131072), (1048575, 1048576), (8388607, 8388608),
+               (67108863, 67108864), (46615715, 46615880), (25595800, 25615800)]
+    for start, stop in regions:
+        region_bin = (db.Gene.select(db.region_bin(start, stop).alias('bin'))
+                      .limit(1).dicts().get())['bin']
+        assert region_bin in db.region_bins(start, stop)
+        # any region overlapping the first base
+        assert region_bin in db.region_bins(start, start)
+        # any region overlapping the last base
+        assert region_bin in db.region_bins(stop, stop + 100000)
+    assert db.region_bins(1, 1) == [0, 1, 9, 73, 585]
+
+
+def test_build_coverage_summaries():
+    """
+    Test build_coverage_summaries()
+    """
+    db.build_coverage_summaries(4)
+    summaries = (db.CoverageSummary.select()
+                 .where(db.CoverageSummary.dataset_version == 4))
+    counts = {res: summaries.where(db.CoverageSummary.resolution == res).count()
+              for res in db.COVERAGE_RESOLUTIONS}
+    assert counts == {10: 504, 100: 54, 1000: 8}
+    summary = summaries.where((db.CoverageSummary.resolution == 1000) &
+                              (db.CoverageSummary.pos == 46546000)).get()
+    assert (summary.mean_min, summary.mean_max) == (20.79, 32.38)
+    assert (summary.cov20_min, summary.cov20_max) == (0.462, 0.951)
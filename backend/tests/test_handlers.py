@@ -0,0 +1,88 @@
+"""
+Tests for the helper classes in handlers.py
+"""
+import asyncio
+import threading
+
+import handlers
+
+
+def test_response_cache():
+    """
+    Test ResponseCache
+    """
+    cache = handlers.ResponseCache(max_size=10)
+    assert cache.get(('a',)) is None
+    cache.set(('a',), b'1234', '"a"', 'text/plain')
+    cache.set(('b',), b'1234', '"b"', 'text/plain')
+    assert cache.get(('a',)) == (b'1234', '"a"', 'text/plain')
+
+    # b is the least recently used
+    cache.set(('c',), b'1234', '"c"', 'text/plain')
+    assert cache.get(('b',)) is None
+    assert cache.get(('a',))
+    assert cache.get(('c',))
+    assert cache.stats() == {'entries': 2, 'size': 8, 'max_size': 10, 'hits': 3, 'misses': 2}
+
+    # replacing an entry
+    cache.set(('a',), b'12', '"a2"', 'text/plain')
+    assert cache.stats()['size'] == 6
+
+    # too large for the cache
+    cache.set(('d',), b'12345678901', '"d"', 'text/plain')
+    assert cache.get(('d',)) is None
+
+    cache.invalidate()
+    assert cache.get(('a',)) is None
+    assert cache.stats()['size'] == 0
+
+    # disabled
+    cache = handlers.ResponseCache(max_size=0)
+    cache.set(('a',), b'1', '"a"', 'text/plain')
+    assert cache.get(('a',)) is None
+
+
+def test_stream_query():
+    """
+    Test BaseHandler.stream_query()
+    """
+    threads = set()
+
+    def produce(count):
+        for value in range(count):
+            threads.add(threading.current_thread().name)
+            yield value
+
+    async def consume():
+        return [value async for value in
+                handlers.BaseHandler.stream_query(None, produce, 10, buffer_size=2)]
+
+    assert asyncio.run(consume()) == list(range(10))
+    # streams do not use the threads of the browser queries
+    assert threads and all(name.startswith('db-stream') for name in threads)
+
+
+def test_hump_back_key():
+    """
+    Test hump_back_key()
+    """
+    assert handlers.hump_back_key('allele_freq') == 'alleleFreq'
+    assert handlers.hump_back_key('Allele_freq') == 'AlleleFreq'
+    assert handlers.hump_back_key('pos') == 'pos'
+
+
+def test_convert_keys_to_hump_back():
+    """
+    Test _convert_keys_to_hump_back()
+    """
+    chunk = {'variant_id': '22-1-A-G',
+             'pop_freq': {'data_sets': [{'allele_count': 1}, {'allele_count': None}]},
+             'flags': ['LoF', 'MNP'],
+             'pos_list': [1, 2.5, True],
+             'exon_pair': ({'not_converted': 1},)}
+    assert handlers._convert_keys_to_hump_back(chunk) == {  # pylint: disable=protected-access
+        'variantId': '22-1-A-G',
+        'popFreq': {'dataSets': [{'alleleCount': 1}, {'alleleCount': None}]},
+        'flags': ['LoF', 'MNP'],
+        'posList': [1, 2.5, True],
+        'exonPair': ({'not_converted': 1},)}
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Time the consequence computation for the variants of a large (synthetic) gene.
+
+Run with the backend on the path, e.g.:
+
+    PYTHONPATH=backend scripts/benchmark_consequence.py --variants 50000
+"""
+import argparse
+import copy
+import random
+import time
+
+import consequences
+
+# consequences seen in the annotations of the test data, roughly by frequency
+CONSEQUENCES = (['intron_variant'] * 20 +
+                ['downstream_gene_variant'] * 10 +
+                ['upstream_gene_variant'] * 10 +
+                ['non_coding_transcript_variant&intron_variant',
+                 'intron_variant&non_coding_transcript_variant',
+                 'non_coding_transcript_exon_variant&non_coding_transcript_variant',
+                 '3_prime_UTR_variant',
+                 '5_prime_UTR_variant',
+                 'synonymous_variant',
+                 'missense_variant',
+                 'splice_region_variant&intron_variant',
+                 'stop_gained',
+                 'frameshift_variant'])
+
+
+def make_variants(count: int, annotations: int, seed: int) -> list:
+    """
+    Generate variants with random VEP annotations.
+
+    Args:
+        count (int): number of variants
+        annotations (int): number of annotations per variant
+        seed (int): random seed
+
+    Returns:
+        list: variants (dict with vep_annotations)
+
+    """
+    rng = random.Random(seed)
+    variants = []
+    for i in range(count):
+        variant = {'variant_id': f'22-{i}-A-G', 'vep_annotations': []}
+        for j in range(annotations):
+            csq = rng.choice(CONSEQUENCES)
+            variant['vep_annotations'].append({
+                'Consequence': csq,
+                'CANONICAL': 'YES' if j == 0 else '',
+                'LoF': 'HC' if csq in ('stop_gained', 'frameshift_variant') else '',
+                'LoF_filter': '',
+                'LoF_flags': '',
+                'HGVSc': f'ENST00000{j}.1:c.{i}A>G',
+                'HGVSp': '',
+            })
+        variants.append(variant)
+    return variants
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--variants', type=int, default=50000, help='Number of variants')
+    parser.add_argument('--annotations', type=int, default=8,
+                        help='Number of VEP annotations per variant')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    template = make_variants(args.variants, args.annotations, args.seed)
+    best = None
+    for _ in range(args.repeat):
+        # add_consequence_to_variants changes the variants in place
+        batch = copy.deepcopy(template)
+        start = time.perf_counter()
+        consequences.add_consequence_to_variants(batch)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f'{args.variants} variants, {args.annotations} annotations each: '
+          f'{best*1000:.1f} ms (best of {args.repeat})')
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Compare coverage lookups from the database with the memory-mapped coverage files.
+
+Run with the backend on the path, e.g.:
+
+    PYTHONPATH=backend scripts/benchmark_coverage.py --dataset SweGen --chrom 22 \\
+        --start 46546423 --stop 46646423 --coverage_dir /tmp/coverage --export
+"""
+import time
+
+import db
+from coverage_store import CoverageStore, CoverageWriter
+from modules.browser import lookups
+
+from benchmark_utils import dataset_parser
+
+
+def export_coverage(dataset_version, coverage_dir):
+    """Write the coverage of a dataset version from the database to coverage files."""
+    rows = (db.Coverage.select()
+            .where(db.Coverage.dataset_version == dataset_version.id)
+            .order_by(db.Coverage.chrom, db.Coverage.pos)
+            .dicts()
+            .iterator())
+    with CoverageWriter(coverage_dir, dataset_version.id) as writer:
+        for i, row in enumerate(rows, 1):
+            writer.add(row)
+            if not i % 100000:
+                writer.flush()
+
+
+def time_lookup(options):
+    """Run get_coverage_for_bases repeatedly and return the best time and the row count."""
+    best = None
+    for _ in range(options.repeat):
+        start = time.perf_counter()
+        coverage = lookups.get_coverage_for_bases(options.dataset, options.chrom,
+                                                  options.start, options.stop, options.version)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(coverage)
+
+
+if __name__ == '__main__':
+    parser = dataset_parser(__doc__)
+    parser.add_argument('--chrom', required=True, help='Chromosome')
+    parser.add_argument('--start', type=int, required=True, help='First position')
+    parser.add_argument('--stop', type=int, required=True, help='Last position')
+    parser.add_argument('--coverage_dir', required=True, help='Coverage file directory')
+    parser.add_argument('--export', action='store_true',
+                        help='Write the coverage files from the database first')
+    parser.add_argument('--repeat', type=int, default=10, help='Number of lookups per backend')
+    args = parser.parse_args()
+
+    ds_version = db.get_dataset_version(args.dataset, args.version)
+    if args.export:
+        export_coverage(ds_version, args.coverage_dir)
+
+    lookups.COVERAGE_STORE = None
+    db_time, db_rows = time_lookup(args)
+    lookups.COVERAGE_STORE = CoverageStore(args.coverage_dir)
+    if not lookups.COVERAGE_STORE.has_version(ds_version.id):
+        parser.error(f'No coverage files for dataset version {ds_version.id}; use --export')
+    mmap_time, mmap_rows = time_lookup(args)
+
+    print(f'postgres: {db_rows} rows in {db_time*1000:.2f} ms (best of {args.repeat})')
+    print(f'mmap:     {mmap_rows} rows in {mmap_time*1000:.2f} ms (best of {args.repeat})')
+    print(f'speedup:  {db_time/mmap_time:.1f}x')
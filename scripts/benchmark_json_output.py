@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Time the JSON output of a GetVariants response (key conversion and encoding).
+
+Run with the backend on the path, e.g.:
+
+    PYTHONPATH=backend scripts/benchmark_json_output.py --dataset SweGen \\
+        --datatype gene --item ENSG00000198062 --copies 20
+"""
+import time
+
+from tornado.escape import json_encode
+
+import handlers
+from modules.browser import utils
+
+from benchmark_utils import dataset_parser
+
+
+def time_output(payload: dict, repeat: int) -> tuple:
+    """
+    Convert and encode a response repeatedly.
+
+    Args:
+        payload (dict): the response
+        repeat (int): number of runs
+
+    Returns:
+        tuple: best times (s) for the key conversion and for conversion and encoding
+
+    """
+    best_convert = best_total = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        converted = handlers._convert_keys_to_hump_back(payload)  # pylint: disable=protected-access
+        convert = time.perf_counter() - start
+        json_encode(converted)
+        total = time.perf_counter() - start
+        best_convert = convert if best_convert is None else min(best_convert, convert)
+        best_total = total if best_total is None else min(best_total, total)
+    return best_convert, best_total
+
+
+if __name__ == '__main__':
+    parser = dataset_parser(__doc__)
+    parser.add_argument('--datatype', default='gene', help='gene, region or transcript')
+    parser.add_argument('--item', required=True, help='Gene, region or transcript to list')
+    parser.add_argument('--copies', type=int, default=1,
+                        help='Repeat the variant list to get a larger payload')
+    parser.add_argument('--repeat', type=int, default=5, help='Number of runs')
+    args = parser.parse_args()
+
+    response = utils.get_variant_list(args.dataset, args.datatype, args.item, args.version)
+    response['variants'] = list(response['variants']) * args.copies
+
+    convert_time, total_time = time_output(response, args.repeat)
+    print(f'{len(response["variants"])} variants (best of {args.repeat}): '
+          f'conversion {convert_time*1000:.1f} ms, '
+          f'conversion and encoding {total_time*1000:.1f} ms')
@@ -0,0 +1,20 @@
+"""Helpers shared by the benchmark scripts."""
+import argparse
+
+
+def dataset_parser(description: str) -> argparse.ArgumentParser:
+    """
+    Create an argument parser with the options selecting a dataset version.
+
+    Args:
+        description (str): description of the benchmark, usually its docstring
+
+    Returns:
+        argparse.ArgumentParser: parser with the --dataset and --version options
+
+    """
+    parser = argparse.ArgumentParser(description=description,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dataset', required=True, help='Dataset short name')
+    parser.add_argument('--version', default=None, help='Dataset version (default: current)')
+    return parser
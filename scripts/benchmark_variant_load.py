@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Compare loading variants and coverage with batched INSERTs and with COPY.
+
+Synthetic rows are loaded into a dataset version, batch_size rows at a time,
+inside transactions that are rolled back, so nothing is kept in the database.
+
+Run with the backend and the importer on the path, e.g.:
+
+    PYTHONPATH=backend:scripts/importer scripts/benchmark_variant_load.py \\
+        --dataset SweGen --rows 50000 --batch_size 5000
+"""
+import random
+import time
+
+import db
+from consequences import get_consequence_fields
+from data_importer.copy_loader import copy_rows
+
+from benchmark_utils import dataset_parser
+
+CONSEQUENCES = ['intron_variant', 'downstream_gene_variant', 'upstream_gene_variant',
+                '3_prime_UTR_variant', 'synonymous_variant', 'missense_variant', 'stop_gained']
+
+
+def make_variants(dataset_version_id: int, count: int, seed: int) -> list:
+    """
+    Generate variants with VEP annotations, as parsed by the importer.
+
+    Args:
+        dataset_version_id (int): id of the dataset version
+        count (int): number of variants
+        seed (int): random seed
+
+    Returns:
+        list: variants (dict)
+
+    """
+    rng = random.Random(seed)
+    variants = []
+    for i in range(count):
+        annotations = [{'Allele': 'G',
+                        'ALLELE_NUM': '1',
+                        'Consequence': rng.choice(CONSEQUENCES),
+                        'Gene': f'ENSG{j:011}',
+                        'Feature': f'ENST{j:011}',
+                        'CANONICAL': 'YES' if j == 0 else '',
+                        'HGVSc': f'ENST{j:011}.1:c.{i}A>G',
+                        'HGVSp': '',
+                        'LoF': '',
+                        'LoF_filter': '',
+                        'LoF_flags': ''}
+                       for j in range(rng.randint(0, 6))]
+        variant = {'dataset_version': dataset_version_id,
+                   'chrom': '22',
+                   'pos': 16000000 + i,
+                   'rsid': rng.choice([None, rng.randint(1, 10**8)]),
+                   'ref': 'A',
+                   'alt': 'G',
+                   'site_quality': rng.uniform(0, 10**6),
+                   'filter_string': 'PASS',
+                   'orig_alt_alleles': [f'22-{16000000 + i}-A-G'],
+                   'hom_count': rng.randint(0, 1000),
+                   'allele_num': 2000,
+                   'allele_count': rng.randint(1, 2000),
+                   'allele_freq': rng.random(),
+                   'variant_id': f'22-{16000000 + i}-A-G',
+                   'quality_metrics': {'DP': str(rng.randint(1, 10**5)),
+                                       'MQ': f'{rng.uniform(0, 60):.2f}',
+                                       'VQSLOD': f'{rng.uniform(-30, 30):.3f}'},
+                   'vep_annotations': annotations}
+        variant.update(get_consequence_fields(annotations))
+        variants.append(variant)
+    return variants
+
+
+def make_coverage(dataset_version_id: int, count: int, seed: int) -> list:
+    """
+    Generate coverage rows, as parsed by the importer.
+
+    Args:
+        dataset_version_id (int): id of the dataset version
+        count (int): number of positions
+        seed (int): random seed
+
+    Returns:
+        list: coverage (dict)
+
+    """
+    rng = random.Random(seed)
+    return [{'dataset_version': dataset_version_id,
+             'chrom': '22',
+             'pos': 16000000 + i,
+             'mean': rng.uniform(0, 60),
+             'median': rng.uniform(0, 60),
+             'coverage': sorted((rng.random() for _ in range(9)), reverse=True)}
+            for i in range(count)]
+
+
+def insert_rows(model, rows: list):
+    """Insert rows the way the importer does without --copy."""
+    model.insert_many(rows).execute()
+
+
+def time_load(load, model, rows: list, batch_size: int) -> float:
+    """
+    Load rows in batches within a transaction that is rolled back.
+
+    Args:
+        load (function): (model, rows) -> None
+        model: the peewee model of the table
+        rows (list): the rows
+        batch_size (int): rows per load call
+
+    Returns:
+        float: time (s) spent loading
+
+    """
+    with db.database.atomic() as transaction:
+        start = time.perf_counter()
+        for i in range(0, len(rows), batch_size):
+            load(model, rows[i:i + batch_size])
+        elapsed = time.perf_counter() - start
+        transaction.rollback()
+    return elapsed
+
+
+if __name__ == '__main__':
+    parser = dataset_parser(__doc__)
+    parser.add_argument('--rows', type=int, default=50000, help='Number of rows per table')
+    parser.add_argument('--batch_size', type=int, default=5000, help='Rows per INSERT or COPY')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of runs')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    ds_version = db.get_dataset_version(args.dataset, args.version)
+    tables = ((db.Variant, make_variants(ds_version.id, args.rows, args.seed)),
+              (db.Coverage, make_coverage(ds_version.id, args.rows, args.seed)))
+    for table, data in tables:
+        for name, loader in (('insert_many', insert_rows), ('copy', copy_rows)):
+            best = min(time_load(loader, table, data, args.batch_size)
+                       for _ in range(args.repeat))
+            print(f'{table._meta.table_name:10} {name:12} '  # pylint: disable=protected-access
+                  f'{args.rows/best:10,.0f} rows/s (best of {args.repeat})')
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Bulk load rows into PostgreSQL with COPY.
+
+The rows are dicts keyed by field name, as for insert_many, and are written
+in the COPY text format. JSON fields are serialised with json.dumps and array
+fields are written as array literals, so the columns get the same values as
+when the rows are inserted through peewee. Since COPY cannot return the ids
+of the new rows, ids can be reserved from the sequence of the table first.
+"""
+
+import io
+import json
+
+from playhouse.postgres_ext import ArrayField, JSONField
+
+NULL = r'\N'
+
+# characters that must be escaped in a column of the COPY text format
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def copy_rows(model, rows: list) -> int:
+    """
+    Load rows into the table of a model with COPY.
+
+    The columns are taken from the keys of the first row; a row missing
+    one of them gets NULL in that column.
+
+    Args:
+        model: the peewee model of the table
+        rows (list): the rows (dict with field names as keys)
+
+    Returns:
+        int: number of loaded rows
+
+    """
+    if not rows:
+        return 0
+    fields = [model._meta.fields[name] for name in rows[0]]  # pylint: disable=protected-access
+    encoders = [_get_encoder(field) for field in fields]
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(encode(row.get(field.name))
+                               for field, encode in zip(fields, encoders)))
+        buffer.write('\n')
+    buffer.seek(0)
+
+    columns = ', '.join(_quote(field.column_name) for field in fields)
+    cursor = model._meta.database.cursor()  # pylint: disable=protected-access
+    cursor.copy_expert(f'COPY {_table_name(model)} ({columns}) FROM STDIN', buffer)
+    return len(rows)
+
+
+def reserve_ids(model, count: int) -> list:
+    """
+    Reserve ids for new rows from the id sequence of the table of a model.
+
+    The ids are not used by any other insert, also not by concurrent ones.
+
+    Args:
+        model: the peewee model of the table
+        count (int): number of ids
+
+    Returns:
+        list: the ids (int), in the order they were taken from the sequence
+
+    """
+    if not count:
+        return []
+    cursor = model._meta.database.execute_sql(  # pylint: disable=protected-access
+        'SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)',
+        (_table_name(model), model._meta.primary_key.column_name, count))  # pylint: disable=protected-access
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _get_encoder(field):
+    """
+    Get the function writing values of a field as a column of the COPY text format.
+
+    Args:
+        field: the peewee field
+
+    Returns:
+        function: value -> escaped text or NULL
+
+    """
+    if isinstance(field, JSONField):
+        return lambda value: NULL if value is None else json.dumps(value).translate(_COPY_ESCAPES)
+
+    def encode(value):
+        value = field.db_value(value) if value is not None else None
+        if value is None:
+            return NULL
+        if isinstance(field, ArrayField):
+            return _array_literal(value).translate(_COPY_ESCAPES)
+        if isinstance(value, bool):
+            return 't' if value else 'f'
+        return str(value).translate(_COPY_ESCAPES)
+    return encode
+
+
+def _array_literal(values) -> str:
+    """
+    Write a list as a PostgreSQL array literal, e.g. {"a","b",NULL}.
+
+    Args:
+        values (list): the elements, possibly nested lists
+
+    Returns:
+        str: the array literal
+
+    """
+    elements = []
+    for value in values:
+        if value is None:
+            elements.append('NULL')
+        elif isinstance(value, (list, tuple)):
+            elements.append(_array_literal(value))
+        elif isinstance(value, bool):
+            elements.append('t' if value else 'f')
+        else:
+            text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+            elements.append(f'"{text}"')
+    return '{' + ','.join(elements) + '}'
+
+
+def _quote(name: str) -> str:
+    """Quote an SQL identifier."""
+    return '"{}"'.format(name.replace('"', '""'))
+
+
+def _table_name(model) -> str:
+    """Get the schema-qualified, quoted table name of a model."""
+    meta = model._meta  # pylint: disable=protected-access
+    if meta.schema:
+        return f'{_quote(meta.schema)}.{_quote(meta.table_name)}'
+    return _quote(meta.table_name)
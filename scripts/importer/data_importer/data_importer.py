@@ -6,6 +6,7 @@ Baseclass for the data importers
 import os
 import sys
 import gzip
+import collections
 import time
 import logging
 import urllib.request
@@ -25,6 +26,7 @@ class DataImporter():
         self.batch_size = settings.batch_size
         self.progress_bar = not settings.disable_progress
         self.in_file = None
+        self.read_progress = {'handle': None, 'filename': None, 'read': 0, 'total': 0}
 
     def _connect(self, host, user, passwd, database):  # pylint: disable=no-self-use
         try:
@@ -98,6 +100,116 @@ class DataImporter():
         except IOError as error:
             logging.error("IOERROR: {}".format(error))
 
+    def _read_files(self, filenames, binary=True):
+        """
+        Read the lines of files, keeping track of the position for progress bars.
+
+        The position is taken in the underlying (compressed) files, so the
+        progress is known without a separate pass counting the lines. The
+        name of the file being read is kept in read_progress['filename'].
+        """
+        sizes = [os.path.getsize(filename) for filename in filenames]
+        self.read_progress = {'handle': None, 'filename': None, 'read': 0, 'total': sum(sizes)}
+        for filename, size in zip(filenames, sizes):
+            with self._open(filename, binary) as handle:
+                self.read_progress['handle'] = handle
+                self.read_progress['filename'] = filename
+                yield from handle
+            self.read_progress['handle'] = None
+            self.read_progress['read'] += size
+
+    def _read_chunks(self, filenames: list, checkpoints: list, read_header=None):  # pylint: disable=too-many-locals
+        """
+        Read the data lines of files in chunks.
+
+        The chunks have at least commit_interval, or batch_size, lines. A
+        chunk only ends where the position (the first two columns) changes,
+        so all rows of a position, and thereby its calls, are in the same
+        chunk, or where a file ends. The lines of the checkpoints are given
+        in chunks of their own, marked as committed.
+
+        Args:
+            filenames (list): the files
+            checkpoints (list): committed chunks (dict with file_name, start_line and end_line)
+            read_header (function): called with each header line
+
+        Yields:
+            dict: file_name, start_line, end_line, lines (str) and whether they are committed
+        """
+        chunk_size = self.settings.commit_interval or self.settings.batch_size
+        committed = collections.defaultdict(list)
+        for checkpoint in checkpoints:
+            committed[checkpoint['file_name']].append((checkpoint['start_line'],
+                                                       checkpoint['end_line']))
+        chunk = {}
+        filename = None
+        for line in self._read_files(filenames, binary=False):
+            if self.read_progress['filename'] != filename:
+                if chunk:
+                    yield chunk
+                    chunk = {}
+                filename = self.read_progress['filename']
+                ranges = iter(sorted(committed[filename]))
+                committed_range = next(ranges, None)
+                line_number = -1
+            line_number += 1
+
+            line = line.strip()
+            if line.startswith("#"):
+                if read_header:
+                    read_header(line)
+                continue
+
+            while committed_range and committed_range[1] <= line_number:
+                committed_range = next(ranges, None)
+            is_committed = bool(committed_range) and committed_range[0] <= line_number
+
+            if chunk and (chunk['committed'] != is_committed or
+                          (len(chunk['lines']) >= chunk_size and
+                           line.split('\t', 2)[:2] != chunk['lines'][-1].split('\t', 2)[:2])):
+                yield chunk
+                chunk = {}
+            if not chunk:
+                chunk = {'file_name': filename,
+                         'start_line': line_number,
+                         'lines': [],
+                         'committed': is_committed}
+            chunk['lines'].append(line)
+            chunk['end_line'] = line_number + 1
+        if chunk:
+            yield chunk
+
+    def _get_read_progress(self):
+        """
+        Return the fraction of the files given to _read_files that has been read.
+        """
+        position = self.read_progress['read']
+        if self.read_progress['handle'] is not None:
+            position += self._file_position(self.read_progress['handle'])
+        if not self.read_progress['total']:
+            return 1.0
+        return min(position/self.read_progress['total'], 1.0)
+
+    @staticmethod
+    def _file_position(handle):
+        """
+        Return the position in the underlying file of a handle returned by _open.
+
+        For gzipped files this is the position in the compressed file.
+        """
+        raw = getattr(handle, 'buffer', handle)
+        raw = getattr(raw, 'fileobj', raw)
+        return raw.tell()
+
+    @staticmethod
+    def _file_size(handle):
+        """
+        Return the size of the underlying file of a handle returned by _open.
+        """
+        raw = getattr(handle, 'buffer', handle)
+        raw = getattr(raw, 'fileobj', raw)
+        return os.fstat(raw.fileno()).st_size
+
     def _time_format(self, seconds):  # pylint: disable=no-self-use
         hour, rem = divmod(seconds, 3600)
         mins, secs = divmod(rem, 60)
@@ -115,7 +227,14 @@ class DataImporter():
     def _time_to(self, start, progress=0.01):
         return self._time_format((time.time() - start)/progress)
 
-    def _update_progress_bar(self, current_count, total, last_progress, finished=False):  # pylint: disable=no-self-use
+    def _update_progress_bar(self, current_count, total, last_progress,  # pylint: disable=too-many-arguments
+                             finished=False, start=None):
+        """
+        Extend the progress bar to current_count/total.
+
+        If start (the time the work started) is given, the estimated time
+        left is shown after the bar on terminals.
+        """
         if not finished:
             progress = current_count/total
         else:
@@ -125,10 +244,22 @@ class DataImporter():
                 sys.stderr.write("".join(["{:<10}".format(i) for i in range(0, 101, 10)]) + "\n")
                 sys.stderr.write("| ------- "*10 + "|\n")
             last_progress = 0
+        extended = False
         while progress > last_progress + 0.01:
             last_progress += 0.01
             sys.stderr.write("=")
             sys.stderr.flush()
+            extended = True
+        if start is not None and sys.stderr.isatty():
+            if finished:
+                # clear the estimate
+                sys.stderr.write("\033[K")
+            elif extended:
+                # written after the bar, with the cursor moved back to be overwritten by it
+                time_left = " {} left".format(self._time_format((time.time() - start) *
+                                                                 (1 - progress)/progress))
+                sys.stderr.write(time_left + "\033[K" + "\b"*len(time_left))
+                sys.stderr.flush()
         if finished:
             sys.stderr.write("\n")
         return last_progress
@@ -1,12 +1,20 @@
 #!/usr/bin/env python3
 """Read data from a vcf file and add the variants to a database."""
 
+import collections
+import logging
+import multiprocessing
 import re
 import sys
 import time
-import logging
+
+from peewee import Value, ValuesList
+from playhouse.postgres_ext import ServerSide
 
 import db
+from consequences import CONSEQUENCE_FIELDS, get_consequence_fields
+from coverage_store import COVERAGE_LEVELS, CoverageWriter
+from .copy_loader import copy_rows, reserve_ids
 from .data_importer import DataImporter
 
 METRICS = [
@@ -22,6 +30,17 @@ METRICS = [
     'VQSLOD'
 ]
 
+# (title, converter) for the columns of a coverage file
+COVERAGE_HEADERS = [('chrom', str), ('pos', int), ('mean', float), ('median', float)] + \
+                   [(level, float) for level in COVERAGE_LEVELS]
+
+# (title, converter) for the fixed columns of a VCF data line
+VARIANT_HEADERS = [("chrom", str), ("pos", int), ("rsid", str), ("ref", str),
+                   ("alt", str), ("site_quality", float), ("filter_string", str)]
+
+# importer of a worker process used for parallel variant imports
+_WORKER_IMPORTER = None
+
 
 class RawDataImporter(DataImporter):
     """Read data from a vcf file and add the variants to a database."""
@@ -39,6 +58,7 @@ class RawDataImporter(DataImporter):
                         'tmp_calls': set()}
         self.lastpos = 0
         self.chrom = None
+        self.references = None
 
     def _set_dataset_info(self):
         """Save dataset information given as parameters."""
@@ -119,7 +139,13 @@ class RawDataImporter(DataImporter):
         logging.info(f"Dataset counts: callcount: {datarow['callcount']}, " +
                      f"variantcount: {datarow['variantcount']}")
         if not self.settings.dry_run:
-            db.BeaconCounts.insert(datarow).execute()
+            with db.database.atomic():
+                if self.settings.resume:
+                    # the counts may have been saved before the import was interrupted
+                    (db.BeaconCounts.delete()
+                     .where(db.BeaconCounts.datasetid == datasetid)
+                     .execute())
+                db.BeaconCounts.insert(datarow).execute()
 
     def _insert_coverage(self):
         """
@@ -127,60 +153,85 @@ class RawDataImporter(DataImporter):
 
         Header columns are chromosome, position, mean coverage, median coverage,
         and then coverage under 1, 5 10, 15, 20, 25, 30, 50, 100.
+
+        If a coverage directory is given, the coverage is also written as
+        memory-mapped column files for the browser. The binned summaries
+        used for zoomed-out views are built once all coverage is inserted.
+
+        With a commit interval, chunks of coverage are committed separately
+        and recorded as checkpoints, and the chunks committed by an
+        interrupted import are skipped when it is resumed.
         """
         start = time.time()
-        header = [('chrom', str), ('pos', int), ('mean', float),
-                  ('median', float), ('cov1', float), ('cov5', float),
-                  ('cov10', float), ('cov15', float), ('cov20', float), ('cov25', float),
-                  ('cov30', float), ('cov50', float), ('cov100', float)]
         logging.info("Inserting Coverage")
-        batch = []
-        last_progress = -1.0
-        counter = 0
-        with db.database.atomic():
-            for filename in self.settings.coverage_file:
-                for line in self._open(filename, binary=False):
-                    line = line.strip()
-                    if line.startswith("#"):
-                        continue
-
-                    data = self._parse_baseinfo(header, line)
-
-                    # re-format coverage for batch
-                    data['coverage'] = [data['cov1'], data['cov5'], data['cov10'],
-                                        data['cov15'], data['cov20'], data['cov25'],
-                                        data['cov30'], data['cov50'], data['cov100']]
-                    del data['cov1']
-                    del data['cov5']
-                    del data['cov10']
-                    del data['cov15']
-                    del data['cov20']
-                    del data['cov25']
-                    del data['cov30']
-                    del data['cov50']
-                    del data['cov100']
-
-                    if self.counter['coverage'] is not None:
-                        counter += 1
-
-                    batch += [data]
-                    if len(batch) >= self.settings.batch_size:
-                        if not self.settings.dry_run:
-                            db.Coverage.insert_many(batch).execute()
-                        batch = []
-                        # Update progress
-                        if self.counter['coverage'] is not None:
-                            last_progress = self._update_progress_bar(counter,
-                                                                      self.counter['coverage'],
-                                                                      last_progress)
-            if batch and not self.settings.dry_run:
-                db.Coverage.insert_many(batch).execute()
-        if self.counter['coverage'] is not None:
-            last_progress = self._update_progress_bar(counter,
-                                                      self.counter['coverage'],
-                                                      last_progress,
-                                                      finished=True)
+        checkpoints = self._get_checkpoints('coverage', self.settings.coverage_file)
+        writer = None
+        if self.settings.coverage_dir and not self.settings.dry_run:
+            writer = CoverageWriter(self.settings.coverage_dir, self.dataset_version.id)
+        try:
+            with db.database.atomic() as transaction:
+                counter = self._count_rows(self._import_coverage_chunks(checkpoints, writer,
+                                                                        transaction),
+                                           start)
+                if writer:
+                    writer.close()
+        finally:
+            if writer:
+                # a no-op once the files have replaced the earlier coverage
+                writer.abort()
         self._log_insertion(counter, "coverage", start)
+        if not self.settings.dry_run:
+            start = time.time()
+            db.build_coverage_summaries(self.dataset_version.id)
+            logging.info(f"Summarised coverage in {self._time_since(start)}")
+
+    def _import_coverage_chunks(self, checkpoints: list, writer, transaction):
+        """
+        Parse and insert chunks of coverage, batch_size rows at a time.
+
+        With a commit interval, each chunk is committed with its checkpoint.
+        The chunks committed by an interrupted import are only added to the
+        coverage files.
+
+        Args:
+            checkpoints (list): chunks committed by an interrupted import, see _get_checkpoints
+            writer (CoverageWriter): writer of the coverage files; None to not write them
+            transaction: the transaction of the import
+
+        Yields:
+            int: number of rows of each imported chunk
+        """
+        for chunk in self._read_chunks(self.settings.coverage_file, checkpoints):
+            if chunk['committed'] and not writer:
+                continue
+            rows = [self._parse_coverage_row(line) for line in chunk['lines']]
+            if writer:
+                for row in rows:
+                    writer.add(row)
+                writer.flush()
+            if chunk['committed']:
+                continue
+            if not self.settings.dry_run:
+                for i in range(0, len(rows), self.settings.batch_size):
+                    self._insert_rows(db.Coverage, rows[i:i + self.settings.batch_size])
+            if self.settings.commit_interval:
+                self._save_checkpoint('coverage', chunk, {'rows': len(rows)})
+                transaction.commit()
+            yield len(rows)
+
+    def _parse_coverage_row(self, line: str) -> dict:
+        """
+        Parse a line of a coverage file.
+
+        Args:
+            line (str): the line
+
+        Returns:
+            dict: chrom, pos, mean, median and the coverage list
+        """
+        data = self._parse_baseinfo(COVERAGE_HEADERS, line)
+        data['coverage'] = [data.pop(level) for level in COVERAGE_LEVELS]
+        return data
 
     def _parse_manta(self):
         """Parse a manta file."""
@@ -189,98 +240,88 @@ class RawDataImporter(DataImporter):
 
         batch = []
         counter = 0
-        last_progress = 0
+        last_progress = -1.0
         start = time.time()
-        for filename in self.settings.variant_file:
-            for line in self._open(filename):
-                line = line.strip()
-                if line.startswith("#"):
-                    continue
+        for line in self._read_files(self.settings.variant_file):
+            line = line.strip()
+            if line.startswith("#"):
+                continue
 
-                base = self._parse_baseinfo(header, line)
-                info = self._parse_info(line)
+            base = self._parse_baseinfo(header, line)
+            info = self._parse_info(line)
 
-                if info.get('SVTYPE') != 'BND':
-                    continue
+            if info.get('SVTYPE') != 'BND':
+                continue
 
-                if self._is_non_chromosome(base["chrom"]):
-                    # A BND *from* a non-chromosome.
-                    continue
+            if self._is_non_chromosome(base["chrom"]):
+                # A BND *from* a non-chromosome.
+                continue
 
-                batch += self._parse_bnd_alleles(base, info)
+            batch += self._parse_bnd_alleles(base, info)
 
-                # count variants (one per vcf row)
-                counter += 1
+            # count variants (one per vcf row)
+            counter += 1
 
-                if len(batch) >= self.settings.batch_size:
-                    if not self.settings.dry_run:
-                        db.VariantMate.insert_many(batch).execute()
-                    batch = []
+            if len(batch) >= self.settings.batch_size:
+                if not self.settings.dry_run:
+                    self._insert_rows(db.VariantMate, batch)
+                batch = []
 
-                    # Update progress
-                    if self.counter['variants']:
-                        last_progress = self._update_progress_bar(counter,
-                                                                  self.counter['variants'],
-                                                                  last_progress)
+                # Update progress
+                if self.progress_bar:
+                    last_progress = self._update_progress_bar(self._get_read_progress(), 1,
+                                                              last_progress, start=start)
 
         # Store all variants and counter values
         if batch and not self.settings.dry_run:
-            db.VariantMate.insert_many(batch).execute()
+            self._insert_rows(db.VariantMate, batch)
 
-        if self.counter['variants']:
-            last_progress = self._update_progress_bar(counter,
-                                                      self.counter['variants'],
-                                                      last_progress,
-                                                      finished=True)
+        if self.progress_bar:
+            last_progress = self._update_progress_bar(counter, 1, last_progress,
+                                                      finished=True, start=start)
         self._log_insertion(counter, "breakend", start)
 
-    def _estimate_variant_lastid(self):  # pylint: disable=no-self-use
-        """
-        Return the id of the variant with the highest id.
-
-        Returns 0 if table is empty.
-
-        Returns:
-            int: id of the variant with highest id or 0
-
-        """
-        try:
-            return (db.Variant.select(db.Variant.id)
-                    .order_by(db.Variant.id.desc())
-                    .limit(1)
-                    .get().id)
-        except db.Variant.DoesNotExist:
-            return 0
-
     def _add_variants_to_db(self, batch: list, genes: list, transcripts: list, references: dict):
         """
         Add variants to db.
 
+        The ids of the new variants are reserved from the id sequence before
+        the variants are inserted, and the gene and transcript links are built
+        from them. They are thereby correct also when other processes insert
+        variants at the same time, and the same for INSERT and COPY.
+
         Args:
             batch (list): variant data (dict)
             genes (list): genes for the variants
             transcripts(list): transcripts for the variants
             references (dict): reference genes and transcripts
         """
-        if not self.settings.beacon_only:
-            curr_id = self._estimate_variant_lastid()
-
-        db.Variant.insert_many(batch).execute()
-
-        # check if the variant dbid estimate is correct, otherwise must check manually
-        if not self.settings.beacon_only:
-            last_id = self._estimate_variant_lastid()
-            if last_id and last_id-curr_id == len(batch):
-                indexes = list(range(curr_id+1, last_id+1))
-            else:
-                logging.warning("Bad match between ids - slow check")
-                indexes = []
-                for entry in batch:
-                    indexes.append(db.Variant.select(db.Variant.id)
-                                   .where(db.Variant.variant_id == entry['variant_id'])
-                                   .get().id)
-            self._add_variant_genes(indexes, genes, references['genes'])
-            self._add_variant_transcripts(indexes, transcripts, references['transcripts'])
+        if self.settings.beacon_only:
+            self._insert_rows(db.Variant, batch)
+            return
+
+        indexes = reserve_ids(db.Variant, len(batch))
+        for variant, index in zip(batch, indexes):
+            variant['id'] = index
+        self._insert_rows(db.Variant, batch)
+
+        annotations = [variant['vep_annotations'] for variant in batch]
+        self._add_variant_genes(indexes, genes, references['genes'], annotations)
+        self._add_variant_transcripts(indexes, transcripts, references['transcripts'],
+                                      annotations)
+
+    def _insert_rows(self, model, rows: list):
+        """
+        Insert rows with COPY if settings.copy is set, otherwise with insert_many.
+
+        Args:
+            model: the peewee model of the table
+            rows (list): the rows (dict with field names as keys)
+        """
+        if self.settings.copy:
+            copy_rows(model, rows)
+        else:
+            model.insert_many(rows).execute()
 
     def _get_genes_transcripts(self):
         """
@@ -361,6 +402,7 @@ class RawDataImporter(DataImporter):
                                if len(vep_field_names) == len(x.split('|'))]
                 data['vep_annotations'] = [ann for ann in annotations
                                            if int(ann['ALLELE_NUM']) == i + 1]
+                data.update(get_consequence_fields(data['vep_annotations']))
                 batch_cont['genes'].append(list({annotation['Gene']
                                                  for annotation in data['vep_annotations']
                                                  if annotation['Gene'][:4] == 'ENSG'}))
@@ -381,79 +423,252 @@ class RawDataImporter(DataImporter):
                 self.counter['beaconvariants'] += 1  # count variants (one/alternate)
 
     def _insert_variants(self):
-        """Import variants from a VCF file."""
+        """
+        Import variants from a VCF file.
+
+        With more than one job, chunks of the file are parsed and inserted by
+        worker processes, and each chunk is committed separately. With a
+        commit interval, the chunks are committed separately also without
+        workers. Otherwise all variants are inserted in one transaction.
+
+        Each separately committed chunk is recorded as a checkpoint, and the
+        chunks committed by an interrupted import are skipped when it is resumed.
+        """
         logging.info(f"Inserting variants{' (dry run)' if self.settings.dry_run else ''}")
         start = time.time()
-        headers = [("chrom", str), ("pos", int), ("rsid", str), ("ref", str),
-                   ("alt", str), ("site_quality", float), ("filter_string", str)]
-        batch_container = {'batch': [],
-                           'genes': [],
-                           'transcripts': []}
 
-        vep_field_names = None
+        checkpoints = self._get_checkpoints('variants', self.settings.variant_file)
+        self.counter['calls'] += sum(checkpoint['call_count'] for checkpoint in checkpoints)
+        self.counter['beaconvariants'] += sum(checkpoint['variant_count']
+                                              for checkpoint in checkpoints)
+
+        header = {'vep_field_names': None, 'samples': 0}
+        chunks = self._read_variant_chunks(checkpoints, header)
+        if self.settings.jobs > 1:
+            logging.info(f"Using {self.settings.jobs} worker processes")
+            counter = self._count_rows(self._import_variant_chunks_in_workers(chunks),
+                                       start)
+        else:
+            with db.database.atomic() as transaction:
+                counter = self._count_rows(self._import_variant_chunks(chunks, transaction),
+                                           start)
+        counter += sum(checkpoint['row_count'] for checkpoint in checkpoints)
+
+        if self.settings.set_vcf_sampleset_size and header['samples']:
+            self.sampleset.sample_size = header['samples']
+            self.sampleset.save()
+
+        self.dataset_version.num_variants = counter
+        self.dataset_version.save()
+        self._log_insertion(counter, "variant", start)
+
+    def _count_rows(self, chunk_rows, start: float) -> int:
+        """
+        Count the imported rows, updating the progress bar.
+
+        Args:
+            chunk_rows (iterable): number of rows of each imported chunk
+            start (float): time the import started
 
+        Returns:
+            int: the total number of rows
+        """
         last_progress = -1.0
         counter = 0
-        samples = 0
+        for rows in chunk_rows:
+            counter += rows  # count variants (one per vcf row)
+            if self.progress_bar:
+                last_progress = self._update_progress_bar(self._get_read_progress(), 1,
+                                                          last_progress, start=start)
+        if self.progress_bar:
+            last_progress = self._update_progress_bar(counter, 1, last_progress,
+                                                      finished=True, start=start)
+        return counter
+
+    def _read_variant_chunks(self, checkpoints: list, header: dict):
+        """
+        Read the variant files in chunks of rows that are not yet imported.
+
+        Args:
+            checkpoints (list): chunks committed by an interrupted import, see _get_checkpoints
+            header (dict): filled in with the vep_field_names and the number
+                           of samples from the file headers
 
-        references = dict(zip(('genes', 'transcripts'), self._get_genes_transcripts()))
+        Yields:
+            tuple: (VEP field names, chunk (dict, see _read_chunks))
+        """
+        def read_header(line):
+            """Check for some information that we need."""
+            if line.startswith('##INFO=<ID=CSQ'):
+                header['vep_field_names'] = line.split('Format: ')[-1].strip('">').split('|')
+            if line.startswith('#CHROM'):
+                header['samples'] = len(line.split('\t')[9:])
+
+        for chunk in self._read_chunks(self.settings.variant_file, checkpoints, read_header):
+            if chunk['committed']:
+                continue
+            if not self.settings.beacon_only and not header['vep_field_names']:
+                logging.error("VEP_field_names is empty. " +
+                              "Make sure VCF header is present.")
+                sys.exit(1)
+            yield header['vep_field_names'], chunk
 
-        with db.database.atomic():
-            for filename in self.settings.variant_file:
-                for line in self._open(filename, binary=False):
-                    line = line.strip()
+    def _get_checkpoints(self, data_type: str, filenames: list) -> list:
+        """
+        Get the chunks of the files committed to the dataset version by an earlier import.
 
-                    if line.startswith("#"):
-                        # Check for some information that we need
-                        if line.startswith('##INFO=<ID=CSQ'):
-                            vep_field_names = line.split('Format: ')[-1].strip('">').split('|')
-                        if line.startswith('#CHROM'):
-                            samples = len(line.split('\t')[9:])
-                        continue
+        Unless the import is resumed, there must not be any, as importing
+        the files again would duplicate the committed rows.
 
-                    if not self.settings.beacon_only and not vep_field_names:
-                        logging.error("VEP_field_names is empty. " +
-                                      "Make sure VCF header is present.")
-                        sys.exit(1)
-
-                    self._parse_variant_row(line, batch_container, headers, vep_field_names)
-                    counter += 1  # count variants (one per vcf row)
-
-                    if len(batch_container['batch']) >= self.settings.batch_size:
-                        if not self.settings.dry_run:
-                            self._add_variants_to_db(batch_container['batch'],
-                                                     batch_container['genes'],
-                                                     batch_container['transcripts'],
-                                                     references)
-
-                        batch_container['genes'] = []
-                        batch_container['transcripts'] = []
-                        batch_container['batch'] = []
-                        # Update progress
-                        if self.counter['variants'] is not None:
-                            last_progress = self._update_progress_bar(counter,
-                                                                      self.counter['variants'],
-                                                                      last_progress)
-
-            if batch_container['batch'] and not self.settings.dry_run:
-                self._add_variants_to_db(batch_container['batch'],
-                                         batch_container['genes'],
-                                         batch_container['transcripts'],
-                                         references)
-
-        if self.settings.set_vcf_sampleset_size and samples:
-            self.sampleset.sample_size = samples
-            self.sampleset.save()
+        Args:
+            data_type (str): variants or coverage
+            filenames (list): the files
 
-        self.dataset_version.num_variants = counter
-        self.dataset_version.save()
-        if self.counter['variants'] is not None:
-            last_progress = self._update_progress_bar(counter,
-                                                      self.counter['variants'],
-                                                      last_progress,
-                                                      finished=True)
+        Returns:
+            list: checkpoints (dict)
+        """
+        checkpoints = list(db.ImportCheckpoint.select()
+                           .where((db.ImportCheckpoint.dataset_version == self.dataset_version) &
+                                  (db.ImportCheckpoint.data_type == data_type) &
+                                  (db.ImportCheckpoint.file_name.in_(filenames)))
+                           .dicts())
+        if checkpoints and not self.settings.resume:
+            logging.error(f"Part of {checkpoints[0]['file_name']} is already imported to " +
+                          "this dataset version. Use --resume to continue that import.")
+            sys.exit(1)
+        if checkpoints:
+            logging.info(f"Resuming the import of {data_type} after " +
+                         f"{sum(checkpoint['row_count'] for checkpoint in checkpoints):,} " +
+                         "committed rows")
+        return checkpoints
 
-        self._log_insertion(counter, "variant", start)
+    def _save_checkpoint(self, data_type: str, chunk: dict, counts: dict):
+        """
+        Record that a chunk is imported, in the transaction importing it.
+
+        Args:
+            data_type (str): variants or coverage
+            chunk (dict): the chunk, see _read_chunks
+            counts (dict): rows, and for variants calls and beaconvariants, of the chunk
+        """
+        if self.settings.dry_run:
+            return
+        chrom, pos = chunk['lines'][-1].split('\t', 2)[:2]
+        db.ImportCheckpoint.insert(dataset_version=self.dataset_version,
+                                   data_type=data_type,
+                                   file_name=chunk['file_name'],
+                                   start_line=chunk['start_line'],
+                                   end_line=chunk['end_line'],
+                                   chrom=chrom,
+                                   pos=int(pos),
+                                   row_count=counts['rows'],
+                                   call_count=counts.get('calls', 0),
+                                   variant_count=counts.get('beaconvariants', 0)).execute()
+
+    def _import_variant_chunks(self, chunks, transaction):
+        """
+        Parse and insert chunks of VCF rows.
+
+        With a commit interval, each chunk is committed with its checkpoint.
+
+        Args:
+            chunks (iterable): (VEP field names, chunk) tuples, see _read_variant_chunks
+            transaction: the transaction of the import
+
+        Yields:
+            int: number of rows of each imported chunk
+        """
+        for vep_field_names, chunk in chunks:
+            counts = self._import_variant_chunk(chunk['lines'], vep_field_names)
+            if self.settings.commit_interval:
+                self._save_checkpoint('variants', chunk, counts)
+                transaction.commit()
+            yield counts['rows']
+
+    def _import_variant_chunk(self, lines: list, vep_field_names: list) -> dict:
+        """
+        Parse a chunk of VCF rows and insert the variants, batch_size variants at a time.
+
+        Args:
+            lines (list): the rows (str)
+            vep_field_names (list): VEP field names
+
+        Returns:
+            dict: rows, calls and beaconvariants of the chunk
+        """
+        counts = {'rows': len(lines),
+                  'calls': self.counter['calls'],
+                  'beaconvariants': self.counter['beaconvariants']}
+        if self.references is None:
+            self.references = dict(zip(('genes', 'transcripts'), self._get_genes_transcripts()))
+        batch_container = {'batch': [],
+                           'genes': [],
+                           'transcripts': []}
+        for line in lines:
+            self._parse_variant_row(line, batch_container, VARIANT_HEADERS, vep_field_names)
+
+            if len(batch_container['batch']) >= self.settings.batch_size:
+                if not self.settings.dry_run:
+                    self._add_variants_to_db(batch_container['batch'],
+                                             batch_container['genes'],
+                                             batch_container['transcripts'],
+                                             self.references)
+                batch_container['genes'] = []
+                batch_container['transcripts'] = []
+                batch_container['batch'] = []
+
+        if batch_container['batch'] and not self.settings.dry_run:
+            self._add_variants_to_db(batch_container['batch'],
+                                     batch_container['genes'],
+                                     batch_container['transcripts'],
+                                     self.references)
+
+        # a chunk ends with a position, so its calls can be counted
+        self.counter['calls'] += len(self.counter['tmp_calls'])
+        self.counter['tmp_calls'] = set()
+        counts['calls'] = self.counter['calls'] - counts['calls']
+        counts['beaconvariants'] = self.counter['beaconvariants'] - counts['beaconvariants']
+        return counts
+
+    def _import_variant_chunks_in_workers(self, chunks):
+        """
+        Parse and insert chunks of VCF rows in settings.jobs worker processes.
+
+        Each worker uses its own database connection and commits each chunk
+        separately, with its checkpoint. At most two chunks per worker are waiting at a time. The
+        call and variant counts of the workers are added to self.counter.
+
+        Args:
+            chunks (iterable): (VEP field names, chunk) tuples, see _read_variant_chunks
+
+        Yields:
+            int: number of rows of each imported chunk
+        """
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(self.settings.jobs) as pool:
+            pending = collections.deque()
+            for vep_field_names, chunk in chunks:
+                if len(pending) >= 2 * self.settings.jobs:
+                    yield self._add_worker_counts(pending.popleft().get())
+                pending.append(pool.apply_async(_import_variant_chunk_in_worker,
+                                                (self.settings, self.dataset_version.id,
+                                                 chunk, vep_field_names)))
+            while pending:
+                yield self._add_worker_counts(pending.popleft().get())
+
+    def _add_worker_counts(self, counts: dict) -> int:
+        """
+        Add the beacon counts of a chunk imported by a worker process.
+
+        Args:
+            counts (dict): rows, calls and beaconvariants of the chunk
+
+        Returns:
+            int: number of rows of the chunk
+        """
+        self.counter['calls'] += counts['calls']
+        self.counter['beaconvariants'] += counts['beaconvariants']
+        return counts['rows']
 
     def _get_callcount(self, data):
         """Increment the call count by the calls found at this position."""
@@ -477,7 +692,12 @@ class RawDataImporter(DataImporter):
         self.counter['tmp_calls'].add(data['ref'])
 
     def count_entries(self):
-        """Count the number of entries."""
+        """
+        Count the number of entries.
+
+        This is an extra pass over the files, only for the log; the progress
+        bars use the position in the files.
+        """
         start = time.time()
         if self.settings.coverage_file:
             self.counter['coverage'] = 0
@@ -503,6 +723,92 @@ class RawDataImporter(DataImporter):
 
         logging.info("Counted input data lines in {} ".format(self._time_since(start)))
 
+    def backfill_consequences(self):
+        """
+        Compute the stored consequence fields for variants imported without them.
+
+        The variants of the dataset version and their gene and transcript
+        links are updated in batches of batch_size variants.
+        """
+        logging.info("Backfilling consequence fields" +
+                     f"{' (dry run)' if self.settings.dry_run else ''}")
+        start = time.time()
+        counter = 0
+        query = (db.Variant.select(db.Variant.id, db.Variant.vep_annotations)
+                 .where((db.Variant.dataset_version == self.dataset_version) &
+                        (db.Variant.major_consequence.is_null()))
+                 .dicts())
+        batch = []
+        with db.database.atomic():
+            for variant in ServerSide(query, array_size=self.settings.batch_size):
+                batch.append(variant)
+                if len(batch) >= self.settings.batch_size:
+                    self._backfill_consequence_batch(batch)
+                    counter += len(batch)
+                    batch = []
+            if batch:
+                self._backfill_consequence_batch(batch)
+                counter += len(batch)
+        logging.info(f"Backfilled consequence fields for {counter} variants " +
+                     f"in {self._time_since(start)}")
+
+    def _backfill_consequence_batch(self, batch: list):
+        """
+        Update the consequence fields of a batch of variants and their gene and transcript links.
+
+        Args:
+            batch (list): variants (dict with id and vep_annotations)
+        """
+        annotations = {variant['id']: variant['vep_annotations'] or [] for variant in batch}
+        variants = [{'id': variant_id, **get_consequence_fields(annos)}
+                    for variant_id, annos in annotations.items()]
+        genes = [{'id': link['id'],
+                  **get_consequence_fields([ann for ann in annotations[link['variant']]
+                                            if ann['Gene'] == link['gene_id']])}
+                 for link in (db.VariantGenes.select(db.VariantGenes.id,
+                                                     db.VariantGenes.variant,
+                                                     db.Gene.gene_id)
+                              .join(db.Gene)
+                              .where(db.VariantGenes.variant.in_(list(annotations)))
+                              .dicts())]
+        transcripts = [{'id': link['id'],
+                        **get_consequence_fields([ann for ann in annotations[link['variant']]
+                                                  if ann['Feature'] == link['transcript_id']])}
+                       for link in (db.VariantTranscripts.select(db.VariantTranscripts.id,
+                                                                 db.VariantTranscripts.variant,
+                                                                 db.Transcript.transcript_id)
+                                    .join(db.Transcript)
+                                    .where(db.VariantTranscripts.variant.in_(list(annotations)))
+                                    .dicts())]
+        if self.settings.dry_run:
+            return
+        for model, rows in ((db.Variant, variants),
+                            (db.VariantGenes, genes),
+                            (db.VariantTranscripts, transcripts)):
+            if rows:
+                self._update_consequence_fields(model, rows)
+
+    @staticmethod
+    def _update_consequence_fields(model, rows: list):
+        """
+        Update the consequence fields of many rows in one statement (UPDATE ... FROM VALUES).
+
+        Args:
+            model: db.Variant, db.VariantGenes or db.VariantTranscripts
+            rows (list): dicts with id and the consequence fields
+        """
+        columns = ['id'] + list(CONSEQUENCE_FIELDS)
+        values = ValuesList([[Value(row[column], unpack=False) for column in columns]
+                             for row in rows],
+                            columns=columns, alias='consequences')
+        updates = {getattr(model, column): getattr(values.c, column)
+                   for column in CONSEQUENCE_FIELDS}
+        updates[model.flags] = values.c.flags.cast('varchar[]')
+        (model.update(updates)
+         .from_(values)
+         .where(model.id == values.c.id)
+         .execute())
+
     def prepare_data(self):
         """Prepare for inserting data into db."""
         self._select_dataset_version()
@@ -523,7 +829,8 @@ class RawDataImporter(DataImporter):
 
     def _add_variant_genes(self, variant_indexes: list,
                            genes_to_add: list,
-                           ref_genes: dict):
+                           ref_genes: dict,
+                           annotations: list):
         """
         Add genes associated with the provided variants.
 
@@ -531,19 +838,23 @@ class RawDataImporter(DataImporter):
             variant_indexes (list): dbids of the variants
             genes_to_add (list): the genes for each variant (str)
             ref_genes (dict): genename: dbid
+            annotations (list): the VEP annotations for each variant
         """
         batch = []
         for i in range(len(variant_indexes)):
-            connected_genes = [{'variant': variant_indexes[i], 'gene': ref_genes[gene]}
+            connected_genes = [{'variant': variant_indexes[i], 'gene': ref_genes[gene],
+                                **get_consequence_fields([ann for ann in annotations[i]
+                                                          if ann['Gene'] == gene])}
                                for gene in genes_to_add[i]
                                if gene]
             batch += connected_genes
         if not self.settings.dry_run:
-            db.VariantGenes.insert_many(batch).execute()
+            self._insert_rows(db.VariantGenes, batch)
 
     def _add_variant_transcripts(self, variant_indexes: list,
                                  transcripts_to_add: list,
-                                 ref_transcripts: dict):
+                                 ref_transcripts: dict,
+                                 annotations: list):
         """
         Add transcripts associated with the provided variants.
 
@@ -551,15 +862,18 @@ class RawDataImporter(DataImporter):
             variant_indexes (list): dbids of the variants
             transcripts_to_add (list): the transcripts for each variant (str)
             ref_transcripts (dict): genename: dbid
+            annotations (list): the VEP annotations for each variant
         """
         batch = []
         for i in range(len(variant_indexes)):
             connected_transcripts = [{'variant': variant_indexes[i],
-                                      'transcript': ref_transcripts[transcript]}
+                                      'transcript': ref_transcripts[transcript],
+                                      **get_consequence_fields([ann for ann in annotations[i]
+                                                                if ann['Feature'] == transcript])}
                                      for transcript in transcripts_to_add[i]]
             batch += connected_transcripts
         if not self.settings.dry_run:
-            db.VariantTranscripts.insert_many(batch).execute()
+            self._insert_rows(db.VariantTranscripts, batch)
 
     @staticmethod
     def _is_non_chromosome(chrom):
@@ -647,3 +961,34 @@ class RawDataImporter(DataImporter):
         """Parse the INFO field of a vcf line."""
         parts = re.split(r';(?=\w)', line.split('\t')[7])
         return {x[0]: x[1] for x in map(lambda s: s.split('=', 1) if '=' in s else (s, s), parts)}
+
+
+def _import_variant_chunk_in_worker(settings, dataset_version_id: int,
+                                    chunk: dict, vep_field_names: list) -> dict:
+    """
+    Import a chunk of VCF rows in a worker process, in its own transaction with its checkpoint.
+
+    The importer of the worker is created for its first chunk.
+
+    Args:
+        settings: the importer settings
+        dataset_version_id (int): id of the dataset version to import to
+        chunk (dict): the chunk, see RawDataImporter._read_chunks
+        vep_field_names (list): VEP field names
+
+    Returns:
+        dict: rows, calls and beaconvariants of the chunk
+    """
+    global _WORKER_IMPORTER  # pylint: disable=global-statement
+    if _WORKER_IMPORTER is None:
+        _WORKER_IMPORTER = RawDataImporter(settings)
+        _WORKER_IMPORTER.dataset_version = db.DatasetVersion.get_by_id(dataset_version_id)
+        _WORKER_IMPORTER.dataset = _WORKER_IMPORTER.dataset_version.dataset
+    importer = _WORKER_IMPORTER
+    # the chunks of a worker are not consecutive, so the order check starts over
+    importer.chrom = None
+    importer.lastpos = 0
+    with db.database.atomic():
+        counts = importer._import_variant_chunk(chunk['lines'], vep_field_names)  # pylint: disable=protected-access
+        importer._save_checkpoint('variants', chunk, counts)  # pylint: disable=protected-access
+    return counts
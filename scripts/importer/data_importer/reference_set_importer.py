@@ -281,18 +281,23 @@ class ReferenceSetImporter(DataImporter):  # pylint: disable=too-many-instance-a
                 self.genes[i]['canonical_transcript'] = canonical_dict[gene['gene_id']]
 
             self.counters['genes'] += 1
-            if self.numbers['genes'] is not None:
-                last_progress = self._update_progress_bar(i, self.numbers['genes'], last_progress)
+            if self.progress_bar:
+                last_progress = self._update_progress_bar(i, len(self.genes), last_progress)
             i += 1
 
-        if self.numbers['genes'] is not None:
-            last_progress = self._update_progress_bar(i, self.numbers['genes'],
+        if self.progress_bar:
+            last_progress = self._update_progress_bar(i, len(self.genes),
                                                       last_progress, finished=True)
         logging.info("Canonical transcript information from ensembl " +
                      f"added in {self._time_since(start)}.")
 
     def count_entries(self):
-        """Count the number of entries."""
+        """
+        Count the number of entries.
+
+        This is an extra pass over the gencode file, only for the log; the
+        progress bars use the position in the file.
+        """
         logging.info("Counting features in gencode file (for progress bar)")
         start = time.time()
         self.numbers['genes'] = 0
@@ -336,6 +341,7 @@ class ReferenceSetImporter(DataImporter):  # pylint: disable=too-many-instance-a
         start = time.time()
         logging.info("Reading gencode data into buffers.")
         last_progress = -1.0
+        gencode_size = self._file_size(self.gencode)
         for line in self.gencode:
             line = bytes(line).decode('ascii').strip()
             if line.startswith("#"):
@@ -355,11 +361,11 @@ class ReferenceSetImporter(DataImporter):  # pylint: disable=too-many-instance-a
                         'strand':values[6],
                         'gene_id':info['gene_id'].split('.')[0]}
 
-                # only progress for genes to keep it simple
-                if self.numbers['genes'] is not None:
-                    last_progress = self._update_progress_bar(self.counters['genes'],
-                                                              self.numbers['genes'],
-                                                              last_progress)
+                if self.progress_bar:
+                    last_progress = self._update_progress_bar(self._file_position(self.gencode),
+                                                              gencode_size,
+                                                              last_progress,
+                                                              start=start)
                 if values[2] == 'gene':
                     data['name'] = info['gene_name']
                     self.genes += [data]
@@ -381,11 +387,12 @@ class ReferenceSetImporter(DataImporter):  # pylint: disable=too-many-instance-a
             except Exception as error:  # pylint: disable=broad-except
                 logging.error("{}".format(error))
                 break
-        if self.numbers['genes'] is not None:
-            last_progress = self._update_progress_bar(self.counters['genes'],
-                                                      self.numbers['genes'],
+        if self.progress_bar:
+            last_progress = self._update_progress_bar(gencode_size,
+                                                      gencode_size,
                                                       last_progress,
-                                                      finished=True)
+                                                      finished=True,
+                                                      start=start)
         logging.info("Gencode data read into buffers in {}.".format(self._time_since(start)))
         self._read_ensembl()
         self._read_dbnsfp()
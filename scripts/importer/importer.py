@@ -26,6 +26,25 @@ if __name__ == '__main__':
     PARSER.add_argument("--batch_size", type=int, default=5000,
                         help=("Where batch insertion is possible, use this "
                               "number of inserts per batch."))
+    PARSER.add_argument("--jobs", type=int, default=1,
+                        help=("Number of worker processes parsing and inserting "
+                              "variants. With more than one, each chunk of "
+                              "batch_size rows is committed separately."))
+    PARSER.add_argument("--commit_interval", type=int, default=0,
+                        help=("Commit variants and coverage in chunks of at "
+                              "least this many rows, recording checkpoints so "
+                              "that an interrupted import can be resumed. With "
+                              "0, each is imported in one transaction (unless "
+                              "--jobs is used)."))
+    PARSER.add_argument("--resume", action="store_true",
+                        help=("Resume an interrupted import of the same files "
+                              "after its last checkpoints. The checkpoints are "
+                              "kept after an import, so importing the same files "
+                              "again is refused without this."))
+    PARSER.add_argument("--copy", action="store_true",
+                        help=("Load variants, their genes and transcripts, "
+                              "coverage and breakends with COPY instead of "
+                              "batched INSERTs."))
     PARSER.add_argument("--limit_chrom", default=None,
                         help="Limit chromosome to insert into the database.")
     PARSER.add_argument("--data_dir",
@@ -70,18 +89,29 @@ if __name__ == '__main__':
                         help="Coverage file(s) to import.")
     PARSER.add_argument("--variant_file", nargs="*",
                         help="Variant file(s) to import.")
+    PARSER.add_argument("--coverage_dir", default=None,
+                        help=("Also write the coverage as memory-mapped files "
+                              "to this directory (coverageDirectory in "
+                              "settings.json)."))
 
     # Actions
     PARSER.add_argument("--add_reference", action="store_true",
                         help="Insert new reference set.")
     PARSER.add_argument("--add_raw_data", action="store_true",
                         help="Adds a Coverage and Variants to the database.")
+    PARSER.add_argument("--backfill_consequences", action="store_true",
+                        help=("Compute the stored consequence fields for the "
+                              "variants of an existing dataset version."))
     PARSER.add_argument("--dry_run", action="store_true",
                         help="Do not insert anything into the database")
 
     # Logging and verbosity
     PARSER.add_argument("--disable_progress", action="store_true",
                         help="Do not show progress bars.")
+    PARSER.add_argument("--count_entries", action="store_true",
+                        help=("Count and log the entries of the input files "
+                              "before importing (an extra pass over the "
+                              "files, not needed for the progress bars)."))
     PARSER.add_argument("-v", "--verbose", action="count", default=3,
                         help="Increase output Verbosity.")
     PARSER.add_argument("-q", "--quiet", action="count", default=0,
@@ -114,7 +144,7 @@ if __name__ == '__main__':
 
         IMPORTER = ReferenceSetImporter(ARGS)
         IMPORTER.prepare_data()
-        if not ARGS.disable_progress:
+        if ARGS.count_entries:
             IMPORTER.count_entries()
         IMPORTER.start_import()
 
@@ -122,6 +152,12 @@ if __name__ == '__main__':
         logging.info(f"Adding raw data {'(dry run)' if ARGS.dry_run else ''}")
         IMPORTER = RawDataImporter(ARGS)
         IMPORTER.prepare_data()
-        if not ARGS.disable_progress:
+        if ARGS.count_entries:
             IMPORTER.count_entries()
         IMPORTER.start_import()
+
+    if ARGS.backfill_consequences:
+        logging.info(f"Backfilling consequences {'(dry run)' if ARGS.dry_run else ''}")
+        IMPORTER = RawDataImporter(ARGS)
+        IMPORTER.prepare_data()
+        IMPORTER.backfill_consequences()
@@ -169,7 +169,14 @@ CREATE TABLE IF NOT EXISTS data.variants (
     allele_count integer,
     allele_num integer,
     quality_metrics jsonb,
-    vep_annotations jsonb
+    vep_annotations jsonb,
+    major_consequence varchar, -- consequence fields derived from vep_annotations at import
+    category varchar,
+    flags varchar[],
+    hgvs varchar,
+    hgvsp varchar,
+    hgvsc varchar,
+    canonical varchar
 );
 
 -- For storing breakends
@@ -193,13 +200,27 @@ CREATE TABLE IF NOT EXISTS data.mates (
 CREATE TABLE IF NOT EXISTS data.variant_genes (
     id integer PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
     variant integer REFERENCES data.variants,
-    gene integer REFERENCES data.genes
+    gene integer REFERENCES data.genes,
+    major_consequence varchar, -- consequence fields derived from the annotations of the gene at import
+    category varchar,
+    flags varchar[],
+    hgvs varchar,
+    hgvsp varchar,
+    hgvsc varchar,
+    canonical varchar
 );
 
 CREATE TABLE IF NOT EXISTS data.variant_transcripts (
     id integer PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
     variant integer REFERENCES data.variants,
-    transcript integer REFERENCES data.transcripts
+    transcript integer REFERENCES data.transcripts,
+    major_consequence varchar, -- consequence fields derived from the annotations of the transcript at import
+    category varchar,
+    flags varchar[],
+    hgvs varchar,
+    hgvsp varchar,
+    hgvsc varchar,
+    canonical varchar
 );
 
 CREATE TABLE IF NOT EXISTS data.coverage (
@@ -212,6 +233,36 @@ CREATE TABLE IF NOT EXISTS data.coverage (
     coverage real[] -- These are the coverage values, for the levels defined in data.dataset_versions.coverage_levels
 );
 
+CREATE TABLE IF NOT EXISTS data.coverage_summaries (
+    id integer PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+    dataset_version integer REFERENCES data.dataset_versions,
+    resolution integer, -- bin size in bases
+    chrom varchar(10),
+    pos integer, -- first position of the bin, a multiple of the resolution
+    mean_min real,
+    mean_avg real,
+    mean_max real,
+    cov20_min real,
+    cov20_avg real,
+    cov20_max real
+);
+
+-- Chunks of raw data committed by the importer, used to resume interrupted imports
+CREATE TABLE IF NOT EXISTS data.import_checkpoints (
+    id integer PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+    dataset_version integer REFERENCES data.dataset_versions,
+    data_type varchar, -- 'variants' or 'coverage'
+    file_name varchar, -- the input file as given to the importer
+    start_line integer, -- the lines start_line to end_line-1 (0-based) of the file are committed
+    end_line integer,
+    chrom varchar(10), -- chrom and pos of the last committed line
+    pos integer,
+    row_count integer, -- data lines in the chunk
+    call_count integer, -- beacon counts of the chunk
+    variant_count integer,
+    committed timestamp DEFAULT now()
+);
+
 CREATE TABLE IF NOT EXISTS data.metrics (
     id integer PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
     dataset_version integer REFERENCES data.dataset_versions,
@@ -231,18 +282,42 @@ CREATE OR REPLACE VIEW data.dataset_version_current AS
              WHERE available_from < now()
              GROUP BY dataset);
 
+--------------------------------------------------------------------------------
+-- Functions
+--
+
+-- UCSC-style bin for the region start_pos-end_pos (inclusive). Used by the
+-- region indexes below; a region overlapping [a, b] can only be placed in one
+-- of the bins enumerated by db.region_bins(a, b) in the backend.
+CREATE OR REPLACE FUNCTION data.region_bin(start_pos integer, end_pos integer)
+RETURNS integer AS $$
+    SELECT CASE
+        WHEN start_pos >> 17 = end_pos >> 17 THEN 585 + (start_pos >> 17)
+        WHEN start_pos >> 20 = end_pos >> 20 THEN 73 + (start_pos >> 20)
+        WHEN start_pos >> 23 = end_pos >> 23 THEN 9 + (start_pos >> 23)
+        WHEN start_pos >> 26 = end_pos >> 26 THEN 1 + (start_pos >> 26)
+        ELSE 0
+    END
+$$ LANGUAGE SQL IMMUTABLE;
+
 --------------------------------------------------------------------------------
 -- Indexes
 --
 
 CREATE INDEX coverage_chrom_pos ON data.coverage (chrom, pos);
+CREATE INDEX coverage_summaries_pos ON data.coverage_summaries (dataset_version, resolution, chrom, pos);
 CREATE INDEX features_gene ON data.features (gene);
 CREATE INDEX features_transcript ON data.features (transcript);
 CREATE INDEX features_transcript_type ON data.features (transcript, feature_type);
 CREATE INDEX gene_other_names_name ON data.gene_other_names (name);
 CREATE INDEX gene_other_names_gene ON data.gene_other_names (gene);
+CREATE INDEX gene_other_names_upper_name ON data.gene_other_names (upper(name));
 CREATE INDEX genes_gene_id ON data.genes (gene_id);
+CREATE INDEX genes_upper_name ON data.genes (reference_set, upper(gene_name));
+CREATE INDEX genes_region_bin ON data.genes (reference_set, chrom, data.region_bin(start_pos, end_pos));
+CREATE INDEX import_checkpoints_file ON data.import_checkpoints (dataset_version, data_type, file_name);
 CREATE INDEX transcripts_transcript_id ON data.transcripts (transcript_id);
+CREATE INDEX transcripts_region_bin ON data.transcripts (chrom, data.region_bin(start_pos, stop_pos));
 CREATE INDEX variants_chrom_pos ON data.variants (chrom, pos);
 CREATE INDEX variants_rsid ON data.variants (rsid);
 CREATE INDEX variant_genes_gene ON data.variant_genes (gene);
@@ -1,3 +1,82 @@
 -- Patches a database that is using the master checkout of the
 -- swefreq.sql schema definition to the develop version.
 
+-- Binned region indexes for genes and transcripts
+CREATE OR REPLACE FUNCTION data.region_bin(start_pos integer, end_pos integer)
+RETURNS integer AS $$
+    SELECT CASE
+        WHEN start_pos >> 17 = end_pos >> 17 THEN 585 + (start_pos >> 17)
+        WHEN start_pos >> 20 = end_pos >> 20 THEN 73 + (start_pos >> 20)
+        WHEN start_pos >> 23 = end_pos >> 23 THEN 9 + (start_pos >> 23)
+        WHEN start_pos >> 26 = end_pos >> 26 THEN 1 + (start_pos >> 26)
+        ELSE 0
+    END
+$$ LANGUAGE SQL IMMUTABLE;
+
+CREATE INDEX IF NOT EXISTS genes_region_bin ON data.genes (reference_set, chrom, data.region_bin(start_pos, end_pos));
+CREATE INDEX IF NOT EXISTS transcripts_region_bin ON data.transcripts (chrom, data.region_bin(start_pos, stop_pos));
+
+-- Multi-resolution coverage summaries
+CREATE TABLE IF NOT EXISTS data.coverage_summaries (
+    id integer PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+    dataset_version integer REFERENCES data.dataset_versions,
+    resolution integer, -- bin size in bases
+    chrom varchar(10),
+    pos integer, -- first position of the bin, a multiple of the resolution
+    mean_min real,
+    mean_avg real,
+    mean_max real,
+    cov20_min real,
+    cov20_avg real,
+    cov20_max real
+);
+
+CREATE INDEX IF NOT EXISTS coverage_summaries_pos ON data.coverage_summaries (dataset_version, resolution, chrom, pos);
+
+-- Consequence fields computed at import time
+ALTER TABLE data.variants
+    ADD COLUMN IF NOT EXISTS major_consequence varchar,
+    ADD COLUMN IF NOT EXISTS category varchar,
+    ADD COLUMN IF NOT EXISTS flags varchar[],
+    ADD COLUMN IF NOT EXISTS hgvs varchar,
+    ADD COLUMN IF NOT EXISTS hgvsp varchar,
+    ADD COLUMN IF NOT EXISTS hgvsc varchar,
+    ADD COLUMN IF NOT EXISTS canonical varchar;
+ALTER TABLE data.variant_genes
+    ADD COLUMN IF NOT EXISTS major_consequence varchar,
+    ADD COLUMN IF NOT EXISTS category varchar,
+    ADD COLUMN IF NOT EXISTS flags varchar[],
+    ADD COLUMN IF NOT EXISTS hgvs varchar,
+    ADD COLUMN IF NOT EXISTS hgvsp varchar,
+    ADD COLUMN IF NOT EXISTS hgvsc varchar,
+    ADD COLUMN IF NOT EXISTS canonical varchar;
+ALTER TABLE data.variant_transcripts
+    ADD COLUMN IF NOT EXISTS major_consequence varchar,
+    ADD COLUMN IF NOT EXISTS category varchar,
+    ADD COLUMN IF NOT EXISTS flags varchar[],
+    ADD COLUMN IF NOT EXISTS hgvs varchar,
+    ADD COLUMN IF NOT EXISTS hgvsp varchar,
+    ADD COLUMN IF NOT EXISTS hgvsc varchar,
+    ADD COLUMN IF NOT EXISTS canonical varchar;
+
+-- Case-insensitive gene name search
+CREATE INDEX IF NOT EXISTS genes_upper_name ON data.genes (reference_set, upper(gene_name));
+CREATE INDEX IF NOT EXISTS gene_other_names_upper_name ON data.gene_other_names (upper(name));
+
+-- Checkpoints of raw data imports
+CREATE TABLE IF NOT EXISTS data.import_checkpoints (
+    id integer PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+    dataset_version integer REFERENCES data.dataset_versions,
+    data_type varchar, -- 'variants' or 'coverage'
+    file_name varchar, -- the input file as given to the importer
+    start_line integer, -- the lines start_line to end_line-1 (0-based) of the file are committed
+    end_line integer,
+    chrom varchar(10), -- chrom and pos of the last committed line
+    pos integer,
+    row_count integer, -- data lines in the chunk
+    call_count integer, -- beacon counts of the chunk
+    variant_count integer,
+    committed timestamp DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS import_checkpoints_file ON data.import_checkpoints (dataset_version, data_type, file_name);
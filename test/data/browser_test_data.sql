@@ -544,6 +544,575 @@ COPY data.coverage (id, dataset_version, chrom, pos, mean, median, coverage) FRO
 504	4	22	46615930	38.75	37	{1,1,1,1,0.994000018,0.954999983,0.819999993,0.104999997,0.00100000005}
 \.
 
+COPY data.coverage_summaries (id, dataset_version, resolution, chrom, pos, mean_min, mean_avg, mean_max, cov20_min, cov20_avg, cov20_max) FROM stdin;
+1	4	10	22	16364820	75.45	75.45	75.45	0.998	0.998	0.998
+2	4	10	22	16364830	75.94	75.94	75.94	0.998	0.998	0.998
+3	4	10	22	16364840	74.89	74.89	74.89	0.997	0.997	0.997
+4	4	10	22	16364850	72.94	72.94	72.94	0.997	0.997	0.997
+5	4	10	22	16364860	71.06	71.06	71.06	0.997	0.997	0.997
+6	4	10	22	16364870	67.41	67.41	67.41	0.997	0.997	0.997
+7	4	10	22	16364880	64.26	64.26	64.26	0.994	0.994	0.994
+8	4	10	22	16364890	60.92	60.92	60.92	0.995	0.995	0.995
+9	4	10	22	16364900	58.89	58.89	58.89	0.995	0.995	0.995
+10	4	10	22	16364910	57.57	57.57	57.57	0.994	0.994	0.994
+11	4	10	22	16364920	56.25	56.25	56.25	0.991	0.991	0.991
+12	4	10	22	16364930	55.18	55.18	55.18	0.991	0.991	0.991
+13	4	10	22	16364940	55.15	55.15	55.15	0.991	0.991	0.991
+14	4	10	22	16364950	54	54	54	0.991	0.991	0.991
+15	4	10	22	16364960	51.68	51.68	51.68	0.99	0.99	0.99
+16	4	10	22	16364970	50.62	50.62	50.62	0.989	0.989	0.989
+17	4	10	22	16364980	50.5	50.5	50.5	0.99	0.99	0.99
+18	4	10	22	16364990	50.85	50.85	50.85	0.993	0.993	0.993
+19	4	10	22	16365000	50.98	50.98	50.98	0.992	0.992	0.992
+20	4	10	22	16365010	51.24	51.24	51.24	0.992	0.992	0.992
+21	4	10	22	16365020	52.46	52.46	52.46	0.992	0.992	0.992
+22	4	10	22	16365030	52.95	52.95	52.95	0.993	0.993	0.993
+23	4	10	22	16365040	53.53	53.53	53.53	0.995	0.995	0.995
+24	4	10	22	16365050	54.11	54.11	54.11	0.994	0.994	0.994
+25	4	10	22	16365060	54.78	54.78	54.78	0.995	0.995	0.995
+26	4	10	22	16365070	54.76	54.76	54.76	0.995	0.995	0.995
+27	4	10	22	16365080	54.16	54.16	54.16	0.993	0.993	0.993
+28	4	10	22	16365090	53.1	53.1	53.1	0.992	0.992	0.992
+29	4	10	22	16365100	52.01	52.01	52.01	0.994	0.994	0.994
+30	4	10	22	16365110	52.37	52.37	52.37	0.994	0.994	0.994
+31	4	10	22	16365120	51.33	51.33	51.33	0.995	0.995	0.995
+32	4	10	22	16365130	50.8	50.8	50.8	0.995	0.995	0.995
+33	4	10	22	16365140	50.59	50.59	50.59	0.995	0.995	0.995
+34	4	10	22	16365150	48.57	48.57	48.57	0.991	0.991	0.991
+35	4	10	22	16365160	46.74	46.74	46.74	0.99	0.99	0.99
+36	4	10	22	16365170	44.6	44.6	44.6	0.988	0.988	0.988
+37	4	10	22	16365180	43.08	43.08	43.08	0.985	0.985	0.985
+38	4	10	22	16365190	41.64	41.64	41.64	0.979	0.979	0.979
+39	4	10	22	16365200	40.13	40.13	40.13	0.97	0.97	0.97
+40	4	10	22	16365210	38.96	38.96	38.96	0.955	0.955	0.955
+41	4	10	22	16365220	38.31	38.31	38.31	0.957	0.957	0.957
+42	4	10	22	16365230	38.16	38.16	38.16	0.952	0.952	0.952
+43	4	10	22	16365240	37.97	37.97	37.97	0.95	0.95	0.95
+44	4	10	22	16365250	37.8	37.8	37.8	0.94	0.94	0.94
+45	4	10	22	16365260	37.66	37.66	37.66	0.941	0.941	0.941
+46	4	10	22	16365270	36.69	36.69	36.69	0.927	0.927	0.927
+47	4	10	22	16365280	35.54	35.54	35.54	0.912	0.912	0.912
+48	4	10	22	16365290	34.67	34.67	34.67	0.904	0.904	0.904
+49	4	10	22	16365300	36.36	36.36	36.36	0.925	0.925	0.925
+50	4	10	22	16365310	37.73	37.73	37.73	0.944	0.944	0.944
+51	4	10	22	16365320	39.05	39.05	39.05	0.956	0.956	0.956
+52	4	10	22	16365330	40.22	40.22	40.22	0.96	0.96	0.96
+53	4	10	22	16365340	41.91	41.91	41.91	0.972	0.972	0.972
+54	4	10	22	16365350	43.46	43.46	43.46	0.971	0.971	0.971
+55	4	10	22	16365360	45.87	45.87	45.87	0.982	0.982	0.982
+56	4	10	22	16365370	47.37	47.37	47.37	0.989	0.989	0.989
+57	4	10	22	16365380	49.73	49.73	49.73	0.99	0.99	0.99
+58	4	10	22	16365390	51.86	51.86	51.86	0.995	0.995	0.995
+59	4	10	22	16365400	53.59	53.59	53.59	0.994	0.994	0.994
+60	4	10	22	16365410	55.37	55.37	55.37	0.996	0.996	0.996
+61	4	10	22	16365420	57.91	57.91	57.91	0.997	0.997	0.997
+62	4	10	22	16365430	60.02	60.02	60.02	0.997	0.997	0.997
+63	4	10	22	16365440	61.53	61.53	61.53	0.998	0.998	0.998
+64	4	10	22	16365450	62.56	62.56	62.56	0.998	0.998	0.998
+65	4	10	22	16365460	63.88	63.88	63.88	0.999	0.999	0.999
+66	4	10	22	16365470	65.49	65.49	65.49	0.999	0.999	0.999
+67	4	10	22	16365480	66.21	66.21	66.21	0.999	0.999	0.999
+68	4	10	22	16365490	67.12	67.12	67.12	0.999	0.999	0.999
+69	4	10	22	16365500	68.49	68.49	68.49	0.999	0.999	0.999
+70	4	10	22	16365510	69.05	69.05	69.05	0.999	0.999	0.999
+71	4	10	22	16365520	68.91	68.91	68.91	0.999	0.999	0.999
+72	4	10	22	16365530	68.31	68.31	68.31	0.999	0.999	0.999
+73	4	10	22	16365540	68.06	68.06	68.06	0.998	0.998	0.998
+74	4	10	22	16365550	68.52	68.52	68.52	0.998	0.998	0.998
+75	4	10	22	16365560	68.12	68.12	68.12	0.998	0.998	0.998
+76	4	10	22	16365570	68.44	68.44	68.44	0.996	0.996	0.996
+77	4	10	22	16365580	70.08	70.08	70.08	0.997	0.997	0.997
+78	4	10	22	16365590	70.99	70.99	70.99	0.997	0.997	0.997
+79	4	10	22	16365600	71.71	71.71	71.71	0.997	0.997	0.997
+80	4	10	22	16365610	72.94	72.94	72.94	0.998	0.998	0.998
+81	4	10	22	16365620	73.31	73.31	73.31	0.999	0.999	0.999
+82	4	10	22	16365630	74.3	74.3	74.3	0.999	0.999	0.999
+83	4	10	22	16365640	74.81	74.81	74.81	0.998	0.998	0.998
+84	4	10	22	16365650	74.63	74.63	74.63	0.999	0.999	0.999
+85	4	10	22	16365660	74.72	74.72	74.72	0.999	0.999	0.999
+86	4	10	22	16365670	75.99	75.99	75.99	0.999	0.999	0.999
+87	4	10	22	16365680	76.45	76.45	76.45	0.999	0.999	0.999
+88	4	10	22	16365690	76.49	76.49	76.49	0.999	0.999	0.999
+89	4	10	22	16365700	76.32	76.32	76.32	0.999	0.999	0.999
+90	4	10	22	16365710	76.62	76.62	76.62	0.999	0.999	0.999
+91	4	10	22	16365720	76.15	76.15	76.15	0.999	0.999	0.999
+92	4	10	22	16365730	75.19	75.19	75.19	0.999	0.999	0.999
+93	4	10	22	16365740	74.25	74.25	74.25	0.999	0.999	0.999
+94	4	10	22	16365750	73.17	73.17	73.17	0.998	0.998	0.998
+95	4	10	22	16365760	72.35	72.35	72.35	0.996	0.996	0.996
+96	4	10	22	16365770	72.16	72.16	72.16	0.996	0.996	0.996
+97	4	10	22	16365780	72.32	72.32	72.32	0.997	0.997	0.997
+98	4	10	22	16365790	72.37	72.37	72.37	0.997	0.997	0.997
+99	4	10	22	16365800	73.04	73.04	73.04	0.999	0.999	0.999
+100	4	10	22	16365810	73.61	73.61	73.61	1	1	1
+101	4	10	22	16365820	73.38	73.38	73.38	1	1	1
+102	4	10	22	16365830	73.94	73.94	73.94	0.999	0.999	0.999
+103	4	10	22	16365840	74.73	74.73	74.73	0.999	0.999	0.999
+104	4	10	22	16365850	75.77	75.77	75.77	1	1	1
+105	4	10	22	16365860	76.7	76.7	76.7	1	1	1
+106	4	10	22	16365870	78.02	78.02	78.02	1	1	1
+107	4	10	22	16365880	78.72	78.72	78.72	1	1	1
+108	4	10	22	16365890	79.8	79.8	79.8	1	1	1
+109	4	10	22	16365900	80.78	80.78	80.78	1	1	1
+110	4	10	22	16365910	80.97	80.97	80.97	1	1	1
+111	4	10	22	16365920	81.29	81.29	81.29	1	1	1
+112	4	10	22	16365930	80.91	80.91	80.91	1	1	1
+113	4	10	22	16365940	80.72	80.72	80.72	1	1	1
+114	4	10	22	16365950	79.73	79.73	79.73	1	1	1
+115	4	10	22	16365960	79.03	79.03	79.03	1	1	1
+116	4	10	22	16365970	78	78	78	0.999	0.999	0.999
+117	4	10	22	16365980	77.07	77.07	77.07	0.998	0.998	0.998
+118	4	10	22	16365990	76.73	76.73	76.73	1	1	1
+119	4	10	22	16366000	76.64	76.64	76.64	0.999	0.999	0.999
+120	4	10	22	16366010	77.13	77.13	77.13	0.998	0.998	0.998
+121	4	10	22	16366020	76.75	76.75	76.75	0.999	0.999	0.999
+122	4	10	22	16366030	76.38	76.38	76.38	0.999	0.999	0.999
+123	4	10	22	16366040	76.31	76.31	76.31	1	1	1
+124	4	10	22	16366050	75.42	75.42	75.42	0.998	0.998	0.998
+125	4	10	22	16366060	75.05	75.05	75.05	0.998	0.998	0.998
+126	4	10	22	16366070	75.91	75.91	75.91	0.999	0.999	0.999
+127	4	10	22	16366080	77.49	77.49	77.49	0.999	0.999	0.999
+128	4	10	22	16366090	78.66	78.66	78.66	0.999	0.999	0.999
+129	4	10	22	16366100	80.96	80.96	80.96	0.999	0.999	0.999
+130	4	10	22	16366110	82.84	82.84	82.84	1	1	1
+131	4	10	22	16366120	84.37	84.37	84.37	1	1	1
+132	4	10	22	16366130	85.53	85.53	85.53	1	1	1
+133	4	10	22	16366140	86.31	86.31	86.31	1	1	1
+134	4	10	22	16366150	85.69	85.69	85.69	1	1	1
+135	4	10	22	16366160	85.55	85.55	85.55	1	1	1
+136	4	10	22	16366170	85.63	85.63	85.63	1	1	1
+137	4	10	22	16366180	86.45	86.45	86.45	1	1	1
+138	4	10	22	16366190	86.47	86.47	86.47	1	1	1
+139	4	10	22	16366200	86.22	86.22	86.22	1	1	1
+140	4	10	22	16366210	85.69	85.69	85.69	0.999	0.999	0.999
+141	4	10	22	16366220	82.86	82.86	82.86	0.999	0.999	0.999
+142	4	10	22	16366230	80.59	80.59	80.59	0.999	0.999	0.999
+143	4	10	22	16366240	78.34	78.34	78.34	0.997	0.997	0.997
+144	4	10	22	16366250	75.04	75.04	75.04	0.995	0.995	0.995
+145	4	10	22	46546380	25.31	25.31	25.31	0.733	0.733	0.733
+146	4	10	22	46546390	25.22	25.22	25.22	0.714	0.714	0.714
+147	4	10	22	46546400	24.68	24.68	24.68	0.696	0.696	0.696
+148	4	10	22	46546410	24.69	24.69	24.69	0.695	0.695	0.695
+149	4	10	22	46546420	24.76	24.76	24.76	0.693	0.693	0.693
+150	4	10	22	46546430	24.94	24.94	24.94	0.697	0.697	0.697
+151	4	10	22	46546440	24.92	24.92	24.92	0.695	0.695	0.695
+152	4	10	22	46546450	24.53	24.53	24.53	0.687	0.687	0.687
+153	4	10	22	46546460	23.98	23.98	23.98	0.661	0.661	0.661
+154	4	10	22	46546470	23.41	23.41	23.41	0.619	0.619	0.619
+155	4	10	22	46546480	22.75	22.75	22.75	0.591	0.591	0.591
+156	4	10	22	46546490	22.51	22.51	22.51	0.582	0.582	0.582
+157	4	10	22	46546500	22.11	22.11	22.11	0.562	0.562	0.562
+158	4	10	22	46546510	22.05	22.05	22.05	0.554	0.554	0.554
+159	4	10	22	46546520	21.48	21.48	21.48	0.521	0.521	0.521
+160	4	10	22	46546530	21.39	21.39	21.39	0.512	0.512	0.512
+161	4	10	22	46546540	21.1	21.1	21.1	0.492	0.492	0.492
+162	4	10	22	46546550	20.87	20.87	20.87	0.472	0.472	0.472
+163	4	10	22	46546560	20.79	20.79	20.79	0.462	0.462	0.462
+164	4	10	22	46546570	21.05	21.05	21.05	0.484	0.484	0.484
+165	4	10	22	46546580	22.96	22.96	22.96	0.617	0.617	0.617
+166	4	10	22	46546590	24.84	24.84	24.84	0.717	0.717	0.717
+167	4	10	22	46546600	25.18	25.18	25.18	0.73	0.73	0.73
+168	4	10	22	46546610	25.58	25.58	25.58	0.743	0.743	0.743
+169	4	10	22	46546620	25.51	25.51	25.51	0.732	0.732	0.732
+170	4	10	22	46546630	25.83	25.83	25.83	0.741	0.741	0.741
+171	4	10	22	46546640	25.96	25.96	25.96	0.755	0.755	0.755
+172	4	10	22	46546650	26.77	26.77	26.77	0.795	0.795	0.795
+173	4	10	22	46546660	26.56	26.56	26.56	0.79	0.79	0.79
+174	4	10	22	46546670	26.47	26.47	26.47	0.778	0.778	0.778
+175	4	10	22	46546680	26.65	26.65	26.65	0.785	0.785	0.785
+176	4	10	22	46546690	26.77	26.77	26.77	0.789	0.789	0.789
+177	4	10	22	46546700	26.45	26.45	26.45	0.761	0.761	0.761
+178	4	10	22	46546710	26.86	26.86	26.86	0.787	0.787	0.787
+179	4	10	22	46546720	27.34	27.34	27.34	0.809	0.809	0.809
+180	4	10	22	46546730	27.64	27.64	27.64	0.824	0.824	0.824
+181	4	10	22	46546740	28.02	28.02	28.02	0.836	0.836	0.836
+182	4	10	22	46546750	28.37	28.37	28.37	0.858	0.858	0.858
+183	4	10	22	46546760	28.31	28.31	28.31	0.859	0.859	0.859
+184	4	10	22	46546770	28.42	28.42	28.42	0.851	0.851	0.851
+185	4	10	22	46546780	27.99	27.99	27.99	0.821	0.821	0.821
+186	4	10	22	46546790	29.25	29.25	29.25	0.877	0.877	0.877
+187	4	10	22	46546800	29.27	29.27	29.27	0.867	0.867	0.867
+188	4	10	22	46546810	29.74	29.74	29.74	0.886	0.886	0.886
+189	4	10	22	46546820	30.05	30.05	30.05	0.894	0.894	0.894
+190	4	10	22	46546830	30.45	30.45	30.45	0.899	0.899	0.899
+191	4	10	22	46546840	30.71	30.71	30.71	0.903	0.903	0.903
+192	4	10	22	46546850	31.32	31.32	31.32	0.917	0.917	0.917
+193	4	10	22	46546860	31.75	31.75	31.75	0.927	0.927	0.927
+194	4	10	22	46546870	31.84	31.84	31.84	0.941	0.941	0.941
+195	4	10	22	46546880	31.83	31.83	31.83	0.941	0.941	0.941
+196	4	10	22	46546890	31.94	31.94	31.94	0.946	0.946	0.946
+197	4	10	22	46546900	31.89	31.89	31.89	0.951	0.951	0.951
+198	4	10	22	46546910	31.87	31.87	31.87	0.941	0.941	0.941
+199	4	10	22	46546920	31.52	31.52	31.52	0.924	0.924	0.924
+200	4	10	22	46546930	31.34	31.34	31.34	0.935	0.935	0.935
+201	4	10	22	46546940	31.09	31.09	31.09	0.922	0.922	0.922
+202	4	10	22	46546950	31.18	31.18	31.18	0.928	0.928	0.928
+203	4	10	22	46546960	31.24	31.24	31.24	0.925	0.925	0.925
+204	4	10	22	46546970	31.49	31.49	31.49	0.939	0.939	0.939
+205	4	10	22	46546980	31.75	31.75	31.75	0.943	0.943	0.943
+206	4	10	22	46546990	32.38	32.38	32.38	0.951	0.951	0.951
+207	4	10	22	46547000	32.66	32.66	32.66	0.949	0.949	0.949
+208	4	10	22	46547010	33.29	33.29	33.29	0.957	0.957	0.957
+209	4	10	22	46547020	33.86	33.86	33.86	0.957	0.957	0.957
+210	4	10	22	46547030	34.55	34.55	34.55	0.968	0.968	0.968
+211	4	10	22	46547040	35.11	35.11	35.11	0.967	0.967	0.967
+212	4	10	22	46547050	35.43	35.43	35.43	0.973	0.973	0.973
+213	4	10	22	46547060	35.62	35.62	35.62	0.971	0.971	0.971
+214	4	10	22	46547070	36.23	36.23	36.23	0.979	0.979	0.979
+215	4	10	22	46547080	36.61	36.61	36.61	0.981	0.981	0.981
+216	4	10	22	46547090	36.71	36.71	36.71	0.982	0.982	0.982
+217	4	10	22	46547100	37.09	37.09	37.09	0.982	0.982	0.982
+218	4	10	22	46547110	37.41	37.41	37.41	0.983	0.983	0.983
+219	4	10	22	46547120	37.65	37.65	37.65	0.989	0.989	0.989
+220	4	10	22	46547130	37.65	37.65	37.65	0.988	0.988	0.988
+221	4	10	22	46547140	37.49	37.49	37.49	0.986	0.986	0.986
+222	4	10	22	46547150	37.41	37.41	37.41	0.988	0.988	0.988
+223	4	10	22	46547160	36.69	36.69	36.69	0.99	0.99	0.99
+224	4	10	22	46547170	36.3	36.3	36.3	0.987	0.987	0.987
+225	4	10	22	46547180	35.76	35.76	35.76	0.982	0.982	0.982
+226	4	10	22	46547190	35.46	35.46	35.46	0.983	0.983	0.983
+227	4	10	22	46547200	35.16	35.16	35.16	0.976	0.976	0.976
+228	4	10	22	46547210	34.87	34.87	34.87	0.981	0.981	0.981
+229	4	10	22	46547220	34.52	34.52	34.52	0.981	0.981	0.981
+230	4	10	22	46547230	34.29	34.29	34.29	0.977	0.977	0.977
+231	4	10	22	46547240	34.15	34.15	34.15	0.971	0.971	0.971
+232	4	10	22	46547250	33.97	33.97	33.97	0.972	0.972	0.972
+233	4	10	22	46547260	33.58	33.58	33.58	0.964	0.964	0.964
+234	4	10	22	46547270	33.76	33.76	33.76	0.968	0.968	0.968
+235	4	10	22	46547280	34.61	34.61	34.61	0.977	0.977	0.977
+236	4	10	22	46547290	35.1	35.1	35.1	0.977	0.977	0.977
+237	4	10	22	46547300	36.09	36.09	36.09	0.985	0.985	0.985
+238	4	10	22	46547310	36.58	36.58	36.58	0.986	0.986	0.986
+239	4	10	22	46547320	36.91	36.91	36.91	0.985	0.985	0.985
+240	4	10	22	46547330	37.41	37.41	37.41	0.989	0.989	0.989
+241	4	10	22	46547340	37.12	37.12	37.12	0.987	0.987	0.987
+242	4	10	22	46547350	37.2	37.2	37.2	0.987	0.987	0.987
+243	4	10	22	46547360	37.58	37.58	37.58	0.988	0.988	0.988
+244	4	10	22	46547370	37.64	37.64	37.64	0.989	0.989	0.989
+245	4	10	22	46547380	37.76	37.76	37.76	0.987	0.987	0.987
+246	4	10	22	46547390	37.86	37.86	37.86	0.99	0.99	0.99
+247	4	10	22	46547400	37.6	37.6	37.6	0.988	0.988	0.988
+248	4	10	22	46547410	37.74	37.74	37.74	0.991	0.991	0.991
+249	4	10	22	46547420	37.49	37.49	37.49	0.991	0.991	0.991
+250	4	10	22	46547430	37.4	37.4	37.4	0.99	0.99	0.99
+251	4	10	22	46547440	37.54	37.54	37.54	0.991	0.991	0.991
+252	4	10	22	46547450	37.53	37.53	37.53	0.995	0.995	0.995
+253	4	10	22	46547460	37.27	37.27	37.27	0.99	0.99	0.99
+254	4	10	22	46547470	37.42	37.42	37.42	0.992	0.992	0.992
+255	4	10	22	46547480	37.42	37.42	37.42	0.992	0.992	0.992
+256	4	10	22	46547490	37.84	37.84	37.84	0.993	0.993	0.993
+257	4	10	22	46547500	37.96	37.96	37.96	0.994	0.994	0.994
+258	4	10	22	46547510	38.04	38.04	38.04	0.995	0.995	0.995
+259	4	10	22	46547520	38.17	38.17	38.17	0.995	0.995	0.995
+260	4	10	22	46547530	38.09	38.09	38.09	0.989	0.989	0.989
+261	4	10	22	46547540	38.27	38.27	38.27	0.99	0.99	0.99
+262	4	10	22	46547550	38.54	38.54	38.54	0.993	0.993	0.993
+263	4	10	22	46547560	38.58	38.58	38.58	0.992	0.992	0.992
+264	4	10	22	46547570	38.27	38.27	38.27	0.995	0.995	0.995
+265	4	10	22	46547580	37.47	37.47	37.47	0.994	0.994	0.994
+266	4	10	22	46547590	36.84	36.84	36.84	0.989	0.989	0.989
+267	4	10	22	46547600	36.05	36.05	36.05	0.986	0.986	0.986
+268	4	10	22	46547610	35.91	35.91	35.91	0.981	0.981	0.981
+269	4	10	22	46547620	35.77	35.77	35.77	0.981	0.981	0.981
+270	4	10	22	46547630	35.82	35.82	35.82	0.985	0.985	0.985
+271	4	10	22	46547640	35.79	35.79	35.79	0.987	0.987	0.987
+272	4	10	22	46547650	35.97	35.97	35.97	0.988	0.988	0.988
+273	4	10	22	46547660	35.95	35.95	35.95	0.989	0.989	0.989
+274	4	10	22	46547670	36.2	36.2	36.2	0.99	0.99	0.99
+275	4	10	22	46547680	36.55	36.55	36.55	0.991	0.991	0.991
+276	4	10	22	46547690	36.65	36.65	36.65	0.989	0.989	0.989
+277	4	10	22	46547700	36.8	36.8	36.8	0.988	0.988	0.988
+278	4	10	22	46547710	37.12	37.12	37.12	0.989	0.989	0.989
+279	4	10	22	46547720	37.46	37.46	37.46	0.991	0.991	0.991
+280	4	10	22	46547730	38.43	38.43	38.43	0.992	0.992	0.992
+281	4	10	22	46547740	38.78	38.78	38.78	0.992	0.992	0.992
+282	4	10	22	46547750	39.1	39.1	39.1	0.994	0.994	0.994
+283	4	10	22	46547760	39.44	39.44	39.44	0.995	0.995	0.995
+284	4	10	22	46547770	39.66	39.66	39.66	0.995	0.995	0.995
+285	4	10	22	46547780	39.84	39.84	39.84	0.994	0.994	0.994
+286	4	10	22	46547790	39.81	39.81	39.81	0.995	0.995	0.995
+287	4	10	22	46547800	39.17	39.17	39.17	0.995	0.995	0.995
+288	4	10	22	46547810	38.71	38.71	38.71	0.994	0.994	0.994
+289	4	10	22	46547820	38.32	38.32	38.32	0.996	0.996	0.996
+290	4	10	22	46547830	37.6	37.6	37.6	0.996	0.996	0.996
+291	4	10	22	46547840	36.99	36.99	36.99	0.996	0.996	0.996
+292	4	10	22	46547850	36.73	36.73	36.73	0.995	0.995	0.995
+293	4	10	22	46547860	36.32	36.32	36.32	0.991	0.991	0.991
+294	4	10	22	46547870	36.23	36.23	36.23	0.99	0.99	0.99
+295	4	10	22	46547880	36.32	36.32	36.32	0.993	0.993	0.993
+296	4	10	22	46547890	37.5	37.5	37.5	0.993	0.993	0.993
+297	4	10	22	46547900	37.93	37.93	37.93	0.994	0.994	0.994
+298	4	10	22	46547910	40.44	40.44	40.44	0.998	0.998	0.998
+299	4	10	22	46547920	41.12	41.12	41.12	0.999	0.999	0.999
+300	4	10	22	46547930	40.7	40.7	40.7	0.999	0.999	0.999
+301	4	10	22	46547940	40.14	40.14	40.14	0.998	0.998	0.998
+302	4	10	22	46547950	39.86	39.86	39.86	0.999	0.999	0.999
+303	4	10	22	46547960	39.5	39.5	39.5	0.997	0.997	0.997
+304	4	10	22	46547970	39.25	39.25	39.25	0.997	0.997	0.997
+305	4	10	22	46547980	39.18	39.18	39.18	0.999	0.999	0.999
+306	4	10	22	46547990	39.39	39.39	39.39	0.999	0.999	0.999
+307	4	10	22	46548000	39.53	39.53	39.53	0.997	0.997	0.997
+308	4	10	22	46548010	39.54	39.54	39.54	0.997	0.997	0.997
+309	4	10	22	46548020	39.45	39.45	39.45	0.999	0.999	0.999
+310	4	10	22	46548030	38.77	38.77	38.77	0.995	0.995	0.995
+311	4	10	22	46548040	38.29	38.29	38.29	0.994	0.994	0.994
+312	4	10	22	46548050	36.26	36.26	36.26	0.988	0.988	0.988
+313	4	10	22	46548060	26.9	26.9	26.9	0.799	0.799	0.799
+314	4	10	22	46548070	26.57	26.57	26.57	0.786	0.786	0.786
+315	4	10	22	46548080	28.09	28.09	28.09	0.854	0.854	0.854
+316	4	10	22	46548090	28.78	28.78	28.78	0.878	0.878	0.878
+317	4	10	22	46548100	29.09	29.09	29.09	0.888	0.888	0.888
+318	4	10	22	46548110	29.82	29.82	29.82	0.902	0.902	0.902
+319	4	10	22	46548120	30.2	30.2	30.2	0.907	0.907	0.907
+320	4	10	22	46548130	30.85	30.85	30.85	0.923	0.923	0.923
+321	4	10	22	46548140	31.28	31.28	31.28	0.936	0.936	0.936
+322	4	10	22	46548150	31.82	31.82	31.82	0.945	0.945	0.945
+323	4	10	22	46548160	32.08	32.08	32.08	0.942	0.942	0.942
+324	4	10	22	46548170	33.14	33.14	33.14	0.959	0.959	0.959
+325	4	10	22	46548180	33.94	33.94	33.94	0.969	0.969	0.969
+326	4	10	22	46548190	35.11	35.11	35.11	0.984	0.984	0.984
+327	4	10	22	46548200	36.23	36.23	36.23	0.982	0.982	0.982
+328	4	10	22	46548210	33.88	33.88	33.88	0.963	0.963	0.963
+329	4	10	22	46548220	32.14	32.14	32.14	0.945	0.945	0.945
+330	4	10	22	46548230	31.64	31.64	31.64	0.949	0.949	0.949
+331	4	10	22	46548240	31.99	31.99	31.99	0.949	0.949	0.949
+332	4	10	22	46548250	33.15	33.15	33.15	0.969	0.969	0.969
+333	4	10	22	46548260	34.29	34.29	34.29	0.971	0.971	0.971
+334	4	10	22	46548270	35.37	35.37	35.37	0.98	0.98	0.98
+335	4	10	22	46548280	36.09	36.09	36.09	0.986	0.986	0.986
+336	4	10	22	46548290	37.03	37.03	37.03	0.984	0.984	0.984
+337	4	10	22	46548300	37.89	37.89	37.89	0.986	0.986	0.986
+338	4	10	22	46548310	38.27	38.27	38.27	0.988	0.988	0.988
+339	4	10	22	46548320	37.83	37.83	37.83	0.985	0.985	0.985
+340	4	10	22	46548330	38.05	38.05	38.05	0.982	0.982	0.982
+341	4	10	22	46548340	37.68	37.68	37.68	0.984	0.984	0.984
+342	4	10	22	46548350	37.76	37.76	37.76	0.984	0.984	0.984
+343	4	10	22	46548360	37.27	37.27	37.27	0.977	0.977	0.977
+344	4	10	22	46548370	37.54	37.54	37.54	0.979	0.979	0.979
+345	4	10	22	46548380	37.62	37.62	37.62	0.981	0.981	0.981
+346	4	10	22	46548390	37.67	37.67	37.67	0.984	0.984	0.984
+347	4	10	22	46548400	37.88	37.88	37.88	0.983	0.983	0.983
+348	4	10	22	46548410	37.95	37.95	37.95	0.984	0.984	0.984
+349	4	10	22	46548420	38.17	38.17	38.17	0.99	0.99	0.99
+350	4	10	22	46548430	38.01	38.01	38.01	0.988	0.988	0.988
+351	4	10	22	46548440	38.02	38.02	38.02	0.987	0.987	0.987
+352	4	10	22	46548450	37.95	37.95	37.95	0.985	0.985	0.985
+353	4	10	22	46548460	38.34	38.34	38.34	0.985	0.985	0.985
+354	4	10	22	46548470	38.26	38.26	38.26	0.987	0.987	0.987
+355	4	10	22	46548480	37.87	37.87	37.87	0.986	0.986	0.986
+356	4	10	22	46548490	37.46	37.46	37.46	0.983	0.983	0.983
+357	4	10	22	46548500	37.08	37.08	37.08	0.982	0.982	0.982
+358	4	10	22	46548510	36.92	36.92	36.92	0.985	0.985	0.985
+359	4	10	22	46548520	36.83	36.83	36.83	0.988	0.988	0.988
+360	4	10	22	46548530	36.71	36.71	36.71	0.986	0.986	0.986
+361	4	10	22	46548540	37.1	37.1	37.1	0.987	0.987	0.987
+362	4	10	22	46548550	36.89	36.89	36.89	0.987	0.987	0.987
+363	4	10	22	46548560	36.96	36.96	36.96	0.99	0.99	0.99
+364	4	10	22	46548570	37.03	37.03	37.03	0.991	0.991	0.991
+365	4	10	22	46548580	36.68	36.68	36.68	0.99	0.99	0.99
+366	4	10	22	46548590	36.21	36.21	36.21	0.986	0.986	0.986
+367	4	10	22	46548600	35.96	35.96	35.96	0.985	0.985	0.985
+368	4	10	22	46548610	35.72	35.72	35.72	0.982	0.982	0.982
+369	4	10	22	46548620	36.05	36.05	36.05	0.982	0.982	0.982
+370	4	10	22	46548630	36.29	36.29	36.29	0.983	0.983	0.983
+371	4	10	22	46548640	37.22	37.22	37.22	0.987	0.987	0.987
+372	4	10	22	46548650	37.39	37.39	37.39	0.987	0.987	0.987
+373	4	10	22	46548660	37.89	37.89	37.89	0.986	0.986	0.986
+374	4	10	22	46548670	38.21	38.21	38.21	0.987	0.987	0.987
+375	4	10	22	46548680	38.96	38.96	38.96	0.995	0.995	0.995
+376	4	10	22	46548690	39.88	39.88	39.88	0.997	0.997	0.997
+377	4	10	22	46548700	40.49	40.49	40.49	0.994	0.994	0.994
+378	4	10	22	46548710	40.8	40.8	40.8	0.997	0.997	0.997
+379	4	10	22	46548720	40.37	40.37	40.37	0.996	0.996	0.996
+380	4	10	22	46548730	40.48	40.48	40.48	0.996	0.996	0.996
+381	4	10	22	46548740	40.36	40.36	40.36	0.995	0.995	0.995
+382	4	10	22	46548750	40.05	40.05	40.05	0.995	0.995	0.995
+383	4	10	22	46548760	39.61	39.61	39.61	0.995	0.995	0.995
+384	4	10	22	46548770	39.21	39.21	39.21	0.995	0.995	0.995
+385	4	10	22	46548780	38.99	38.99	38.99	0.993	0.993	0.993
+386	4	10	22	46548790	38.1	38.1	38.1	0.991	0.991	0.991
+387	4	10	22	46548800	37.68	37.68	37.68	0.991	0.991	0.991
+388	4	10	22	46548810	37.12	37.12	37.12	0.989	0.989	0.989
+389	4	10	22	46548820	36.48	36.48	36.48	0.989	0.989	0.989
+390	4	10	22	46548830	36.06	36.06	36.06	0.99	0.99	0.99
+391	4	10	22	46548840	36.15	36.15	36.15	0.986	0.986	0.986
+392	4	10	22	46548850	37.35	37.35	37.35	0.989	0.989	0.989
+393	4	10	22	46548860	36.81	36.81	36.81	0.989	0.989	0.989
+394	4	10	22	46548870	36.65	36.65	36.65	0.984	0.984	0.984
+395	4	10	22	46548880	37.03	37.03	37.03	0.985	0.985	0.985
+396	4	10	22	46548890	37.34	37.34	37.34	0.986	0.986	0.986
+397	4	10	22	46548900	37.55	37.55	37.55	0.99	0.99	0.99
+398	4	10	22	46548910	37.85	37.85	37.85	0.988	0.988	0.988
+399	4	10	22	46548920	38.68	38.68	38.68	0.99	0.99	0.99
+400	4	10	22	46548930	39.22	39.22	39.22	0.994	0.994	0.994
+401	4	10	22	46548940	40.97	40.97	40.97	0.998	0.998	0.998
+402	4	10	22	46548950	41.48	41.48	41.48	0.996	0.996	0.996
+403	4	10	22	46548960	41.55	41.55	41.55	0.997	0.997	0.997
+404	4	10	22	46548970	40.88	40.88	40.88	0.997	0.997	0.997
+405	4	10	22	46548980	39.7	39.7	39.7	0.995	0.995	0.995
+406	4	10	22	46548990	39.54	39.54	39.54	0.997	0.997	0.997
+407	4	10	22	46549000	39.08	39.08	39.08	0.992	0.992	0.992
+408	4	10	22	46549010	39.05	39.05	39.05	0.993	0.993	0.993
+409	4	10	22	46549020	39.26	39.26	39.26	0.99	0.99	0.99
+410	4	10	22	46549030	39.35	39.35	39.35	0.992	0.992	0.992
+411	4	10	22	46549040	39.85	39.85	39.85	0.99	0.99	0.99
+412	4	10	22	46549050	40.36	40.36	40.36	0.989	0.989	0.989
+413	4	10	22	46549060	40.25	40.25	40.25	0.99	0.99	0.99
+414	4	10	22	46549070	40.66	40.66	40.66	0.994	0.994	0.994
+415	4	10	22	46549080	39.3	39.3	39.3	0.991	0.991	0.991
+416	4	10	22	46549090	24.91	24.91	24.91	0.733	0.733	0.733
+417	4	10	22	46549100	25.12	25.12	25.12	0.754	0.754	0.754
+418	4	10	22	46549110	25.55	25.55	25.55	0.772	0.772	0.772
+419	4	10	22	46549120	26.48	26.48	26.48	0.815	0.815	0.815
+420	4	10	22	46549130	26.93	26.93	26.93	0.823	0.823	0.823
+421	4	10	22	46549140	27.27	27.27	27.27	0.836	0.836	0.836
+422	4	10	22	46549150	27.41	27.41	27.41	0.834	0.834	0.834
+423	4	10	22	46549160	27.84	27.84	27.84	0.844	0.844	0.844
+424	4	10	22	46549170	28.52	28.52	28.52	0.87	0.87	0.87
+425	4	10	22	46549180	29.12	29.12	29.12	0.89	0.89	0.89
+426	4	10	22	46549190	29.49	29.49	29.49	0.898	0.898	0.898
+427	4	10	22	46549200	30.19	30.19	30.19	0.917	0.917	0.917
+428	4	10	22	46549210	31.52	31.52	31.52	0.94	0.94	0.94
+429	4	10	22	46549220	33.02	33.02	33.02	0.952	0.952	0.952
+430	4	10	22	46549230	34.39	34.39	34.39	0.967	0.967	0.967
+431	4	10	22	46549240	32.99	32.99	32.99	0.948	0.948	0.948
+432	4	10	22	46549250	32.14	32.14	32.14	0.94	0.94	0.94
+433	4	10	22	46549260	31.97	31.97	31.97	0.94	0.94	0.94
+434	4	10	22	46549270	32.71	32.71	32.71	0.952	0.952	0.952
+435	4	10	22	46549280	33.48	33.48	33.48	0.96	0.96	0.96
+436	4	10	22	46549290	34.15	34.15	34.15	0.96	0.96	0.96
+437	4	10	22	46549300	34.87	34.87	34.87	0.973	0.973	0.973
+438	4	10	22	46549310	35.21	35.21	35.21	0.978	0.978	0.978
+439	4	10	22	46549320	35.84	35.84	35.84	0.982	0.982	0.982
+440	4	10	22	46549330	36.53	36.53	36.53	0.985	0.985	0.985
+441	4	10	22	46549340	37.76	37.76	37.76	0.983	0.983	0.983
+442	4	10	22	46549350	38.11	38.11	38.11	0.99	0.99	0.99
+443	4	10	22	46549360	38	38	38	0.989	0.989	0.989
+444	4	10	22	46549370	38.38	38.38	38.38	0.986	0.986	0.986
+445	4	10	22	46549380	38.47	38.47	38.47	0.987	0.987	0.987
+446	4	10	22	46549390	38.02	38.02	38.02	0.987	0.987	0.987
+447	4	10	22	46549400	37.58	37.58	37.58	0.985	0.985	0.985
+448	4	10	22	46549410	37.28	37.28	37.28	0.984	0.984	0.984
+449	4	10	22	46549420	37.09	37.09	37.09	0.985	0.985	0.985
+450	4	10	22	46549430	37.15	37.15	37.15	0.986	0.986	0.986
+451	4	10	22	46549440	37.37	37.37	37.37	0.991	0.991	0.991
+452	4	10	22	46549450	37.86	37.86	37.86	0.99	0.99	0.99
+453	4	10	22	46549460	38.23	38.23	38.23	0.992	0.992	0.992
+454	4	10	22	46549470	38.42	38.42	38.42	0.993	0.993	0.993
+455	4	10	22	46549480	38.57	38.57	38.57	0.991	0.991	0.991
+456	4	10	22	46549490	38.41	38.41	38.41	0.992	0.992	0.992
+457	4	10	22	46549500	38.48	38.48	38.48	0.994	0.994	0.994
+458	4	10	22	46549510	38.15	38.15	38.15	0.993	0.993	0.993
+459	4	10	22	46549520	37.19	37.19	37.19	0.993	0.993	0.993
+460	4	10	22	46549530	36.49	36.49	36.49	0.988	0.988	0.988
+461	4	10	22	46549540	35.86	35.86	35.86	0.986	0.986	0.986
+462	4	10	22	46549550	35.23	35.23	35.23	0.977	0.977	0.977
+463	4	10	22	46549560	34.63	34.63	34.63	0.975	0.975	0.975
+464	4	10	22	46549570	34.08	34.08	34.08	0.971	0.971	0.971
+465	4	10	22	46549580	33.4	33.4	33.4	0.967	0.967	0.967
+466	4	10	22	46549590	33.28	33.28	33.28	0.969	0.969	0.969
+467	4	10	22	46549600	33.52	33.52	33.52	0.963	0.963	0.963
+468	4	10	22	46549610	34.29	34.29	34.29	0.973	0.973	0.973
+469	4	10	22	46549620	34.68	34.68	34.68	0.97	0.97	0.97
+470	4	10	22	46549630	34.39	34.39	34.39	0.968	0.968	0.968
+471	4	10	22	46549640	34.39	34.39	34.39	0.971	0.971	0.971
+472	4	10	22	46549650	33.91	33.91	33.91	0.965	0.965	0.965
+473	4	10	22	46549660	34.14	34.14	34.14	0.963	0.963	0.963
+474	4	10	22	46549670	34.98	34.98	34.98	0.975	0.975	0.975
+475	4	10	22	46549680	35.6	35.6	35.6	0.98	0.98	0.98
+476	4	10	22	46549690	36.29	36.29	36.29	0.984	0.984	0.984
+477	4	10	22	46549700	36.9	36.9	36.9	0.984	0.984	0.984
+478	4	10	22	46615670	39.78	39.78	39.78	0.987	0.987	0.987
+479	4	10	22	46615680	39.67	39.67	39.67	0.988	0.988	0.988
+480	4	10	22	46615690	39.82	39.82	39.82	0.991	0.991	0.991
+481	4	10	22	46615700	39.97	39.97	39.97	0.994	0.994	0.994
+482	4	10	22	46615710	39.49	39.49	39.49	0.995	0.995	0.995
+483	4	10	22	46615720	39.48	39.48	39.48	0.993	0.993	0.993
+484	4	10	22	46615730	39.56	39.56	39.56	0.995	0.995	0.995
+485	4	10	22	46615740	39.44	39.44	39.44	0.996	0.996	0.996
+486	4	10	22	46615750	39.11	39.11	39.11	0.996	0.996	0.996
+487	4	10	22	46615760	38.8	38.8	38.8	0.995	0.995	0.995
+488	4	10	22	46615770	38.83	38.83	38.83	0.993	0.993	0.993
+489	4	10	22	46615780	38.51	38.51	38.51	0.992	0.992	0.992
+490	4	10	22	46615790	38.46	38.46	38.46	0.995	0.995	0.995
+491	4	10	22	46615800	38.15	38.15	38.15	0.995	0.995	0.995
+492	4	10	22	46615810	37.97	37.97	37.97	0.995	0.995	0.995
+493	4	10	22	46615820	38.09	38.09	38.09	0.992	0.992	0.992
+494	4	10	22	46615830	38.71	38.71	38.71	0.991	0.991	0.991
+495	4	10	22	46615840	39.35	39.35	39.35	0.994	0.994	0.994
+496	4	10	22	46615850	40.07	40.07	40.07	0.996	0.996	0.996
+497	4	10	22	46615860	40.35	40.35	40.35	0.996	0.996	0.996
+498	4	10	22	46615870	40.28	40.28	40.28	0.997	0.997	0.997
+499	4	10	22	46615880	40.32	40.32	40.32	0.995	0.995	0.995
+500	4	10	22	46615890	40.58	40.58	40.58	0.997	0.997	0.997
+501	4	10	22	46615900	40.18	40.18	40.18	0.995	0.995	0.995
+502	4	10	22	46615910	39.76	39.76	39.76	0.995	0.995	0.995
+503	4	10	22	46615920	39.11	39.11	39.11	0.994	0.994	0.994
+504	4	10	22	46615930	38.75	38.75	38.75	0.994	0.994	0.994
+505	4	100	22	16364800	60.92	70.35875	75.94	0.994	0.996625	0.998
+506	4	100	22	16364900	50.5	54.069	58.89	0.989	0.9915	0.995
+507	4	100	22	16365000	50.98	53.207	54.78	0.992	0.99329996	0.995
+508	4	100	22	16365100	41.64	48.173	52.37	0.979	0.9906	0.995
+509	4	100	22	16365200	34.67	37.589	40.13	0.904	0.9408	0.97
+510	4	100	22	16365300	36.36	43.356	51.86	0.925	0.9684	0.995
+511	4	100	22	16365400	53.59	61.368	67.12	0.994	0.9976	0.999
+512	4	100	22	16365500	68.06	68.897	70.99	0.996	0.998	0.999
+513	4	100	22	16365600	71.71	74.534996	76.49	0.997	0.9986	0.999
+514	4	100	22	16365700	72.16	74.090004	76.62	0.996	0.9979	0.999
+515	4	100	22	16365800	73.04	75.770996	79.8	0.999	0.9997	1
+516	4	100	22	16365900	76.73	79.523	81.29	0.998	0.9997	1
+517	4	100	22	16366000	75.05	76.574	78.66	0.998	0.99880004	1
+518	4	100	22	16366100	80.96	84.979996	86.47	0.999	0.9999	1
+519	4	100	22	16366200	75.04	81.456665	86.22	0.995	0.9981667	1
+520	4	100	22	46546300	25.22	25.265	25.31	0.714	0.7235	0.733
+521	4	100	22	46546400	22.51	24.117	24.94	0.582	0.6616	0.697
+522	4	100	22	46546500	20.79	21.864	24.84	0.462	0.5393	0.717
+523	4	100	22	46546600	25.18	26.128	26.77	0.73	0.7638	0.795
+524	4	100	22	46546700	26.45	27.865	29.25	0.761	0.8283	0.877
+525	4	100	22	46546800	29.27	30.89	31.94	0.867	0.91209996	0.946
+526	4	100	22	46546900	31.09	31.575	32.38	0.922	0.9359	0.951
+527	4	100	22	46547000	32.66	35.007	36.71	0.949	0.9684	0.982
+528	4	100	22	46547100	35.46	36.891	37.65	0.982	0.98579997	0.99
+529	4	100	22	46547200	33.58	34.401	35.16	0.964	0.9744	0.981
+530	4	100	22	46547300	36.09	37.215	37.86	0.985	0.9873	0.99
+531	4	100	22	46547400	37.27	37.525	37.84	0.988	0.9913	0.995
+532	4	100	22	46547500	36.84	38.023	38.58	0.989	0.9926	0.995
+533	4	100	22	46547600	35.77	36.066	36.65	0.981	0.9867	0.991
+534	4	100	22	46547700	36.8	38.644	39.84	0.988	0.9925	0.995
+535	4	100	22	46547800	36.23	37.389	39.17	0.99	0.9939	0.996
+536	4	100	22	46547900	37.93	39.751	41.12	0.994	0.9979	0.999
+537	4	100	22	46548000	26.57	34.218	39.54	0.786	0.9287	0.999
+538	4	100	22	46548100	29.09	31.733	35.11	0.888	0.9355	0.984
+539	4	100	22	46548200	31.64	34.181	37.03	0.945	0.9678	0.986
+540	4	100	22	46548300	37.27	37.758	38.27	0.977	0.983	0.988
+541	4	100	22	46548400	37.46	37.991	38.34	0.983	0.9858	0.99
+542	4	100	22	46548500	36.21	36.841	37.1	0.982	0.9872	0.991
+543	4	100	22	46548600	35.72	37.357	39.88	0.982	0.9871	0.997
+544	4	100	22	46548700	38.1	39.846	40.8	0.991	0.9947	0.997
+545	4	100	22	46548800	36.06	36.867	37.68	0.984	0.9878	0.991
+546	4	100	22	46548900	37.55	39.742	41.55	0.988	0.9942	0.998
+547	4	100	22	46549000	24.91	38.207	40.66	0.733	0.9654	0.994
+548	4	100	22	46549100	25.12	27.373001	29.49	0.754	0.8336	0.898
+549	4	100	22	46549200	30.19	32.656	34.39	0.917	0.9476	0.967
+550	4	100	22	46549300	34.87	37.119	38.47	0.973	0.98399997	0.99
+551	4	100	22	46549400	37.09	37.796	38.57	0.984	0.9889	0.993
+552	4	100	22	46549500	33.28	35.679	38.48	0.967	0.9813	0.994
+553	4	100	22	46549600	33.52	34.619	36.29	0.963	0.9712	0.984
+554	4	100	22	46549700	36.9	36.9	36.9	0.984	0.984	0.984
+555	4	100	22	46615600	39.67	39.756664	39.82	0.987	0.98866665	0.991
+556	4	100	22	46615700	38.46	39.165	39.97	0.992	0.9944	0.996
+557	4	100	22	46615800	37.97	39.387	40.58	0.991	0.9948	0.997
+558	4	100	22	46615900	38.75	39.45	40.18	0.994	0.99450004	0.995
+559	4	1000	22	16364000	50.5	61.308887	75.94	0.989	0.99377775	0.998
+560	4	1000	22	16365000	34.67	61.6509	81.29	0.904	0.98846	1
+561	4	1000	22	16366000	75.04	80.933846	86.47	0.995	0.9990769	1
+562	4	1000	22	46546000	20.79	27.01484	32.38	0.462	0.7718871	0.951
+563	4	1000	22	46547000	32.66	37.0912	41.12	0.949	0.98708	0.999
+564	4	1000	22	46548000	26.57	36.6534	41.55	0.786	0.97518003	0.999
+565	4	1000	22	46549000	24.91	34.80831	40.66	0.733	0.95357746	0.994
+566	4	1000	22	46615000	37.97	39.355186	40.58	0.987	0.9939259	0.997
+\.
+
 COPY data.genes (id, reference_set, gene_id, gene_name, full_name, canonical_transcript, chrom, start_pos, end_pos, strand) FROM stdin;
 1	1	ENSG00000228314	CYP4F29P	cytochrome P450, family 4, subfamily F, polypeptide 29, pseudogene	ENST00000428301	21	15215454	15220685	-
 2	1	ENSG00000183249	NF1P3	neurofibromin 1 pseudogene 3	ENST00000457709	21	15373248	15377600	+